@@ -1,6 +1,9 @@
 from abc import abstractmethod, ABC
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 
+from autoplacement.budget import Budget
+from autoplacement.checkpoint import Checkpoint
+from autoplacement.constraints import PlacementConstraints
 from models import SchemaData
 
 
@@ -13,15 +16,27 @@ class AbstractAutoPlacement(ABC):
         pass
 
     @abstractmethod
-    def run(self, schema_data: SchemaData, tab_name: str) -> List[Tuple[SchemaData, str]]:
+    def run(self, schema_data: SchemaData, tab_name: str,
+            budget: Optional[Budget] = None,
+            checkpoint: Optional[Checkpoint] = None,
+            constraints: Optional[PlacementConstraints] = None) -> List[Tuple[SchemaData, str]]:
         """
         Выполняет алгоритм авторазмещения.
 
         Args:
             schema_data (SchemaData): Исходная модель данных.
+            tab_name (str): Имя вкладки, для которой запускается алгоритм.
+            budget (Optional[Budget]): Ограничение по времени/итерациям. Итерационные алгоритмы
+                по его исчерпании возвращают лучшее найденное размещение и отмечают
+                улучшения стоимости в budget.trace.
+            checkpoint (Optional[Checkpoint]): Контрольная точка. Итерационные алгоритмы
+                периодически сохраняют в неё состояние и продолжают с него при следующем запуске.
+            constraints (Optional[PlacementConstraints]): Ограничения размещения (закреплённые
+                элементы, запрещённые позиции, области). Если не заданы, алгоритмы
+                с директивным размещением запрашивают закреплённые элементы у пользователя.
 
         Returns:
             List[Tuple[SchemaData, str]]: Список вариантов размещения.
                 Каждый вариант – кортеж (новая модель данных, текст для вкладки).
         """
-        pass
\ No newline at end of file
+        pass
@@ -0,0 +1,486 @@
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Set, Tuple
+
+from autoplacement.AbstractAutoPlacement import AbstractAutoPlacement
+from autoplacement.budget import Budget
+from autoplacement.checkpoint import Checkpoint
+from autoplacement.constraints import CellMask, PlacementConstraints, resolve_constraints
+from autoplacement.grid import get_grid_geometry
+from autoplacement.utils import compute_total_weighted_length, solve_assignment
+from dialogs import get_dialogs
+from models import SchemaData, Node
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+if not logger.handlers:
+    ch = logging.StreamHandler()
+    ch.setLevel(logging.INFO)
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    ch.setFormatter(formatter)
+    logger.addHandler(ch)
+
+# Ограничения точного алгоритма: перебор растёт факториально
+MAX_ELEMENTS = 16
+MAX_CELLS = 64
+
+# Общая (между процессами) стоимость лучшего найденного размещения
+_shared_best = None
+
+
+class _Problem:
+    """
+    Компактное описание задачи размещения для передачи в рабочие процессы.
+
+    Attributes:
+        weights (List[List[int]]): Симметричная матрица весов связей между элементами (индексы с 0).
+        dist (List[List[int]]): Манхэттенские расстояния между ячейками (индексы с 0).
+        order (List[int]): Порядок ветвления по элементам (связанные или с областью, не фиксированные).
+        fixed (Dict[int, int]): Директивно закреплённые элементы: индекс элемента -> ячейка.
+        blocked (List[int]): Запрещённые ячейки.
+        allowed (List[Optional[CellMask]]): Допустимые ячейки каждого элемента (None – любые).
+    """
+
+    def __init__(self, weights: List[List[int]], dist: List[List[int]],
+                 order: List[int], fixed: Dict[int, int], blocked: List[int],
+                 allowed: List[Optional[CellMask]]) -> None:
+        self.weights = weights
+        self.dist = dist
+        self.order = order
+        self.fixed = fixed
+        self.blocked = blocked
+        self.allowed = allowed
+
+    def constrained(self) -> bool:
+        return bool(self.fixed or self.blocked) or any(mask is not None for mask in self.allowed)
+
+    def initial_used(self) -> List[bool]:
+        """
+        Занятость ячеек до ветвления: закреплённые и запрещённые ячейки.
+        """
+        used = [False] * len(self.dist)
+        for cell in self.fixed.values():
+            used[cell] = True
+        for cell in self.blocked:
+            used[cell] = True
+        return used
+
+
+class _SearchState:
+    """
+    Состояние поиска в одном процессе: лучшая найденная стоимость и размещение,
+    граница отсечения (не больше рекордов всех процессов), а также ограничения бюджета
+    (момент окончания по time.time() и число узлов дерева).
+
+    best_cost всегда относится к best_assignment этого процесса; рекорд других процессов
+    попадает только в bound_cost, иначе процесс вернул бы чужую стоимость со своим размещением.
+    """
+
+    def __init__(self, best_cost: float, deadline: Optional[float] = None,
+                 node_limit: Optional[int] = None) -> None:
+        self.best_cost = best_cost
+        self.best_assignment: Optional[List[int]] = None
+        self.bound_cost = best_cost
+        self.nodes_visited = 0
+        self.deadline = deadline
+        self.node_limit = node_limit
+        self.stopped = False
+
+    def out_of_budget(self) -> bool:
+        if not self.stopped:
+            if self.node_limit is not None and self.nodes_visited > self.node_limit:
+                self.stopped = True
+            # Время проверяем не на каждом узле
+            elif self.deadline is not None and self.nodes_visited & 63 == 1:
+                self.stopped = time.time() >= self.deadline
+        return self.stopped
+
+    def bound(self) -> float:
+        # Учитываем рекорд, найденный другими процессами
+        if _shared_best is not None:
+            shared = _shared_best.value
+            if shared < self.bound_cost:
+                self.bound_cost = shared
+        return self.bound_cost
+
+    def update(self, cost: float, assignment: List[int]) -> None:
+        self.best_cost = cost
+        self.best_assignment = assignment[:]
+        self.bound_cost = min(self.bound_cost, cost)
+        if _shared_best is not None:
+            with _shared_best.get_lock():
+                if cost < _shared_best.value:
+                    _shared_best.value = cost
+
+
+class BranchAndBoundPlacement(AbstractAutoPlacement):
+    """
+    Точный алгоритм размещения методом ветвей и границ (для плат до MAX_ELEMENTS элементов):
+      - Критерий – суммарная взвешенная длина связей (как в compute_total_weighted_length).
+      - Нижняя граница – оценка Гилмора–Лоулера: задача о назначениях
+        свободных элементов в свободные ячейки решается венгерским алгоритмом.
+      - Директивно закреплённые элементы не перемещаются, запрещённые ячейки не занимаются,
+        элементы с областями ветвятся первыми и только по ячейкам своей области.
+      - Ветви верхнего уровня (позиции первого элемента) распределяются по рабочим процессам.
+      - При исчерпании бюджета возвращается лучшее найденное (уже не обязательно оптимальное)
+        размещение; итерацией бюджета считается узел дерева поиска.
+      - Контрольная точка хранит рекорд и обойдённые ветви, поэтому прерванный поиск
+        продолжается со следующей ветви.
+    """
+
+    def __init__(self, workers: Optional[int] = None) -> None:
+        self.workers = workers
+
+    def get_name(self) -> str:
+        return "Точное размещение (метод ветвей и границ)"
+
+    def run(self, schema_data: SchemaData, tab_name: str,
+            budget: Optional[Budget] = None,
+            checkpoint: Optional[Checkpoint] = None,
+            constraints: Optional[PlacementConstraints] = None) -> List[Tuple[SchemaData, str]]:
+        cols, rows = schema_data.cols, schema_data.rows
+        cells = cols * rows
+        elements = sorted(schema_data.nodes.keys())
+        if len(elements) > MAX_ELEMENTS or cells > MAX_CELLS:
+            get_dialogs().show_warning(
+                "Ошибка",
+                f"Точный алгоритм применим к схемам до {MAX_ELEMENTS} элементов "
+                f"и до {MAX_CELLS} позиций."
+            )
+            return []
+        if len(elements) > cells:
+            get_dialogs().show_warning("Ошибка", "Число элементов превышает число позиций сетки.")
+            return []
+
+        constraints = resolve_constraints(constraints, schema_data, ask=True)
+        if constraints is None:
+            return []
+        problem = self._build_problem(schema_data, elements, constraints)
+        assignment, cost = self._solve(problem, rows, cols, budget or Budget(),
+                                       schema_data, checkpoint, constraints.signature())
+        if cost == float("inf"):
+            get_dialogs().show_warning("Ошибка", "Не найдено размещения, удовлетворяющего ограничениям.")
+            return []
+
+        new_nodes: Dict[int, Node] = {}
+        for idx, element in enumerate(elements):
+            new_nodes[element] = Node(element, assignment[idx] + 1)
+        new_schema = SchemaData(new_nodes, schema_data.adjacency_matrix, cols, rows)
+        logger.info(f"Суммарная длина связей: {compute_total_weighted_length(new_schema)}")
+        return [(new_schema, f"{tab_name} точн. размещ.")]
+
+    @staticmethod
+    def _build_problem(schema_data: SchemaData, elements: List[int],
+                       constraints: PlacementConstraints) -> _Problem:
+        """
+        Строит симметричную матрицу весов и таблицу расстояний.
+        Вес пары берётся из верхнего треугольника матрицы смежности (как в compute_total_weighted_length).
+        """
+        matrix = schema_data.adjacency_matrix
+        n = len(elements)
+        weights = [[0] * n for _ in range(n)]
+        for a in range(n):
+            for b in range(a + 1, n):
+                i, j = elements[a] - 1, elements[b] - 1
+                if i > j:
+                    i, j = j, i
+                if i < len(matrix) and j < len(matrix[i]) and matrix[i][j] > 0:
+                    weights[a][b] = weights[b][a] = matrix[i][j]
+
+        geometry = get_grid_geometry(schema_data.rows, schema_data.cols)
+        dist = [list(geometry.distance_row(cell)) for cell in range(geometry.cells)]
+
+        fixed = {idx: constraints.fixed_cells[element] for idx, element in enumerate(elements)
+                 if element in constraints.fixed_cells}
+        allowed = [constraints.allowed.get(element) for element in elements]
+        # Ветвимся сначала по элементам с областями (у них меньше вариантов), затем –
+        # с наибольшей суммарной связностью; несвязанные элементы без областей
+        # на стоимость не влияют и расставляются в конце.
+        order = [idx for idx in range(n)
+                 if idx not in fixed and (any(weights[idx]) or allowed[idx] is not None)]
+        order.sort(key=lambda idx: (allowed[idx] is None, -sum(weights[idx])))
+        return _Problem(weights, dist, order, fixed, constraints.forbidden_cells, allowed)
+
+    def _solve(self, problem: _Problem, rows: int, cols: int, budget: Budget,
+               schema_data: SchemaData, checkpoint: Optional[Checkpoint],
+               signature: Tuple) -> Tuple[List[int], float]:
+        """
+        Запускает поиск: начальный рекорд даёт жадная эвристика,
+        затем ветви верхнего уровня обходятся параллельно.
+        В контрольной точке сохраняются рекорд и полностью обойдённые ветви верхнего уровня
+        (signature – описание ограничений, с которыми они получены).
+        Если допустимое размещение не найдено, возвращается стоимость float("inf").
+        """
+        n = len(problem.weights)
+        done: Set[int] = set()
+        state = checkpoint.load(schema_data) if checkpoint else None
+        if state is not None and state.get("constraints") == signature:
+            assignment, best_cost, done = state["assignment"], state["best_cost"], state["done"]
+            logger.info(f"Рекорд из контрольной точки: {best_cost}, обойдено ветвей: {len(done)}")
+        else:
+            assignment, best_cost = _greedy_solution(problem, n)
+            logger.info(f"Начальный рекорд (жадное размещение): {best_cost}")
+        if best_cost < float("inf"):
+            budget.report(best_cost)
+
+        if problem.order:
+            branches = [cell for cell in _top_level_cells(problem, rows, cols) if cell not in done]
+            workers = self.workers or os.cpu_count() or 1
+            workers = min(workers, max(1, len(branches)))
+            deadline = budget.deadline()
+            node_limit = None
+            if budget.max_iterations is not None:
+                # Лимит узлов делится поровну между ветвями верхнего уровня
+                node_limit = max(1, -(-(budget.max_iterations - budget.iterations) // max(1, len(branches))))
+            complete = True
+
+            def accept(cell: int, result: Tuple[float, Optional[List[int]], bool, int]) -> None:
+                nonlocal assignment, best_cost, complete
+                cost, found, finished, nodes = result
+                budget.tick(nodes)
+                complete = complete and finished
+                if finished:
+                    done.add(cell)
+                if found is not None and cost < best_cost:
+                    best_cost = cost
+                    assignment = found
+                    budget.report(best_cost)
+                if checkpoint and checkpoint.due():
+                    checkpoint.save(schema_data, {"constraints": signature, "assignment": assignment,
+                                                  "best_cost": best_cost, "done": done})
+
+            if workers <= 1:
+                _init_worker(None)
+                for cell in branches:
+                    accept(cell, _solve_branch(problem, cell, best_cost, deadline, node_limit))
+            else:
+                shared = multiprocessing.get_context("spawn").Value("d", best_cost)
+                with ProcessPoolExecutor(max_workers=workers,
+                                         mp_context=multiprocessing.get_context("spawn"),
+                                         initializer=_init_worker,
+                                         initargs=(shared,)) as executor:
+                    futures = {executor.submit(_solve_branch, problem, cell, best_cost,
+                                               deadline, node_limit): cell
+                               for cell in branches}
+                    for future in as_completed(futures):
+                        accept(futures[future], future.result())
+            if not complete:
+                logger.warning("Бюджет исчерпан: оптимальность размещения не доказана.")
+                if checkpoint:
+                    checkpoint.save(schema_data, {"constraints": signature, "assignment": assignment,
+                                                  "best_cost": best_cost, "done": done})
+            elif checkpoint:
+                checkpoint.clear()
+
+        _place_isolated(assignment, problem.initial_used())
+        return assignment, best_cost
+
+
+def _init_worker(shared) -> None:
+    global _shared_best
+    _shared_best = shared
+
+
+def _top_level_cells(problem: _Problem, rows: int, cols: int) -> List[int]:
+    """
+    Возвращает допустимые ячейки для первого элемента порядка ветвления.
+    Если ограничений нет, из симметричных (повороты/отражения сетки) ячеек
+    оставляется только одна – остальные дают зеркальные решения той же стоимости.
+    """
+    used = problem.initial_used()
+    allowed = problem.allowed[problem.order[0]]
+    free = [cell for cell in range(rows * cols)
+            if not used[cell] and (allowed is None or cell in allowed)]
+    if problem.constrained():
+        return free
+
+    def images(cell: int) -> List[int]:
+        r, c = divmod(cell, cols)
+        variants = [(r, c), (rows - 1 - r, c), (r, cols - 1 - c), (rows - 1 - r, cols - 1 - c)]
+        if rows == cols:
+            variants += [(c, r) for r, c in list(variants)]
+        return [vr * cols + vc for vr, vc in variants]
+
+    return [cell for cell in free if cell == min(images(cell))]
+
+
+def _assignment_cost(problem: _Problem, assignment: List[int]) -> float:
+    weights, dist = problem.weights, problem.dist
+    n = len(weights)
+    total = 0
+    for a in range(n):
+        if assignment[a] < 0:
+            continue
+        for b in range(a + 1, n):
+            if weights[a][b] and assignment[b] >= 0:
+                total += weights[a][b] * dist[assignment[a]][assignment[b]]
+    return total
+
+
+def _greedy_solution(problem: _Problem, n: int) -> Tuple[List[int], float]:
+    """
+    Жадное размещение с последующими попарными перестановками – начальный рекорд.
+    """
+    weights, dist, allowed = problem.weights, problem.dist, problem.allowed
+    cells = len(dist)
+    assignment = [-1] * n
+    used = problem.initial_used()
+    for idx, cell in problem.fixed.items():
+        assignment[idx] = cell
+    for idx in problem.order:
+        best_cell, best_inc = -1, None
+        for cell in range(cells):
+            if used[cell] or (allowed[idx] is not None and cell not in allowed[idx]):
+                continue
+            inc = sum(weights[idx][j] * dist[cell][assignment[j]]
+                      for j in range(n) if assignment[j] >= 0 and weights[idx][j])
+            if best_inc is None or inc < best_inc:
+                best_cell, best_inc = cell, inc
+        if best_cell < 0:
+            # Области элементов пересекаются так, что жадно их не расставить – рекорда нет
+            return assignment, float("inf")
+        assignment[idx] = best_cell
+        used[best_cell] = True
+
+    # Улучшение: обмен позициями пар элементов и перенос в свободные ячейки
+    movable = problem.order
+    blocked = set(problem.blocked)
+    cost = _assignment_cost(problem, assignment)
+    improved = True
+    while improved:
+        improved = False
+        for a in movable:
+            for cell in range(cells):
+                if cell == assignment[a] or cell in blocked or (allowed[a] is not None and cell not in allowed[a]):
+                    continue
+                other = next((b for b in range(n) if assignment[b] == cell), None)
+                if other is not None and (other not in movable or
+                                          (allowed[other] is not None and assignment[a] not in allowed[other])):
+                    continue
+                old_a = assignment[a]
+                assignment[a] = cell
+                if other is not None:
+                    assignment[other] = old_a
+                new_cost = _assignment_cost(problem, assignment)
+                if new_cost < cost:
+                    cost = new_cost
+                    improved = True
+                else:
+                    assignment[a] = old_a
+                    if other is not None:
+                        assignment[other] = cell
+    return assignment, cost
+
+
+def _place_isolated(assignment: List[int], used: List[bool]) -> None:
+    # Несвязанные элементы занимают оставшиеся свободные (незапрещённые) ячейки по порядку
+    for cell in assignment:
+        if cell >= 0:
+            used[cell] = True
+    free = (cell for cell in range(len(used)) if not used[cell])
+    for idx, cell in enumerate(assignment):
+        if cell < 0:
+            assignment[idx] = next(free)
+
+
+def _lower_bound(problem: _Problem, assignment: List[int], depth: int,
+                 free: List[int], fixed_cost: float) -> float:
+    """
+    Нижняя граница Гилмора–Лоулера для частичного размещения.
+
+    Для каждого свободного элемента i и свободной ячейки k оценивается
+        c(i,k) = sum_{j размещён} w(i,j) * d(k, p_j) + 1/2 * <w_i по убыванию, d_k по возрастанию>,
+    а затем назначение элементов в ячейки с минимальной суммой c(i,k) ищется венгерским алгоритмом.
+    """
+    weights, dist = problem.weights, problem.dist
+    unplaced = problem.order[depth:]
+    if not unplaced:
+        return fixed_cost
+    placed = [j for j in range(len(weights)) if assignment[j] >= 0]
+    k = len(unplaced) - 1
+
+    # Отсортированные расстояния от каждой свободной ячейки до остальных свободных
+    sorted_dist: List[List[int]] = []
+    if k:
+        for f in free:
+            row = dist[f]
+            sorted_dist.append(sorted(row[g] for g in free if g != f)[:k])
+
+    cost_matrix: List[List[float]] = []
+    for i in unplaced:
+        w_row = weights[i]
+        links = [(w_row[j], assignment[j]) for j in placed if w_row[j]]
+        w_sorted = sorted((w_row[j] for j in unplaced if j != i), reverse=True) if k else []
+        has_quad = bool(w_sorted) and w_sorted[0] > 0
+        row_costs: List[float] = []
+        for f_idx, f in enumerate(free):
+            d_row = dist[f]
+            value = float(sum(w * d_row[cell] for w, cell in links))
+            if has_quad:
+                value += 0.5 * sum(w * d for w, d in zip(w_sorted, sorted_dist[f_idx]))
+            row_costs.append(value)
+        cost_matrix.append(row_costs)
+    bound, _ = solve_assignment(cost_matrix)
+    return fixed_cost + bound
+
+
+def _search(problem: _Problem, assignment: List[int], used: List[bool],
+            depth: int, fixed_cost: float, state: _SearchState) -> None:
+    state.nodes_visited += 1
+    if state.out_of_budget():
+        return
+    if depth == len(problem.order):
+        if fixed_cost < state.bound():
+            state.update(fixed_cost, assignment)
+        return
+    free = [cell for cell in range(len(used)) if not used[cell]]
+    if _lower_bound(problem, assignment, depth, free, fixed_cost) >= state.bound():
+        return
+
+    idx = problem.order[depth]
+    weights, dist, allowed = problem.weights, problem.dist, problem.allowed[idx]
+    links = [(weights[idx][j], assignment[j]) for j in range(len(weights))
+             if assignment[j] >= 0 and weights[idx][j]]
+    # Сначала пробуем ячейки с наименьшим приращением стоимости
+    children = sorted((sum(w * dist[cell][p] for w, p in links), cell) for cell in free
+                      if allowed is None or cell in allowed)
+    for increment, cell in children:
+        if state.stopped:
+            break
+        if fixed_cost + increment >= state.bound():
+            continue
+        assignment[idx] = cell
+        used[cell] = True
+        _search(problem, assignment, used, depth + 1, fixed_cost + increment, state)
+        used[cell] = False
+        assignment[idx] = -1
+
+
+def _solve_branch(problem: _Problem, cell: int, best_cost: float,
+                  deadline: Optional[float] = None,
+                  node_limit: Optional[int] = None) -> Tuple[float, Optional[List[int]], bool, int]:
+    """
+    Обходит поддерево, в котором первый элемент порядка ветвления стоит в ячейке cell.
+    Возвращает лучшую найденную стоимость, размещение (None, если рекорд не улучшен),
+    признак полного обхода поддерева и число просмотренных узлов.
+    """
+    n = len(problem.weights)
+    assignment = [-1] * n
+    used = problem.initial_used()
+    for idx, fixed_cell in problem.fixed.items():
+        assignment[idx] = fixed_cell
+    fixed_cost = _assignment_cost(problem, assignment)
+
+    idx = problem.order[0]
+    fixed_cost += sum(problem.weights[idx][j] * problem.dist[cell][assignment[j]]
+                      for j in range(n) if assignment[j] >= 0)
+    assignment[idx] = cell
+    used[cell] = True
+
+    state = _SearchState(best_cost, deadline, node_limit)
+    _search(problem, assignment, used, 1, fixed_cost, state)
+    logger.info(f"Ветвь {cell + 1}: просмотрено узлов {state.nodes_visited}")
+    return state.best_cost, state.best_assignment, not state.stopped, state.nodes_visited
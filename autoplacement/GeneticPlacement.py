@@ -0,0 +1,270 @@
+import logging
+import random
+from array import array
+from typing import Dict, List, Optional, Set, Tuple
+
+from autoplacement.AbstractAutoPlacement import AbstractAutoPlacement
+from autoplacement.budget import Budget
+from autoplacement.checkpoint import Checkpoint
+from autoplacement.constraints import CellMask, PlacementConstraints, resolve_constraints
+from autoplacement.grid import get_grid_geometry
+from autoplacement.utils import batch_total_weighted_length, get_weighted_edges
+from dialogs import get_dialogs
+from models import SchemaData, Node
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+if not logger.handlers:
+    ch = logging.StreamHandler()
+    ch.setLevel(logging.INFO)
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    ch.setFormatter(formatter)
+    logger.addHandler(ch)
+
+
+class GeneticPlacement(AbstractAutoPlacement):
+    """
+    Генетический (эволюционный) алгоритм размещения:
+      - Особь – перестановка свободных ячеек; первые гены задают ячейки перемещаемых элементов,
+        остальные – пустые ячейки. Популяция хранится одним массивом (особи x гены).
+      - Оценка всего поколения выполняется за один проход по рёбрам (batch_total_weighted_length).
+      - Скрещивание – упорядоченное (OX), сохраняющее перестановку; мутация – обмен двух генов.
+      - Закреплённые элементы (ограничения или директивы пользователя) исключаются из хромосомы
+        и не двигаются, запрещённые позиции не входят в перестановку.
+      - За каждый элемент вне своей области к оценке особи добавляется штраф, больший любой
+        длины связей (проверка гена – O(1) по маске области), поэтому допустимые особи
+        всегда лучше недопустимых; начальная популяция строится из допустимых размещений.
+      - Число поколений ограничено бюджетом (по умолчанию generations); элитизм гарантирует,
+        что по исчерпании бюджета лучшая найденная особь остаётся в популяции.
+      - Возвращаются лучшие различные особи последнего поколения.
+      - Если передана контрольная точка, популяция, состояние генератора и номер поколения
+        периодически сохраняются, и прерванный запуск продолжается с них.
+    """
+
+    def __init__(self, population_size: int = 60, generations: int = 300,
+                 mutation_rate: float = 0.3, elite: int = 2, tournament: int = 3,
+                 variants: int = 3, seed: Optional[int] = None,
+                 use_directives: bool = True) -> None:
+        self.population_size = population_size
+        self.generations = generations
+        self.mutation_rate = mutation_rate
+        self.elite = elite
+        self.tournament = tournament
+        self.variants = variants
+        self.seed = seed
+        # False – директивы не запрашиваются (например, при запуске на грубом уровне другого алгоритма)
+        self.use_directives = use_directives
+
+    def get_name(self) -> str:
+        return "Генетический алгоритм размещения"
+
+    def run(self, schema_data: SchemaData, tab_name: str,
+            budget: Optional[Budget] = None,
+            checkpoint: Optional[Checkpoint] = None,
+            constraints: Optional[PlacementConstraints] = None) -> List[Tuple[SchemaData, str]]:
+        cols, rows = schema_data.cols, schema_data.rows
+        cells = cols * rows
+        if len(schema_data.nodes) > cells:
+            get_dialogs().show_warning("Ошибка", "Число элементов превышает число позиций сетки.")
+            return []
+        constraints = resolve_constraints(constraints, schema_data, ask=self.use_directives)
+        if constraints is None:
+            return []
+        fixed: Dict[int, int] = constraints.fixed_cells
+
+        rng = random.Random(self.seed)
+        geometry = get_grid_geometry(rows, cols)
+        movable = [element for element in sorted(schema_data.nodes) if element not in fixed]
+        free_cells = [cell for cell in range(cells) if cell not in constraints.blocked]
+        width = len(free_cells)
+        gene_of = {element: gene for gene, element in enumerate(movable)}
+        genes = len(movable)
+
+        # Рёбра между перемещаемыми элементами, рёбра к закреплённым и постоянная часть стоимости
+        edges: List[Tuple[int, int, int]] = []
+        anchors: List[Tuple[int, int, int]] = []
+        constant = 0
+        total_weight = 0
+        for i, j, weight in get_weighted_edges(schema_data):
+            total_weight += weight
+            if i in gene_of and j in gene_of:
+                edges.append((gene_of[i], gene_of[j], weight))
+            elif i in gene_of and j in fixed:
+                anchors.append((gene_of[i], fixed[j], weight))
+            elif j in gene_of and i in fixed:
+                anchors.append((gene_of[j], fixed[i], weight))
+            elif i in fixed and j in fixed:
+                constant += weight * geometry.dist(fixed[i], fixed[j])
+        # Гены элементов с областями и штраф за элемент вне области (больше любой длины связей)
+        restricted = [(gene_of[element], constraints.allowed[element])
+                      for element in movable if element in constraints.allowed]
+        penalty = total_weight * (rows + cols) + 1
+
+        def evaluate(population: array) -> List[int]:
+            scores = batch_total_weighted_length(population, width, edges, anchors, geometry)
+            if restricted:
+                self._penalize(scores, population, width, restricted, penalty)
+            return scores
+
+        if genes == 0 or width == 0:
+            population = array('i', free_cells)
+            scores = [0]
+        else:
+            budget = Budget.resolve(budget, self.generations)
+            state = checkpoint.load(schema_data) if checkpoint else None
+            if (state is not None and state.get("constraints") == constraints.signature()
+                    and len(state["population"]) % width == 0):
+                # Продолжаем с сохранённого поколения
+                population = state["population"]
+                rng.setstate(state["rng"])
+                budget.tick(state["generation"])
+            else:
+                try:
+                    population = self._initial_population(schema_data, movable, free_cells, rng, constraints)
+                except ValueError as e:
+                    get_dialogs().show_warning("Ошибка", f"Не удалось построить начальную популяцию: {e}")
+                    return []
+            scores = evaluate(population)
+            budget.report(min(scores) + constant)
+            while not budget.expired():
+                population = self._next_generation(population, scores, width, genes, rng)
+                scores = evaluate(population)
+                budget.report(min(scores) + constant)
+                if budget.iterations % 50 == 0:
+                    logger.info(f"Поколение {budget.iterations}: лучшая длина связей {min(scores) + constant}")
+                budget.tick()
+                if checkpoint and checkpoint.due():
+                    self._save_checkpoint(checkpoint, schema_data, constraints, population, scores,
+                                          width, constant, rng, budget.iterations)
+            if checkpoint:
+                # Контрольная точка удаляется, только если пройдены все поколения;
+                # прерванный по времени запуск сохраняет последнее поколение
+                if budget.completed():
+                    checkpoint.clear()
+                else:
+                    self._save_checkpoint(checkpoint, schema_data, constraints, population, scores,
+                                          width, constant, rng, budget.iterations)
+
+        results: List[Tuple[SchemaData, str]] = []
+        seen: Set[Tuple[int, ...]] = set()
+        for k in sorted(range(len(scores)), key=scores.__getitem__):
+            individual = tuple(population[k * width:k * width + genes])
+            if individual in seen or (restricted and scores[k] >= penalty):
+                continue
+            seen.add(individual)
+            new_nodes: Dict[int, Node] = {
+                element: Node(element, cell + 1) for element, cell in fixed.items()
+            }
+            for element, cell in zip(movable, individual):
+                new_nodes[element] = Node(element, cell + 1)
+            new_schema = SchemaData(new_nodes, schema_data.adjacency_matrix, cols, rows)
+            logger.info(f"Вариант {len(results) + 1}: длина связей {scores[k] + constant}")
+            results.append((new_schema, f"{tab_name} ген. размещ. {len(results) + 1}"))
+            if len(results) >= self.variants:
+                break
+        if not results:
+            get_dialogs().show_warning("Ошибка", "Не найдено размещения, удовлетворяющего ограничениям.")
+        return results
+
+    def _initial_population(self, schema_data: SchemaData, movable: List[int],
+                            free_cells: List[int], rng: random.Random,
+                            constraints: PlacementConstraints) -> array:
+        """
+        Формирует начальную популяцию: случайные перестановки свободных ячеек
+        (если у элементов есть области – случайные размещения, удовлетворяющие им).
+        Текущее размещение схемы (если оно допустимо) добавляется как одна из особей.
+        """
+        population = array('i')
+        current = [schema_data.nodes[element].grid_position - 1 for element in movable]
+        free_set = set(free_cells)
+        current_set = set(current)
+        if (len(current_set) == len(current) and current_set <= free_set and
+                all(constraints.allows(element, cell) for element, cell in zip(movable, current))):
+            rest = [cell for cell in free_cells if cell not in current_set]
+            population.extend(current + rest)
+        while len(population) < self.population_size * len(free_cells):
+            if constraints.allowed:
+                placed = constraints.sample(movable, rng)
+                taken = set(placed)
+                rest = [cell for cell in free_cells if cell not in taken]
+                rng.shuffle(rest)
+                population.extend(placed + rest)
+            else:
+                individual = free_cells[:]
+                rng.shuffle(individual)
+                population.extend(individual)
+        return population
+
+    @staticmethod
+    def _penalize(scores: List[int], population: array, width: int,
+                  restricted: List[Tuple[int, CellMask]], penalty: int) -> None:
+        """
+        Добавляет к оценкам штраф penalty за каждый ген, стоящий вне маски своей области.
+        """
+        for k in range(len(scores)):
+            base = k * width
+            violations = sum(1 for gene, mask in restricted if population[base + gene] not in mask)
+            if violations:
+                scores[k] += penalty * violations
+
+    @staticmethod
+    def _save_checkpoint(checkpoint: Checkpoint, schema_data: SchemaData,
+                         constraints: PlacementConstraints, population: array, scores: List[int],
+                         width: int, constant: int, rng: random.Random, generation: int) -> None:
+        """
+        Сохраняет поколение, его лучшую особь, состояние генератора и номер поколения.
+        """
+        best = min(range(len(scores)), key=scores.__getitem__)
+        checkpoint.save(schema_data, {
+            "constraints": constraints.signature(),
+            "population": population,
+            "best": population[best * width:(best + 1) * width],
+            "best_cost": scores[best] + constant,
+            "rng": rng.getstate(),
+            "generation": generation,
+        })
+
+    def _next_generation(self, population: array, scores: List[int], width: int,
+                         genes: int, rng: random.Random) -> array:
+        """
+        Строит следующее поколение: элитные особи переходят без изменений,
+        остальные получаются турнирным отбором, скрещиванием OX и мутацией.
+        """
+        count = len(scores)
+        ranked = sorted(range(count), key=scores.__getitem__)
+        offspring = array('i')
+        for k in ranked[:self.elite]:
+            offspring.extend(population[k * width:(k + 1) * width])
+
+        def select() -> array:
+            k = min(rng.sample(range(count), min(self.tournament, count)), key=scores.__getitem__)
+            return population[k * width:(k + 1) * width]
+
+        while len(offspring) < count * width:
+            child = self._order_crossover(select(), select(), rng)
+            if rng.random() < self.mutation_rate:
+                a = rng.randrange(genes)
+                b = rng.randrange(width)
+                child[a], child[b] = child[b], child[a]
+            offspring.extend(child)
+        return offspring
+
+    @staticmethod
+    def _order_crossover(first: array, second: array, rng: random.Random) -> array:
+        """
+        Упорядоченное скрещивание (OX): отрезок [start, end) берётся из первого родителя,
+        остальные ячейки – в порядке их следования во втором родителе, начиная с end.
+        """
+        width = len(first)
+        start, end = sorted(rng.sample(range(width + 1), 2))
+        child = array('i', [-1]) * width
+        child[start:end] = first[start:end]
+        taken = set(first[start:end])
+        position = end % width
+        for offset in range(width):
+            cell = second[(end + offset) % width]
+            if cell in taken:
+                continue
+            child[position] = cell
+            position = (position + 1) % width
+        return child
@@ -0,0 +1,65 @@
+import logging
+from typing import Iterable, List, Optional, Tuple
+
+from autoplacement.AbstractAutoPlacement import AbstractAutoPlacement
+from autoplacement.budget import Budget
+from autoplacement.checkpoint import Checkpoint
+from autoplacement.constraints import PlacementConstraints, resolve_constraints
+from autoplacement.localsearch import RelocationSearch, local_state_from_schema, schema_from_state
+from dialogs import get_dialogs
+from models import SchemaData
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+if not logger.handlers:
+    ch = logging.StreamHandler()
+    ch.setLevel(logging.INFO)
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    ch.setFormatter(formatter)
+    logger.addHandler(ch)
+
+
+class IncrementalPlacement(AbstractAutoPlacement):
+    """
+    Доразмещение после правки связей: текущее размещение сохраняется, локальным поиском
+    (RelocationSearch – перемещения, обмены, цепочки вытеснения) улучшается только окно
+    из элементов на расстоянии не более hops связей от изменённых элементов changed.
+
+    Работа пропорциональна размеру окна, а не схемы, поэтому небольшие правки
+    обрабатываются за миллисекунды. В budget.trace первым отмечается длина связей окна
+    до доразмещения, последним – после; их разность равна изменению суммарной длины связей.
+
+    Алгоритм не входит в AUTO_PLACEMENT_ALGORITHMS: изменённые элементы известны
+    только редактору (SchemaEditor.dirty_nodes).
+    """
+
+    def __init__(self, changed: Iterable[int], hops: int = 2, passes: int = 20, window: int = 2,
+                 chain_candidates: int = 3, chain_radius: int = 3) -> None:
+        self.changed = set(changed)
+        self.hops = hops
+        self.passes = passes
+        self.search = RelocationSearch(window, chain_candidates, chain_radius)
+
+    def get_name(self) -> str:
+        return "Доразмещение вокруг изменённых элементов"
+
+    def run(self, schema_data: SchemaData, tab_name: str,
+            budget: Optional[Budget] = None,
+            checkpoint: Optional[Checkpoint] = None,
+            constraints: Optional[PlacementConstraints] = None) -> List[Tuple[SchemaData, str]]:
+        constraints = resolve_constraints(constraints, schema_data)
+        if constraints is None:
+            return []
+        try:
+            state, elements, window = local_state_from_schema(schema_data, self.changed, self.hops,
+                                                              constraints)
+        except ValueError as e:
+            get_dialogs().show_warning("Ошибка", f"Текущее размещение недопустимо: {e}")
+            return []
+        budget = Budget.resolve(budget, self.passes)
+        initial_cost = state.cost_of(window)
+        budget.report(initial_cost)
+        delta = self.search.improve(state, budget, window)
+        budget.report(initial_cost + delta)
+        logger.info(f"Окно из {len(window)} элементов: длина связей {initial_cost} -> {initial_cost + delta}")
+        return [(schema_from_state(schema_data, state, elements), f"{tab_name} доразмещ.")]
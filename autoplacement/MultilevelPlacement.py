@@ -0,0 +1,259 @@
+import logging
+import random
+from typing import Dict, List, Optional, Tuple
+
+from autoplacement.AbstractAutoPlacement import AbstractAutoPlacement
+from autoplacement.budget import Budget
+from autoplacement.checkpoint import Checkpoint
+from autoplacement.constraints import PlacementConstraints, resolve_constraints
+from autoplacement.grid import get_grid_geometry
+from autoplacement.localsearch import PlacementState, RelocationSearch, schema_from_state, state_from_schema
+from autoplacement.utils import compute_total_weighted_length, get_weighted_edges
+from dialogs import get_dialogs
+from models import SchemaData, Node, SparseAdjacencyMatrix
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+if not logger.handlers:
+    ch = logging.StreamHandler()
+    ch.setLevel(logging.INFO)
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    ch.setFormatter(formatter)
+    logger.addHandler(ch)
+
+# Во сколько раз (не меньше) уменьшается число узлов на каждом уровне огрубления
+MIN_SHRINK = 0.75
+
+
+class _Level:
+    """
+    Один уровень многоуровневой иерархии.
+
+    Attributes:
+        adjacency (List[Dict[int, int]]): Разреженная матрица смежности (узел -> {сосед: вес}).
+        members (List[List[int]]): Для каждого узла – узлы более мелкого уровня, из которых он состоит.
+        cols, rows: Размеры сетки уровня.
+        halved_cols (bool): Уровень получен делением пополам колонок (иначе – строк) предыдущей сетки.
+    """
+
+    def __init__(self, adjacency: List[Dict[int, int]], members: List[List[int]],
+                 cols: int, rows: int, halved_cols: bool) -> None:
+        self.adjacency = adjacency
+        self.members = members
+        self.cols = cols
+        self.rows = rows
+        self.halved_cols = halved_cols
+
+
+class MultilevelPlacement(AbstractAutoPlacement):
+    """
+    Многоуровневое размещение (V-цикл) для больших схем:
+      - Огрубление: узлы попарно объединяются по самым тяжёлым рёбрам (heavy-edge matching),
+        а сетка на каждом уровне уменьшается вдвое по большей стороне.
+      - Грубая схема размещается любым алгоритмом AbstractAutoPlacement (coarse_solver).
+      - Восстановление: узлы кластера занимают ячейки, накрываемые ячейкой грубого уровня,
+        после чего на каждом уровне выполняется локальное улучшение перемещениями и обменами
+        (пока не исчерпан бюджет).
+    Ограничения размещения учитываются после V-цикла: закреплённые элементы ставятся
+    в свои позиции, нарушители – в ближайшие допустимые, затем размещение улучшается
+    локальным поиском (RelocationSearch) с проверкой ограничений.
+    """
+
+    def __init__(self, coarse_solver: AbstractAutoPlacement, coarse_size: int = 48,
+                 refine_passes: int = 3, window: int = 1, seed: Optional[int] = None) -> None:
+        self.coarse_solver = coarse_solver
+        self.coarse_size = coarse_size
+        self.refine_passes = refine_passes
+        self.window = window
+        self.seed = seed
+
+    def get_name(self) -> str:
+        return f"Многоуровневое размещение ({self.coarse_solver.get_name()})"
+
+    def run(self, schema_data: SchemaData, tab_name: str,
+            budget: Optional[Budget] = None,
+            checkpoint: Optional[Checkpoint] = None,
+            constraints: Optional[PlacementConstraints] = None) -> List[Tuple[SchemaData, str]]:
+        cols, rows = schema_data.cols, schema_data.rows
+        elements = sorted(schema_data.nodes)
+        if len(elements) > cols * rows:
+            get_dialogs().show_warning("Ошибка", "Число элементов превышает число позиций сетки.")
+            return []
+        constraints = resolve_constraints(constraints, schema_data)
+        if constraints is None:
+            return []
+        rng = random.Random(self.seed)
+        budget = budget or Budget()
+
+        index_of = {element: idx for idx, element in enumerate(elements)}
+        adjacency: List[Dict[int, int]] = [{} for _ in elements]
+        for i, j, weight in get_weighted_edges(schema_data):
+            if i in index_of and j in index_of:
+                a, b = index_of[i], index_of[j]
+                adjacency[a][b] = adjacency[b][a] = weight
+
+        levels = [_Level(adjacency, [[idx] for idx in range(len(elements))], cols, rows, True)]
+        while len(levels[-1].adjacency) > self.coarse_size and levels[-1].cols * levels[-1].rows > 1:
+            coarse = self._coarsen(levels[-1], rng)
+            if len(coarse.adjacency) == len(levels[-1].adjacency):
+                break
+            levels.append(coarse)
+            logger.info(f"Уровень {len(levels) - 1}: {len(coarse.adjacency)} узлов, "
+                        f"сетка {coarse.cols}x{coarse.rows}")
+
+        # Грубому уровню отводится половина оставшегося времени, остальное – на улучшение
+        remaining = budget.remaining()
+        coarse_budget = Budget(time_limit=remaining / 2) if remaining is not None else None
+        positions = self._solve_coarsest(levels[-1], tab_name, coarse_budget)
+        positions = self._refine(levels[-1], positions, budget)
+        for depth in range(len(levels) - 1, 0, -1):
+            positions = self._project(levels[depth], levels[depth - 1], positions)
+            positions = self._refine(levels[depth - 1], positions, budget)
+
+        new_nodes: Dict[int, Node] = {
+            element: Node(element, positions[idx] + 1) for idx, element in enumerate(elements)
+        }
+        new_schema = SchemaData(new_nodes, schema_data.adjacency_matrix, cols, rows)
+        if not constraints.is_empty():
+            try:
+                state, state_elements = state_from_schema(new_schema, constraints)
+            except ValueError as e:
+                get_dialogs().show_warning("Ошибка", f"Не удалось выполнить ограничения размещения: {e}")
+                return []
+            RelocationSearch(self.window).improve(state, budget)
+            new_schema = schema_from_state(new_schema, state, state_elements)
+        total_length = compute_total_weighted_length(new_schema)
+        budget.report(total_length)
+        logger.info(f"Итоговая длина связей: {total_length}")
+        return [(new_schema, f"{tab_name} многоур. размещ.")]
+
+    @staticmethod
+    def _coarsen(level: _Level, rng: random.Random) -> _Level:
+        """
+        Строит более грубый уровень: сопоставление по тяжёлым рёбрам, затем (если уровень
+        уменьшился недостаточно) принудительное объединение одиночных узлов.
+        """
+        halved_cols = level.cols >= level.rows
+        cols = (level.cols + 1) // 2 if halved_cols else level.cols
+        rows = level.rows if halved_cols else (level.rows + 1) // 2
+        n = len(level.adjacency)
+
+        match = [-1] * n
+        order = list(range(n))
+        rng.shuffle(order)
+        for node in order:
+            if match[node] != -1:
+                continue
+            best, best_weight = -1, 0
+            for neighbour, weight in level.adjacency[node].items():
+                if match[neighbour] == -1 and neighbour != node and weight > best_weight:
+                    best, best_weight = neighbour, weight
+            if best != -1:
+                match[node], match[best] = best, node
+
+        # Одиночные узлы объединяются принудительно, пока кластеров больше, чем ячеек новой
+        # сетки или чем MIN_SHRINK узлов уровня: иначе огрубление остановилось бы на большом уровне
+        clusters = n - sum(1 for node in range(n) if match[node] > node)
+        singles = [node for node in order if match[node] == -1]
+        limit = min(cols * rows, int(n * MIN_SHRINK))
+        while clusters > limit and len(singles) >= 2:
+            a, b = singles.pop(), singles.pop()
+            match[a], match[b] = b, a
+            clusters -= 1
+
+        cluster_of = [-1] * n
+        members: List[List[int]] = []
+        for node in range(n):
+            if cluster_of[node] != -1:
+                continue
+            group = [node] if match[node] == -1 else [node, match[node]]
+            for member in group:
+                cluster_of[member] = len(members)
+            members.append(group)
+
+        adjacency: List[Dict[int, int]] = [{} for _ in members]
+        for node in range(n):
+            a = cluster_of[node]
+            for neighbour, weight in level.adjacency[node].items():
+                b = cluster_of[neighbour]
+                if a != b:
+                    adjacency[a][b] = adjacency[a].get(b, 0) + weight
+        return _Level(adjacency, members, cols, rows, halved_cols)
+
+    def _solve_coarsest(self, level: _Level, tab_name: str,
+                        budget: Optional[Budget]) -> List[int]:
+        """
+        Размещает самый грубый граф выбранным алгоритмом через обычную SchemaData
+        с разреженной матрицей смежности (память – по числу связей, а не n*n).
+        """
+        n = len(level.adjacency)
+        matrix = SparseAdjacencyMatrix(n, [dict(neighbours) for neighbours in level.adjacency])
+        nodes = {idx + 1: Node(idx + 1, idx + 1) for idx in range(n)}
+        coarse_schema = SchemaData(nodes, matrix, level.cols, level.rows)
+        variants = self.coarse_solver.run(coarse_schema, tab_name, budget)
+        if not variants:
+            logger.warning("Алгоритм грубого уровня не вернул размещения, используется исходный порядок.")
+            return list(range(n))
+        placed = variants[0][0].nodes
+        return [placed[idx + 1].grid_position - 1 for idx in range(n)]
+
+    @staticmethod
+    def _project(coarse: _Level, fine: _Level, positions: List[int]) -> List[int]:
+        """
+        Переносит размещение с грубого уровня на более мелкий: каждый кластер занимает ячейки,
+        накрываемые его ячейкой; не поместившиеся узлы ставятся в ближайшие свободные ячейки.
+        """
+        fine_positions = [-1] * len(fine.adjacency)
+        occupied = [False] * (fine.cols * fine.rows)
+        overflow: List[Tuple[int, int]] = []
+        for cluster, cell in enumerate(positions):
+            r, c = divmod(cell, coarse.cols)
+            if coarse.halved_cols:
+                block = [r * fine.cols + cc for cc in (2 * c, 2 * c + 1) if cc < fine.cols]
+            else:
+                block = [rr * fine.cols + c for rr in (2 * r, 2 * r + 1) if rr < fine.rows]
+            for member, target in zip(coarse.members[cluster], block):
+                fine_positions[member] = target
+                occupied[target] = True
+            for member in coarse.members[cluster][len(block):]:
+                overflow.append((member, block[0]))
+
+        for member, target in overflow:
+            cell = _nearest_free_cell(target, occupied, fine.cols, fine.rows)
+            fine_positions[member] = cell
+            occupied[cell] = True
+        return fine_positions
+
+    def _refine(self, level: _Level, positions: List[int], budget: Budget) -> List[int]:
+        """
+        Локальное улучшение уровня поиском RelocationSearch (перемещения, обмены и цепочки
+        вытеснения в окне вокруг медианы соседей), не больше refine_passes проходов.
+        Итерацией бюджета считается один проход по узлам уровня.
+        """
+        state = PlacementState(level.adjacency, positions, get_grid_geometry(level.rows, level.cols))
+        search = RelocationSearch(self.window)
+        order = search.movable_order(state)
+        for _ in range(self.refine_passes):
+            if budget.expired():
+                break
+            budget.tick()
+            if search.improve_pass(state, budget, order) == 0:
+                break
+        return state.positions
+
+
+def _nearest_free_cell(cell: int, occupied: List[bool], cols: int, rows: int) -> int:
+    """
+    Ищет ближайшую (по манхэттенскому расстоянию) свободную ячейку, обходя кольца вокруг cell.
+    """
+    r0, c0 = divmod(cell, cols)
+    for radius in range(cols + rows):
+        for dr in range(-radius, radius + 1):
+            r = r0 + dr
+            if not 0 <= r < rows:
+                continue
+            rest = radius - abs(dr)
+            for c in {c0 - rest, c0 + rest}:
+                if 0 <= c < cols and not occupied[r * cols + c]:
+                    return r * cols + c
+    raise ValueError("В сетке нет свободных ячеек")
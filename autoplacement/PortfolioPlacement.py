@@ -0,0 +1,245 @@
+import logging
+import multiprocessing
+import time
+from multiprocessing.connection import wait
+from typing import Dict, List, Optional, Tuple
+
+from autoplacement.AbstractAutoPlacement import AbstractAutoPlacement
+from autoplacement.budget import Budget
+from autoplacement.checkpoint import Checkpoint
+from autoplacement.constraints import PlacementConstraints, resolve_constraints
+from autoplacement.utils import compute_total_weighted_length
+from models import SchemaData, Node
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+if not logger.handlers:
+    ch = logging.StreamHandler()
+    ch.setLevel(logging.INFO)
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    ch.setFormatter(formatter)
+    logger.addHandler(ch)
+
+# Ограничение времени состязания, если бюджет не задаёт его, с
+DEFAULT_TIME_LIMIT = 30.0
+# Сколько секунд до конца бюджета оставляется процессу на передачу результата
+RESULT_RESERVE = 0.5
+# Сколько секунд ждать завершения процесса после отмены, прежде чем остановить его принудительно
+CANCEL_TIMEOUT = 1.0
+
+
+class _RaceBudget(Budget):
+    """
+    Бюджет участника состязания: сообщает об улучшениях стоимости в канал участника
+    и считается исчерпанным, когда участник отменён.
+    """
+
+    def __init__(self, index: int, connection, cancelled, time_limit: Optional[float],
+                 max_iterations: Optional[int]) -> None:
+        super().__init__(time_limit, max_iterations)
+        self.index = index
+        self.connection = connection
+        self.cancelled = cancelled
+
+    def expired(self) -> bool:
+        return self.cancelled.is_set() or super().expired()
+
+    def report(self, cost: float) -> None:
+        improved = not self.trace or cost < self.trace[-1][1]
+        super().report(cost)
+        if improved:
+            self.connection.send(("cost", self.index, cost))
+
+
+def _race_worker(index: int, algorithm: AbstractAutoPlacement, schema_data: SchemaData,
+                 tab_name: str, deadline: float, max_iterations: Optional[int],
+                 constraints: PlacementConstraints, connection, cancelled) -> None:
+    """
+    Запускает одного участника в отдельном процессе. У каждого участника свой канал
+    (connection): принудительная остановка процесса во время записи портит только его канал.
+    Последнее сообщение всегда "done" (стоимость, позиции узлов, название варианта) или "error".
+    """
+    try:
+        time_limit = max(0.0, deadline - time.time() - RESULT_RESERVE)
+        budget = _RaceBudget(index, connection, cancelled, time_limit, max_iterations)
+        variants = algorithm.run(schema_data, tab_name, budget, constraints=constraints)
+        if not variants:
+            connection.send(("error", index, "алгоритм не вернул ни одного варианта"))
+            return
+        new_schema, variant_text = variants[0]
+        positions = {number: node.grid_position for number, node in new_schema.nodes.items()}
+        connection.send(("done", index, compute_total_weighted_length(new_schema), positions, variant_text))
+    except Exception as e:
+        connection.send(("error", index, str(e)))
+    finally:
+        connection.close()
+
+
+class _Run:
+    """
+    Запущенный участник: процесс, его канал, флаг отмены, лучшая промежуточная стоимость.
+    """
+
+    def __init__(self, process, connection, cancelled) -> None:
+        self.process = process
+        self.connection = connection
+        self.cancelled = cancelled
+        self.best_cost: Optional[float] = None
+        self.cancelled_at: Optional[float] = None
+
+    def cancel(self) -> None:
+        if self.cancelled_at is None:
+            self.cancelled.set()
+            self.cancelled_at = time.monotonic()
+
+
+class PortfolioPlacement(AbstractAutoPlacement):
+    """
+    Состязание алгоритмов авторазмещения («лучший из всех»).
+
+    Несколько алгоритмов запускаются на одной схеме одновременно в отдельных процессах
+    (не более workers сразу) и сообщают об улучшениях стоимости. После grace доли бюджета
+    участник, чья лучшая стоимость хуже лидера более чем в (1 + margin) раз, отменяется.
+    По истечении бюджета отменяются все оставшиеся; возвращается лучший полученный вариант.
+
+    Контрольные точки не используются: участники – разные алгоритмы с разным состоянием.
+    Ограничения размещения (или директивы) запрашиваются один раз до запуска и передаются
+    всем участникам: в рабочих процессах диалогов нет, и участники сами их не запрашивают.
+    Процессы участников не демонические: участник может сам открыть пул процессов
+    (например, BranchAndBoundPlacement); по окончании состязания они останавливаются явно.
+    """
+
+    def __init__(self, candidates: Optional[List[AbstractAutoPlacement]] = None,
+                 workers: Optional[int] = None, grace: float = 0.25, margin: float = 0.2) -> None:
+        """
+        candidates – участники; по умолчанию все алгоритмы из AUTO_PLACEMENT_ALGORITHMS,
+        кроме самого состязания. workers – сколько участников работает одновременно
+        (по умолчанию – все).
+        """
+        self.candidates = candidates
+        self.workers = workers
+        self.grace = grace
+        self.margin = margin
+
+    def get_name(self) -> str:
+        return "Лучший из алгоритмов (состязание)"
+
+    def _get_candidates(self) -> List[AbstractAutoPlacement]:
+        if self.candidates is not None:
+            return self.candidates
+        from autoplacement import AUTO_PLACEMENT_ALGORITHMS  # Локальный импорт: реестр ссылается на этот модуль
+        return [algorithm for algorithm in AUTO_PLACEMENT_ALGORITHMS
+                if algorithm is not self and algorithm.get_name() != self.get_name()]
+
+    def run(self, schema_data: SchemaData, tab_name: str,
+            budget: Optional[Budget] = None,
+            checkpoint: Optional[Checkpoint] = None,
+            constraints: Optional[PlacementConstraints] = None) -> List[Tuple[SchemaData, str]]:
+        candidates = self._get_candidates()
+        if not candidates:
+            return []
+        constraints = resolve_constraints(constraints, schema_data, ask=True)
+        if constraints is None:
+            return []
+        budget = budget or Budget()
+        time_limit = budget.remaining()
+        if time_limit is None:
+            time_limit = DEFAULT_TIME_LIMIT
+        started = time.monotonic()
+        deadline = time.time() + time_limit
+        # По умолчанию все участники работают одновременно: отмена проигрывающих освобождает процессор
+        workers = min(len(candidates), self.workers or len(candidates))
+
+        context = multiprocessing.get_context("spawn")
+        pending = list(range(len(candidates)))
+        running: Dict[int, _Run] = {}
+        # Завершившиеся участники: индекс -> (стоимость, позиции, название варианта)
+        results: Dict[int, Tuple[float, Dict[int, int], str]] = {}
+
+        def leader_cost() -> Optional[float]:
+            costs = [run.best_cost for run in running.values() if run.best_cost is not None]
+            costs += [result[0] for result in results.values()]
+            return min(costs, default=None)
+
+        def finish(index: int) -> None:
+            run = running.pop(index)
+            run.process.join(CANCEL_TIMEOUT)
+            if run.process.is_alive():
+                run.process.terminate()
+                run.process.join(CANCEL_TIMEOUT)
+            run.connection.close()
+
+        try:
+            while pending or running:
+                now = time.monotonic()
+                # Бюджет вызывающего тоже проверяется: так состязание можно отменить извне
+                out_of_time = now - started >= time_limit or budget.expired()
+                # Запускаем ожидающих, пока есть свободные процессы и время
+                while pending and len(running) < workers and not out_of_time:
+                    index = pending.pop(0)
+                    cancelled = context.Event()
+                    receiver, sender = context.Pipe(duplex=False)
+                    process = context.Process(
+                        target=_race_worker,
+                        args=(index, candidates[index], schema_data, tab_name, deadline,
+                              budget.max_iterations, constraints, sender, cancelled))
+                    process.start()
+                    # Передающий конец остаётся только у участника: по его завершении канал даёт EOF
+                    sender.close()
+                    running[index] = _Run(process, receiver, cancelled)
+                if out_of_time:
+                    pending.clear()
+
+                channels = {run.connection: index for index, run in running.items()}
+                for connection in wait(list(channels), timeout=0.1):
+                    index = channels[connection]
+                    try:
+                        message = connection.recv()
+                    except Exception:
+                        # Канал закрыт (процесс завершился или остановлен) или сообщение оборвано
+                        logger.warning(f"{candidates[index].get_name()}: процесс завершился без результата")
+                        finish(index)
+                        continue
+                    kind = message[0]
+                    if kind == "cost":
+                        run = running[index]
+                        if run.best_cost is None or message[2] < run.best_cost:
+                            run.best_cost = message[2]
+                    elif kind == "done":
+                        results[index] = (message[2], message[3], message[4])
+                        logger.info(f"{candidates[index].get_name()}: длина связей {message[2]}")
+                        # В трассу попадают только завершённые результаты: промежуточные
+                        # стоимости участника могут не дойти до итога (отмена, сбой)
+                        budget.report(message[2])
+                        finish(index)
+                    elif kind == "error":
+                        logger.warning(f"{candidates[index].get_name()}: {message[2]}")
+                        finish(index)
+
+                # Отмена явно проигрывающих участников и всех – по окончании бюджета
+                leader = leader_cost()
+                for index, run in running.items():
+                    if out_of_time:
+                        run.cancel()
+                    elif (leader is not None and run.best_cost is not None and
+                          now - started >= self.grace * time_limit and
+                          run.best_cost > leader * (1 + self.margin) and run.cancelled_at is None):
+                        logger.info(f"{candidates[index].get_name()} отменён: {run.best_cost} против {leader}")
+                        run.cancel()
+                    if run.cancelled_at is not None and time.monotonic() - run.cancelled_at > CANCEL_TIMEOUT:
+                        # Участник не ответил на отмену – останавливаем процесс; его канал даст EOF
+                        run.process.terminate()
+        finally:
+            for run in running.values():
+                run.process.terminate()
+                run.process.join(CANCEL_TIMEOUT)
+                run.connection.close()
+
+        if not results:
+            return []
+        winner = min(results, key=lambda index: results[index][0])
+        cost, positions, variant_text = results[winner]
+        logger.info(f"Победитель: {candidates[winner].get_name()} (длина связей {cost})")
+        new_nodes = {number: Node(number, position) for number, position in positions.items()}
+        new_schema = SchemaData(new_nodes, schema_data.adjacency_matrix, schema_data.cols, schema_data.rows)
+        return [(new_schema, variant_text)]
@@ -1,21 +1,196 @@
+import logging
+import multiprocessing
 import random
-from typing import List, Tuple
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import List, Optional, Sequence, Tuple
 
 from autoplacement.AbstractAutoPlacement import AbstractAutoPlacement
+from autoplacement.budget import Budget
+from autoplacement.checkpoint import Checkpoint
+from autoplacement.constraints import PlacementConstraints, resolve_constraints
+from autoplacement.grid import GridGeometry, get_grid_geometry
+from autoplacement.shared import NetlistDescriptor, SharedNetlist, attach_worker, attached_netlist
+from autoplacement.utils import batch_total_weighted_length, get_weighted_edges
+from dialogs import get_dialogs
 from models import SchemaData, Node
 
+logger = logging.getLogger(__name__)
+
+# Сколько размещений генерируется и оценивается за один пакет в режиме нескольких запусков
+BATCH_SIZE = 256
+
+# Связи, элементы и ограничения рабочего процесса (см. _init_worker)
+_worker_context: Tuple[List[Tuple[int, int, int]], Sequence[int], Optional[PlacementConstraints]] = ([], (), None)
+
+
+def _score_batch(base_seed: int, start: int, count: int, width: int, keep: int,
+                 edges: Sequence[Tuple[int, int, int]], geometry: GridGeometry,
+                 elements: Sequence[int] = (),
+                 constraints: Optional[PlacementConstraints] = None) -> List[Tuple[int, int, array]]:
+    """
+    Генерирует размещения с номерами start..start+count-1 и возвращает keep лучших:
+    (стоимость, номер запуска, ячейки). Если заданы ограничения, размещения элементов
+    elements строятся с их учётом (PlacementConstraints.sample).
+    """
+    cells = range(geometry.cells)
+    population = array('i')
+    for k in range(start, start + count):
+        rng = random.Random(f"{base_seed}:{k}")
+        population.extend(constraints.sample(elements, rng) if constraints else rng.sample(cells, width))
+    scores = batch_total_weighted_length(population, width, edges, (), geometry)
+    best = [(score, start + offset, population[offset * width:(offset + 1) * width])
+            for offset, score in enumerate(scores)]
+    best.sort(key=lambda item: (item[0], item[1]))
+    return best[:keep]
+
+
+def _score_batch_worker(task: Tuple[int, int, int, int, int]) -> List[Tuple[int, int, array]]:
+    """
+    Пакет в рабочем процессе: сетка берётся из общей памяти, связи – из списка,
+    построенного при инициализации; в задаче передаются только
+    (зерно, первый запуск, число запусков, ширина, keep).
+    """
+    base_seed, start, count, width, keep = task
+    edges, elements, constraints = _worker_context
+    return _score_batch(base_seed, start, count, width, keep, edges, attached_netlist(),
+                        elements, constraints)
+
+
+def _init_worker(descriptor: NetlistDescriptor, elements: Sequence[int],
+                 constraints: Optional[PlacementConstraints]) -> None:
+    """
+    Инициализатор рабочего процесса: подключает общую память, один раз строит список
+    связей из неё и запоминает элементы и ограничения (передаются один раз, а не с каждым пакетом).
+    """
+    global _worker_context
+    attach_worker(descriptor)
+    _worker_context = (list(attached_netlist().edges()), elements, constraints)
+
 
 class RandomPlacement(AbstractAutoPlacement):
+    """
+    Случайное размещение.
+
+    При starts > 1 генерируется starts случайных размещений (каждое – со своим
+    воспроизводимым зерном), все они оцениваются пакетно (batch_total_weighted_length),
+    и возвращаются keep лучших вариантов. При workers > 1 пакеты оцениваются в пуле
+    процессов; схема публикуется в общей памяти один раз (SharedNetlist), результат
+    тот же, что и в одном процессе.
+
+    Ограничения размещения учитываются при генерации: закреплённые элементы стоят
+    в своих позициях, остальные – только в допустимых.
+    """
+
+    def __init__(self, starts: int = 1, keep: int = 1, seed: Optional[int] = None,
+                 workers: int = 1) -> None:
+        self.starts = starts
+        self.keep = keep
+        self.seed = seed
+        self.workers = workers
+
     def get_name(self) -> str:
+        if self.starts > 1:
+            return f"Случайное размещение (лучшее из {self.starts})"
         return "Случайное размещение"
 
-    def run(self, schema_data: SchemaData, tab_name: str) -> List[Tuple[SchemaData, str]]:
-        # назначаем случайные grid_position для каждого узла.
+    def run(self, schema_data: SchemaData, tab_name: str,
+            budget: Optional[Budget] = None,
+            checkpoint: Optional[Checkpoint] = None,
+            constraints: Optional[PlacementConstraints] = None) -> List[Tuple[SchemaData, str]]:
+        constraints = resolve_constraints(constraints, schema_data)
+        if constraints is None:
+            return []
+        if constraints.is_empty():
+            constraints = None
+        try:
+            if self.starts > 1:
+                return self._run_multistart(schema_data, tab_name, budget, constraints)
+            # назначаем случайные grid_position для каждого узла.
+            if constraints is not None:
+                elements = list(schema_data.nodes)
+                positions = [cell + 1 for cell in constraints.sample(elements, random.Random())]
+            else:
+                total = len(schema_data.nodes)
+                positions = list(range(1, total + 1))
+                random.shuffle(positions)
+        except ValueError as e:
+            # Не удалось выбрать допустимые позиции (в том числе в рабочем процессе пакетов)
+            get_dialogs().show_warning("Ошибка", f"Не удалось построить размещение: {e}")
+            return []
         new_nodes = {}
-        total = len(schema_data.nodes)
-        positions = list(range(1, total + 1))
-        random.shuffle(positions)
         for node, pos in zip(schema_data.nodes.values(), positions):
             new_nodes[node.element_number] = Node(node.element_number, pos)
         new_schema = SchemaData(new_nodes, schema_data.adjacency_matrix, schema_data.cols, schema_data.rows)
-        return [(new_schema, f"{tab_name} случ. размещ.")]
\ No newline at end of file
+        return [(new_schema, f"{tab_name} случ. размещ.")]
+
+    def _run_multistart(self, schema_data: SchemaData, tab_name: str, budget: Optional[Budget],
+                        constraints: Optional[PlacementConstraints]) -> List[Tuple[SchemaData, str]]:
+        """
+        Генерирует размещения пакетами по BATCH_SIZE (массив особи x элементы)
+        и оценивает каждый пакет за один проход по рёбрам.
+        Размещение номер k строится генератором с зерном "seed:k", поэтому его можно повторить.
+        """
+        cols, rows = schema_data.cols, schema_data.rows
+        geometry = get_grid_geometry(rows, cols)
+        elements = sorted(schema_data.nodes)
+        width = len(elements)
+        if width > geometry.cells:
+            get_dialogs().show_warning("Ошибка", "Число элементов превышает число позиций сетки.")
+            return []
+        if width == 0:
+            return []
+        budget = Budget.resolve(budget, self.starts)
+        base_seed = self.seed if self.seed is not None else random.SystemRandom().getrandbits(32)
+        logger.info(f"Случайное размещение: базовое зерно {base_seed}")
+
+        gene_of = {element: gene for gene, element in enumerate(elements)}
+        edges = [(gene_of[i], gene_of[j], weight) for i, j, weight in get_weighted_edges(schema_data)
+                 if i in gene_of and j in gene_of]
+
+        # Лучшие keep размещений: (стоимость, номер запуска, ячейки)
+        best: List[Tuple[int, int, array]] = []
+
+        def accept(batch: List[Tuple[int, int, array]]) -> None:
+            best.extend(batch)
+            best.sort(key=lambda item: (item[0], item[1]))
+            del best[self.keep:]
+            budget.report(best[0][0])
+
+        start = 0
+        workers = min(self.workers, -(-self.starts // BATCH_SIZE))
+        if workers <= 1:
+            while start < self.starts and not budget.expired():
+                count = min(BATCH_SIZE, self.starts - start)
+                accept(_score_batch(base_seed, start, count, width, self.keep, edges, geometry,
+                                    elements, constraints))
+                budget.tick(count)
+                start += count
+        else:
+            with SharedNetlist.publish(edges, width, geometry) as netlist, \
+                    ProcessPoolExecutor(max_workers=workers,
+                                        mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=_init_worker,
+                                        initargs=(netlist.descriptor, elements, constraints)) as executor:
+                futures = set()
+                while True:
+                    # В очереди держим по два пакета на процесс; запуск считается итерацией при отправке
+                    while start < self.starts and len(futures) < 2 * workers and not budget.expired():
+                        count = min(BATCH_SIZE, self.starts - start)
+                        futures.add(executor.submit(_score_batch_worker,
+                                                    (base_seed, start, count, width, self.keep)))
+                        budget.tick(count)
+                        start += count
+                    if not futures:
+                        break
+                    done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        accept(future.result())
+
+        results: List[Tuple[SchemaData, str]] = []
+        for score, k, individual in best:
+            new_nodes = {element: Node(element, cell + 1) for element, cell in zip(elements, individual)}
+            new_schema = SchemaData(new_nodes, schema_data.adjacency_matrix, cols, rows)
+            logger.info(f"Запуск {k} (зерно {base_seed}:{k}): длина связей {score}")
+            results.append((new_schema, f"{tab_name} случ. размещ. {len(results) + 1}"))
+        return results
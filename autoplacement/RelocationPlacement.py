@@ -0,0 +1,95 @@
+import logging
+from typing import List, Optional, Tuple
+
+from autoplacement.AbstractAutoPlacement import AbstractAutoPlacement
+from autoplacement.budget import Budget
+from autoplacement.checkpoint import Checkpoint, placement_fingerprint
+from autoplacement.constraints import PlacementConstraints, resolve_constraints
+from autoplacement.localsearch import PlacementState, RelocationSearch, schema_from_state, state_from_schema
+from dialogs import get_dialogs
+from models import SchemaData
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+if not logger.handlers:
+    ch = logging.StreamHandler()
+    ch.setLevel(logging.INFO)
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    ch.setFormatter(formatter)
+    logger.addHandler(ch)
+
+
+class RelocationPlacement(AbstractAutoPlacement):
+    """
+    Улучшение существующего размещения локальным поиском (RelocationSearch):
+    перемещения элементов в свободные ячейки, обмены и цепочки вытеснения
+    (A занимает ячейку B, B уходит в свободную ячейку).
+
+    Начинает с текущего размещения схемы; элементы, нарушающие ограничения,
+    сначала переносятся в ближайшие допустимые ячейки. Итерацией бюджета считается один проход
+    по элементам (по умолчанию не более passes проходов). Если передана контрольная
+    точка, размещение периодически сохраняется после проходов.
+    """
+
+    def __init__(self, passes: int = 20, window: int = 2, chain_candidates: int = 3,
+                 chain_radius: int = 3) -> None:
+        self.passes = passes
+        self.search = RelocationSearch(window, chain_candidates, chain_radius)
+
+    def get_name(self) -> str:
+        return "Улучшение размещения (перемещения и цепочки вытеснения)"
+
+    def run(self, schema_data: SchemaData, tab_name: str,
+            budget: Optional[Budget] = None,
+            checkpoint: Optional[Checkpoint] = None,
+            constraints: Optional[PlacementConstraints] = None) -> List[Tuple[SchemaData, str]]:
+        constraints = resolve_constraints(constraints, schema_data)
+        if constraints is None:
+            return []
+        try:
+            state, elements = state_from_schema(schema_data, constraints)
+        except ValueError as e:
+            get_dialogs().show_warning("Ошибка", f"Текущее размещение недопустимо: {e}")
+            return []
+        budget = Budget.resolve(budget, self.passes)
+        # Сохранённые позиции применяются, только если точка сохранена для того же
+        # начального размещения и тех же ограничений, что и сейчас
+        start = placement_fingerprint(schema_data)
+        saved = checkpoint.load(schema_data) if checkpoint else None
+        if saved is not None:
+            if (saved.get("placement") == start and saved.get("constraints") == constraints.signature()
+                    and len(saved["positions"]) == len(state.positions)):
+                state.apply(list(enumerate(saved["positions"])))
+                budget.tick(saved["passes"])
+            else:
+                logger.warning("Контрольная точка сохранена для другого размещения и не используется.")
+
+        initial_cost = state.total_cost()
+        cost = initial_cost
+        budget.report(cost)
+        order = self.search.movable_order(state)
+        converged = False
+        while not budget.expired():
+            budget.tick()
+            delta = self.search.improve_pass(state, budget, order)
+            cost += delta
+            budget.report(cost)
+            if checkpoint and checkpoint.due():
+                self._save_checkpoint(checkpoint, schema_data, state, budget, start, constraints)
+            if delta == 0:
+                converged = True
+                break
+        if checkpoint:
+            # Прерванный по времени запуск (проход ещё улучшал размещение) сохраняет точку
+            if converged or budget.completed():
+                checkpoint.clear()
+            else:
+                self._save_checkpoint(checkpoint, schema_data, state, budget, start, constraints)
+        logger.info(f"Длина связей: {initial_cost} -> {cost}")
+        return [(schema_from_state(schema_data, state, elements), f"{tab_name} улучш. размещ.")]
+
+    @staticmethod
+    def _save_checkpoint(checkpoint: Checkpoint, schema_data: SchemaData, state: PlacementState,
+                         budget: Budget, start: str, constraints: PlacementConstraints) -> None:
+        checkpoint.save(schema_data, {"positions": list(state.positions), "passes": budget.iterations,
+                                      "placement": start, "constraints": constraints.signature()})
@@ -1,10 +1,12 @@
 import logging
-from tkinter import simpledialog, messagebox
-from typing import Tuple, List, Set, Optional
+from typing import Dict, Tuple, List, Set, Optional
 from autoplacement.AbstractAutoPlacement import AbstractAutoPlacement
-from autoplacement.utils import get_directive_nodes
-from models import SchemaData, Node
-import math
+from autoplacement.budget import Budget
+from autoplacement.checkpoint import Checkpoint
+from autoplacement.constraints import PlacementConstraints, resolve_constraints
+from autoplacement.grid import get_grid_geometry
+from dialogs import get_dialogs
+from models import SchemaData, Node, dense_row
 
 # Настройка логгера (при необходимости можно настроить формат, уровень и т.д.)
 logger = logging.getLogger(__name__)
@@ -21,36 +23,62 @@ if not logger.handlers:
 class SequentialConnectivityPlacement(AbstractAutoPlacement):
     """
     Последовательный алгоритм (3.3.*) с директивным вводом:
-      - Пользователь вводит директивные пары "элемент,позиция; ..." – эти узлы фиксируются.
+      - Пользователь вводит директивные пары "элемент,позиция; ..." – эти узлы фиксируются
+        (если ограничения размещения не переданы в run).
       - Узлы с grid_position == 0 (не директивные) размещаются последовательно,
         выбирая сначала модуль с максимальной оценкой J, затем позицию с минимальным F.
+      - Кандидаты – свободные позиции, соседние с занятыми (множество Rk поддерживается
+        по мере размещения); запрещённые позиции и позиции вне области элемента
+        отбрасываются, как и позиции области, в которой иначе не хватит места для её
+        элементов. Если подходящих соседних позиций нет (например, закреплённых
+        элементов нет), рассматриваются все допустимые свободные позиции.
       - На вход алгоритму передается имя вкладки, для которой он запускается.
     """
 
     def get_name(self) -> str:
         return "Послед. алгоритм размещения по связности"
 
-    def run(self, schema_data: SchemaData, tab_name: str) -> List[Tuple[SchemaData, str]]:
+    def run(self, schema_data: SchemaData, tab_name: str,
+            budget: Optional[Budget] = None,
+            checkpoint: Optional[Checkpoint] = None,
+            constraints: Optional[PlacementConstraints] = None) -> List[Tuple[SchemaData, str]]:
         cols, rows = schema_data.cols, schema_data.rows
-        # Получаем директивно размещённые узлы; max_id = cols*rows
-        placed_nodes = get_directive_nodes(cols * rows)
-        if placed_nodes is None:
+        # Закреплённые узлы – из ограничений или директив, введённых пользователем
+        constraints = resolve_constraints(constraints, schema_data, ask=True)
+        if constraints is None:
             return []
+        placed_nodes = [Node(element, cell + 1) for element, cell in constraints.fixed_cells.items()]
 
         # Создаем матрицу позиций (индексы с 0) для отслеживания размещения
         position_matrix: List[List[Optional[int]]] = [[None] * cols for _ in range(rows)]
         placed_nums: Set[int] = set()
         unplaced_nums: Set[int] = set()
+        neighbors: Set[int] = set()
         for node in placed_nodes:
             row, column = self._pos_to_rc(node.grid_position, rows, cols)
             position_matrix[row][column] = node.element_number
             placed_nums.add(node.element_number)
+        for node in placed_nodes:
+            self._add_neighbors_positions(node.grid_position, position_matrix, constraints, neighbors)
 
         # Все узлы, которых нет в placed_nums, считаем неразмещёнными
         for node in schema_data.nodes.values():
             if node.element_number not in placed_nums:
                 unplaced_nums.add(node.element_number)
 
+        # Области: [маска, элементы, запас свободных ячеек сверх неразмещённых элементов]
+        groups: Dict[int, list] = {}
+        for element, mask in constraints.allowed.items():
+            group = groups.setdefault(id(mask), [mask, set(), len(mask)])
+            group[1].add(element)
+            group[2] -= 1
+        regions = list(groups.values())
+
+        def admissible(element: int, cell: int) -> bool:
+            # Чужой элемент может занять ячейку области, только пока у неё есть запас
+            return constraints.allows(element, cell) and all(
+                slack > 0 for mask, members, slack in regions if cell in mask and element not in members)
+
         # Последовательный алгоритм размещения для неразмещённых узлов
         while unplaced_nums:
             # Выбираем элемент с максимальным значением J (формула 3.3.1)
@@ -66,13 +94,20 @@ class SequentialConnectivityPlacement(AbstractAutoPlacement):
                     max_j = cur_j
             logger.info(f"Выбран элемент с max J: {selected_elem} (J = {max_j})")
 
-            # Находим свободные соседние позиции (Rk)
-            neighbors = self._find_neighbors_positions(placed_nodes, position_matrix, rows, cols)
-            logger.info(f"Свободные соседние позиции: {neighbors}")
+            # Свободные соседние позиции (Rk), допустимые для выбранного элемента
+            candidates = [pos for pos in neighbors if admissible(selected_elem, pos - 1)]
+            if not candidates:
+                candidates = [cell + 1 for cell in range(rows * cols)
+                              if position_matrix[cell // cols][cell % cols] is None
+                              and admissible(selected_elem, cell)]
+            if not candidates:
+                get_dialogs().show_warning("Ошибка", f"Для элемента {selected_elem} не осталось допустимых позиций.")
+                return []
+            logger.info(f"Допустимые свободные позиции: {candidates}")
 
             best_pos: Optional[int] = None
             min_f: Optional[float] = None
-            for pos_candidate in sorted(neighbors):
+            for pos_candidate in sorted(candidates):
                 cur_f = self._compute_F(
                     pos_candidate, selected_elem, placed_nodes,
                     schema_data.adjacency_matrix, rows, cols
@@ -88,6 +123,11 @@ class SequentialConnectivityPlacement(AbstractAutoPlacement):
             unplaced_nums.remove(selected_elem)
             row, col = self._pos_to_rc(best_pos, rows, cols)
             position_matrix[row][col] = selected_elem
+            neighbors.discard(best_pos)
+            for group in regions:
+                if best_pos - 1 in group[0] and selected_elem not in group[1]:
+                    group[2] -= 1
+            self._add_neighbors_positions(best_pos, position_matrix, constraints, neighbors)
             logger.info("=" * 10)
 
         logger.info("Итоговая матрица позиций:")
@@ -109,8 +149,9 @@ class SequentialConnectivityPlacement(AbstractAutoPlacement):
         Вычисляет оценку J для элемента (формула 3.3.1):
             J = sum_{j in placed_nums} c(i,j) - sum_{j in unplaced_nums} c(i,j)
         """
-        return (sum(adjacency_matrix[element_number - 1][p - 1] for p in placed_nums) -
-                sum(adjacency_matrix[element_number - 1][u - 1] for u in unplaced_nums))
+        row = dense_row(adjacency_matrix, element_number - 1)
+        return (sum(row[p - 1] for p in placed_nums) -
+                sum(row[u - 1] for u in unplaced_nums))
 
     def _compute_F(self, pos: int, elem_num: int, placed_nodes: List[Node],
                    adjacency_matrix: List[List[int]], rows: int, cols: int) -> float:
@@ -119,43 +160,33 @@ class SequentialConnectivityPlacement(AbstractAutoPlacement):
             F = sum_{j in placed_nodes} c(i,j) * dist(pos, pos_j)
         где dist – манхэттенское расстояние между позициями.
         """
+        geometry = get_grid_geometry(rows, cols)
+        row = dense_row(adjacency_matrix, elem_num - 1)
+        cell = pos - 1
         cost = 0
         for node in placed_nodes:
-            d = self._dist_positions(node.grid_position, pos, rows, cols)
-            cost += adjacency_matrix[elem_num - 1][node.element_number - 1] * d
+            cost += row[node.element_number - 1] * geometry.dist(node.grid_position - 1, cell)
         return cost
 
-    def _find_neighbors_positions(self, placed_nodes: List[Node],
-                                  position_matrix: List[List[Optional[int]]],
-                                  rows: int, cols: int) -> Set[int]:
+    def _add_neighbors_positions(self, pos: int, position_matrix: List[List[Optional[int]]],
+                                 constraints: PlacementConstraints, neighbors: Set[int]) -> None:
         """
-        Находит свободные позиции (Rk), соседние с занятыми.
+        Добавляет в neighbors (Rk) свободные незапрещённые позиции, соседние с занятой позицией pos.
         Соседняя позиция определяется как позиция, расстояние по манхэттену до занятой равно 1.
         """
-        neighbors = set()
-        for node in placed_nodes:
-            r, c = self._pos_to_rc(node.grid_position, rows, cols)
-            for dr, dc in ((0, 1), (1, 0), (-1, 0), (0, -1)):
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < rows and 0 <= nc < cols:
-                    if position_matrix[nr][nc] is None:
-                        neighbors.add(self._rc_to_pos(nr, nc, cols))
-        return neighbors
-
-    def _dist_positions(self, pA: int, pB: int, rows: int, cols: int) -> int:
-        """
-        Вычисляет манхэттенское расстояние между позициями pA и pB.
-        """
-        rA, cA = self._pos_to_rc(pA, rows, cols)
-        rB, cB = self._pos_to_rc(pB, rows, cols)
-        return abs(rA - rB) + abs(cA - cB)
+        rows, cols = len(position_matrix), len(position_matrix[0])
+        r, c = self._pos_to_rc(pos, rows, cols)
+        for dr, dc in ((0, 1), (1, 0), (-1, 0), (0, -1)):
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols:
+                if position_matrix[nr][nc] is None and nr * cols + nc not in constraints.blocked:
+                    neighbors.add(self._rc_to_pos(nr, nc, cols))
 
     def _pos_to_rc(self, pos: int, rows: int, cols: int) -> Tuple[int, int]:
         """
         Преобразует позицию (от 1 до rows*cols) в (row, col) с 0-индексацией.
         """
-        p = pos - 1
-        return (p // cols, p % cols)
+        return get_grid_geometry(rows, cols).pos_to_rc(pos)
 
     def _rc_to_pos(self, row: int, col: int, cols: int) -> int:
         """
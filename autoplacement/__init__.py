@@ -1,11 +1,28 @@
-# Список доступных алгоритмов авторазмещения
+# Список доступных алгоритмов авторазмещения.
+# Модули алгоритмов импортируются только при первом запуске (см. LazyAutoPlacement).
 from typing import List
 
 from autoplacement.AbstractAutoPlacement import AbstractAutoPlacement
-from autoplacement.RandomPlacement import RandomPlacement
-from autoplacement.SequentialConnectivityPlacement import SequentialConnectivityPlacement
+from autoplacement.registry import LazyAutoPlacement, discover_plugins
 
 AUTO_PLACEMENT_ALGORITHMS: List[AbstractAutoPlacement] = [
-    RandomPlacement(),
-    SequentialConnectivityPlacement()
-]
\ No newline at end of file
+    LazyAutoPlacement("Случайное размещение",
+                      "autoplacement.RandomPlacement:RandomPlacement"),
+    LazyAutoPlacement("Случайное размещение (лучшее из 256)",
+                      "autoplacement.RandomPlacement:RandomPlacement", starts=256, keep=3),
+    LazyAutoPlacement("Послед. алгоритм размещения по связности",
+                      "autoplacement.SequentialConnectivityPlacement:SequentialConnectivityPlacement"),
+    LazyAutoPlacement("Точное размещение (метод ветвей и границ)",
+                      "autoplacement.BranchAndBoundPlacement:BranchAndBoundPlacement"),
+    LazyAutoPlacement("Генетический алгоритм размещения",
+                      "autoplacement.GeneticPlacement:GeneticPlacement"),
+    LazyAutoPlacement("Многоуровневое размещение (Генетический алгоритм размещения)",
+                      "autoplacement.MultilevelPlacement:MultilevelPlacement",
+                      LazyAutoPlacement("Генетический алгоритм размещения",
+                                        "autoplacement.GeneticPlacement:GeneticPlacement",
+                                        variants=1, use_directives=False)),
+    LazyAutoPlacement("Улучшение размещения (перемещения и цепочки вытеснения)",
+                      "autoplacement.RelocationPlacement:RelocationPlacement"),
+    LazyAutoPlacement("Лучший из алгоритмов (состязание)",
+                      "autoplacement.PortfolioPlacement:PortfolioPlacement"),
+] + discover_plugins()
@@ -0,0 +1,86 @@
+import copy
+import time
+from typing import List, Optional, Tuple
+
+
+class Budget:
+    """
+    Budget ограничивает работу алгоритма авторазмещения по времени и/или числу итераций.
+
+    Итерационные алгоритмы проверяют expired() и по исчерпании бюджета возвращают
+    лучшее найденное к этому моменту размещение. Улучшения стоимости отмечаются через
+    report(), из них складывается трасса «время – стоимость».
+
+    Attributes:
+        time_limit (Optional[float]): Ограничение по времени в секундах (None – без ограничения).
+        max_iterations (Optional[int]): Ограничение по числу итераций (None – без ограничения).
+        iterations (int): Число выполненных итераций.
+        trace (List[Tuple[float, float]]): Пары (секунды от начала, лучшая стоимость).
+    """
+
+    def __init__(self, time_limit: Optional[float] = None,
+                 max_iterations: Optional[int] = None) -> None:
+        self.time_limit = time_limit
+        self.max_iterations = max_iterations
+        self.iterations = 0
+        self.trace: List[Tuple[float, float]] = []
+        self.started_at = time.monotonic()
+
+    @staticmethod
+    def resolve(budget: Optional["Budget"], default_iterations: int) -> "Budget":
+        """
+        Возвращает бюджет для итерационного алгоритма: если бюджет не задан или
+        в нём нет ни одного ограничения, используется default_iterations итераций.
+        Переданный бюджет не меняется: ограничение получает его копия с общей трассой,
+        поэтому следующие алгоритмы (этапы), получившие тот же бюджет, берут свои значения по умолчанию.
+        """
+        if budget is None:
+            return Budget(max_iterations=default_iterations)
+        if budget.time_limit is None and budget.max_iterations is None:
+            budget = copy.copy(budget)
+            budget.max_iterations = default_iterations
+        return budget
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def remaining(self) -> Optional[float]:
+        """
+        Оставшееся время в секундах (None, если ограничения по времени нет).
+        """
+        if self.time_limit is None:
+            return None
+        return max(0.0, self.time_limit - self.elapsed())
+
+    def deadline(self) -> Optional[float]:
+        """
+        Момент окончания бюджета по часам time.time() (для передачи в другие процессы).
+        """
+        remaining = self.remaining()
+        return None if remaining is None else time.time() + remaining
+
+    def tick(self, count: int = 1) -> None:
+        self.iterations += count
+
+    def expired(self) -> bool:
+        if self.max_iterations is not None and self.iterations >= self.max_iterations:
+            return True
+        return self.time_limit is not None and self.elapsed() >= self.time_limit
+
+    def completed(self) -> bool:
+        """
+        Исчерпано ли ограничение по числу итераций, т. е. алгоритм выполнил всю работу,
+        а не прерван по времени (тогда его контрольную точку нужно сохранить, а не удалять).
+        """
+        return self.max_iterations is not None and self.iterations >= self.max_iterations
+
+    def report(self, cost: float) -> None:
+        """
+        Отмечает стоимость текущего лучшего решения (в трассу попадают только улучшения).
+        """
+        if not self.trace or cost < self.trace[-1][1]:
+            self.trace.append((self.elapsed(), cost))
+
+    @property
+    def best_cost(self) -> Optional[float]:
+        return self.trace[-1][1] if self.trace else None
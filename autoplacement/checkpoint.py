@@ -0,0 +1,109 @@
+import hashlib
+import logging
+import os
+import pickle
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+from autoplacement.utils import get_weighted_edges
+from models import SchemaData
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+
+def schema_fingerprint(schema_data: SchemaData) -> str:
+    """
+    Отпечаток схемы (сетка, номера элементов, рёбра) – контрольная точка
+    подходит только для той же схемы, на которой была сохранена.
+    """
+    digest = hashlib.sha1()
+    digest.update(f"{schema_data.cols}x{schema_data.rows};".encode())
+    digest.update(",".join(map(str, sorted(schema_data.nodes))).encode())
+    for i, j, weight in get_weighted_edges(schema_data):
+        digest.update(f";{i},{j},{weight}".encode())
+    return digest.hexdigest()
+
+
+def placement_fingerprint(schema_data: SchemaData) -> str:
+    """
+    Отпечаток текущего размещения (позиции всех элементов) – для алгоритмов, которые
+    улучшают существующее размещение: их контрольная точка годится только для той же
+    начальной расстановки.
+    """
+    digest = hashlib.sha1()
+    for element in sorted(schema_data.nodes):
+        digest.update(f"{element}:{schema_data.nodes[element].grid_position};".encode())
+    return digest.hexdigest()
+
+
+class Checkpoint:
+    """
+    Checkpoint – файл контрольной точки итерационного алгоритма размещения.
+
+    Алгоритм периодически (не чаще, чем раз в interval секунд) сохраняет своё состояние
+    (текущее и лучшее размещение, состояние генератора случайных чисел, счётчики итераций).
+    Следующий запуск на той же схеме продолжает работу с сохранённого состояния.
+    После нормального завершения алгоритм удаляет файл.
+
+    Attributes:
+        path (str): Путь к файлу контрольной точки.
+        interval (float): Минимальный интервал между сохранениями, с.
+    """
+
+    def __init__(self, path: str, interval: float = 60.0) -> None:
+        self.path = path
+        self.interval = interval
+        self._last_save = time.monotonic()
+
+    @staticmethod
+    def for_schema(schema_filename: str, algorithm_name: str, interval: float = 60.0) -> "Checkpoint":
+        """
+        Контрольная точка рядом с файлом схемы: "<схема>.<хеш названия алгоритма>.ckpt".
+        """
+        tag = hashlib.sha1(algorithm_name.encode()).hexdigest()[:8]
+        return Checkpoint(f"{schema_filename}.{tag}.ckpt", interval)
+
+    def due(self) -> bool:
+        return time.monotonic() - self._last_save >= self.interval
+
+    def save(self, schema_data: SchemaData, state: Dict[str, Any]) -> None:
+        """
+        Сохраняет состояние атомарно (через временный файл), сжатым pickle.
+        """
+        payload = {
+            "version": CHECKPOINT_VERSION,
+            "fingerprint": schema_fingerprint(schema_data),
+            "state": state,
+        }
+        data = zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, self.path)
+        self._last_save = time.monotonic()
+
+    def load(self, schema_data: SchemaData) -> Optional[Dict[str, Any]]:
+        """
+        Загружает сохранённое состояние, если файл есть и относится к этой же схеме.
+        """
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                payload = pickle.loads(zlib.decompress(f.read()))
+        except Exception as e:
+            logger.warning(f"Не удалось прочитать контрольную точку {self.path}: {e}")
+            return None
+        if payload.get("version") != CHECKPOINT_VERSION or \
+                payload.get("fingerprint") != schema_fingerprint(schema_data):
+            logger.warning(f"Контрольная точка {self.path} относится к другой схеме и не используется.")
+            return None
+        logger.info(f"Продолжение с контрольной точки {self.path}")
+        return payload["state"]
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,438 @@
+import json
+import random
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from dialogs import get_dialogs
+from models import SchemaData
+
+# Сколько ошибок ограничений показывать в сообщении (остальные только подсчитываются)
+MAX_REPORTED_ERRORS = 10
+# Сколько раз пробовать случайную ячейку области, прежде чем перебрать область целиком
+SAMPLE_ATTEMPTS = 16
+
+
+class CellMask:
+    """
+    Множество ячеек сетки в виде битовой маски: ячейке cell соответствует разряд cell & 7
+    байта cell >> 3. Проверка принадлежности (cell in mask) выполняется за O(1),
+    объединение, пересечение и разность – над всей маской сразу.
+
+    Attributes:
+        cells (int): Число ячеек сетки.
+        bits (bytearray): Биты маски.
+    """
+
+    __slots__ = ("cells", "bits")
+
+    def __init__(self, cells: int, members: Iterable[int] = ()) -> None:
+        self.cells = cells
+        self.bits = bytearray((cells + 7) >> 3)
+        for cell in members:
+            self.add(cell)
+
+    @classmethod
+    def _from_int(cls, cells: int, value: int) -> "CellMask":
+        mask = cls(cells)
+        mask.bits[:] = value.to_bytes(len(mask.bits), "little")
+        return mask
+
+    def _as_int(self) -> int:
+        return int.from_bytes(self.bits, "little")
+
+    def add(self, cell: int) -> None:
+        self.bits[cell >> 3] |= 1 << (cell & 7)
+
+    def __contains__(self, cell: int) -> bool:
+        return bool(self.bits[cell >> 3] >> (cell & 7) & 1)
+
+    def __iter__(self) -> Iterator[int]:
+        for index, byte in enumerate(self.bits):
+            while byte:
+                low = byte & -byte
+                yield (index << 3) + low.bit_length() - 1
+                byte ^= low
+
+    def __len__(self) -> int:
+        return self._as_int().bit_count()
+
+    def __or__(self, other: "CellMask") -> "CellMask":
+        return CellMask._from_int(self.cells, self._as_int() | other._as_int())
+
+    def __and__(self, other: "CellMask") -> "CellMask":
+        return CellMask._from_int(self.cells, self._as_int() & other._as_int())
+
+    def __sub__(self, other: "CellMask") -> "CellMask":
+        return CellMask._from_int(self.cells, self._as_int() & ~other._as_int())
+
+    def copy(self) -> "CellMask":
+        mask = CellMask(self.cells)
+        mask.bits[:] = self.bits
+        return mask
+
+
+class Region:
+    """
+    Область размещения: элементы elements можно ставить только в позиции positions
+    и/или в прямоугольник rect = (строка1, колонка1, строка2, колонка2).
+    Позиции, строки и колонки нумеруются с 1, границы прямоугольника включаются.
+    """
+
+    def __init__(self, elements: Iterable[int], positions: Iterable[int] = (),
+                 rect: Optional[Sequence[int]] = None) -> None:
+        self.elements = list(elements)
+        self.positions = list(positions)
+        self.rect = tuple(rect) if rect is not None else None
+
+    def cells(self, rows: int, cols: int) -> List[int]:
+        """
+        Ячейки области (с 0); ValueError, если область выходит за сетку.
+        """
+        cells = rows * cols
+        result: List[int] = []
+        for position in self.positions:
+            if not 1 <= position <= cells:
+                raise ValueError(f"позиция области {position} вне диапазона (1..{cells})")
+            result.append(position - 1)
+        if self.rect is not None:
+            if len(self.rect) != 4:
+                raise ValueError("прямоугольник области задаётся четырьмя числами")
+            r1, c1, r2, c2 = self.rect
+            if not (1 <= r1 <= r2 <= rows and 1 <= c1 <= c2 <= cols):
+                raise ValueError(f"прямоугольник области {list(self.rect)} вне сетки {rows}x{cols}")
+            for r in range(r1 - 1, r2):
+                result.extend(range(r * cols + c1 - 1, r * cols + c2))
+        return result
+
+    def key(self) -> Tuple:
+        return tuple(sorted(self.elements)), tuple(sorted(self.positions)), self.rect
+
+
+class PlacementConstraints:
+    """
+    PlacementConstraints – ограничения размещения, общие для всех алгоритмов:
+      - fixed: закреплённые (директивно размещённые) элементы: элемент -> позиция;
+      - forbidden: позиции, которые нельзя занимать;
+      - regions: области (Region) – элементы области ставятся только в её позиции.
+    Позиции нумеруются с 1, как Node.grid_position.
+
+    Ограничения загружаются целиком (load – из файла JSON, parse_directives – из строки
+    директив) и один раз проверяются по схеме (validate). После проверки доступны
+    предвычисленные маски (ячейки с 0), и допустимость ячейки для элемента
+    (allows) проверяется за O(1).
+
+    Attributes:
+        fixed_cells (Dict[int, int]): Ячейка каждого закреплённого элемента.
+        forbidden_cells (List[int]): Запрещённые ячейки по возрастанию.
+        blocked (CellMask): Ячейки, недоступные незакреплённым элементам (запрещённые и закреплённые).
+        allowed (Dict[int, CellMask]): Допустимые ячейки незакреплённых элементов, у которых
+            есть область (без blocked); элементы с одной областью делят одну маску.
+    """
+
+    def __init__(self, fixed: Optional[Dict[int, int]] = None, forbidden: Iterable[int] = (),
+                 regions: Iterable[Region] = ()) -> None:
+        self.fixed: Dict[int, int] = dict(fixed or {})
+        self.forbidden: List[int] = list(forbidden)
+        self.regions: List[Region] = list(regions)
+        self.cells = 0
+        self.fixed_cells: Dict[int, int] = {}
+        self.forbidden_cells: List[int] = []
+        self.blocked = CellMask(0)
+        self.allowed: Dict[int, CellMask] = {}
+        # Ячейки маски allowed каждого элемента списком (для случайного выбора)
+        self._cells_of: Dict[int, List[int]] = {}
+
+    def is_empty(self) -> bool:
+        return not (self.fixed or self.forbidden or self.regions)
+
+    def signature(self) -> Tuple:
+        """
+        Неизменяемое описание ограничений (например, для сравнения с контрольной точкой).
+        """
+        return (tuple(sorted(self.fixed.items())), tuple(sorted(set(self.forbidden))),
+                tuple(region.key() for region in self.regions))
+
+    @staticmethod
+    def load(filename: str) -> "PlacementConstraints":
+        """
+        Загружает ограничения из файла JSON вида
+            {"fixed": {"1": 5, "3": 7}, "forbidden": [10, 11],
+             "regions": [{"elements": [2, 4], "positions": [1, 2, 3]},
+                         {"elements": [6], "rect": [1, 1, 2, 3]}]}
+        Все разделы необязательны. ValueError, если формат файла неверен.
+        """
+        with open(filename, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        try:
+            fixed = {int(element): int(position) for element, position in data.get("fixed", {}).items()}
+            forbidden = [int(position) for position in data.get("forbidden", [])]
+            regions = [Region([int(element) for element in region["elements"]],
+                              [int(position) for position in region.get("positions", [])],
+                              region.get("rect"))
+                       for region in data.get("regions", [])]
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"неверный формат файла ограничений: {e}") from None
+        return PlacementConstraints(fixed, forbidden, regions)
+
+    @staticmethod
+    def parse_directives(text: str) -> "PlacementConstraints":
+        """
+        Разбирает строку директив "элемент,позиция; элемент,позиция; ...".
+        Пустая строка – ограничений нет. ValueError, если формат неверен.
+        """
+        fixed: Dict[int, int] = {}
+        for segment in text.split(";"):
+            if not segment.strip():
+                continue
+            parts = [part.strip() for part in segment.split(",")]
+            if len(parts) != 2:
+                raise ValueError(f"ожидалась пара 'элемент,позиция': {segment.strip()}")
+            try:
+                element, position = int(parts[0]), int(parts[1])
+            except ValueError:
+                raise ValueError(f"неверное число в паре: {segment.strip()}") from None
+            if element in fixed:
+                raise ValueError(f"элемент {element} указан несколько раз")
+            fixed[element] = position
+        return PlacementConstraints(fixed)
+
+    def validate(self, schema_data: SchemaData) -> None:
+        """
+        Проверяет ограничения по схеме и строит маски для её сетки.
+
+        Проверяется, что элементы есть в схеме, позиции лежат в сетке, закреплённые
+        элементы не делят позицию, не стоят в запрещённой позиции и вне своей области,
+        а все элементы (и элементы каждой области) помещаются в доступные им ячейки.
+        Все найденные ошибки сообщаются одним ValueError.
+        """
+        rows, cols = schema_data.rows, schema_data.cols
+        cells = rows * cols
+        nodes = schema_data.nodes
+        errors: List[str] = []
+
+        forbidden = CellMask(cells)
+        for position in self.forbidden:
+            if not 1 <= position <= cells:
+                errors.append(f"Запрещённая позиция {position} вне диапазона (1..{cells}).")
+            else:
+                forbidden.add(position - 1)
+
+        fixed_cells: Dict[int, int] = {}
+        owner: Dict[int, int] = {}
+        for element, position in self.fixed.items():
+            if element not in nodes:
+                errors.append(f"Элемента {element} нет в схеме.")
+            elif not 1 <= position <= cells:
+                errors.append(f"Позиция {position} элемента {element} вне диапазона (1..{cells}).")
+            elif position - 1 in owner:
+                errors.append(f"Позиция {position} назначена элементам {owner[position - 1]} и {element}.")
+            elif position - 1 in forbidden:
+                errors.append(f"Позиция {position} элемента {element} запрещена.")
+            else:
+                owner[position - 1] = element
+                fixed_cells[element] = position - 1
+        blocked = forbidden | CellMask(cells, fixed_cells.values())
+
+        # Маска области строится один раз; элемент из нескольких областей получает их пересечение
+        allowed: Dict[int, CellMask] = {}
+        for region in self.regions:
+            try:
+                mask = CellMask(cells, region.cells(rows, cols))
+            except ValueError as e:
+                errors.append(f"Область элементов {region.elements}: {e}.")
+                continue
+            for element in region.elements:
+                if element not in nodes:
+                    errors.append(f"Элемента {element} области нет в схеме.")
+                elif element in fixed_cells:
+                    if fixed_cells[element] not in mask:
+                        errors.append(f"Позиция {fixed_cells[element] + 1} элемента {element} вне его области.")
+                else:
+                    allowed[element] = allowed[element] & mask if element in allowed else mask
+        # Из каждой области исключаются недоступные ячейки; элементы одной области делят маску
+        groups: Dict[int, Tuple[CellMask, List[int]]] = {}
+        for element, mask in allowed.items():
+            groups.setdefault(id(mask), (mask, []))[1].append(element)
+        allowed = {}
+        cells_of: Dict[int, List[int]] = {}
+        for mask, group in groups.values():
+            mask = mask - blocked
+            region_cells = list(mask)
+            for element in group:
+                allowed[element] = mask
+                cells_of[element] = region_cells
+        # Области могут пересекаться: проверяем, что элементы областей можно расставить
+        # одновременно (паросочетание элементов с ячейками), а не каждую область отдельно
+        try:
+            _match_regions(sorted(allowed, key=lambda element: len(cells_of[element])),
+                           cells_of, blocked, random.Random(0))
+        except ValueError as e:
+            message = str(e)
+            errors.append(f"{message[:1].upper()}{message[1:]}.")
+        free = cells - len(blocked)
+        movable = len(nodes) - len(fixed_cells)
+        if movable > free:
+            errors.append(f"Незакреплённых элементов ({movable}) больше, чем свободных позиций ({free}).")
+
+        if errors:
+            hidden = len(errors) - MAX_REPORTED_ERRORS
+            message = "\n".join(errors[:MAX_REPORTED_ERRORS])
+            if hidden > 0:
+                message += f"\n... и ещё ошибок: {hidden}"
+            raise ValueError(message)
+        self.cells = cells
+        self.fixed_cells = fixed_cells
+        self.forbidden_cells = list(forbidden)
+        self.blocked = blocked
+        self.allowed = allowed
+        self._cells_of = cells_of
+
+    def allows(self, element: int, cell: int) -> bool:
+        """
+        Можно ли поставить элемент в ячейку (с 0); O(1).
+        """
+        fixed = self.fixed_cells.get(element)
+        if fixed is not None:
+            return cell == fixed
+        mask = self.allowed.get(element)
+        if mask is not None:
+            return cell in mask
+        return cell not in self.blocked
+
+    def sample(self, elements: Sequence[int], rng: random.Random) -> List[int]:
+        """
+        Случайное размещение элементов elements, удовлетворяющее ограничениям:
+        ячейка (с 0) для каждого элемента. Закреплённые элементы стоят в своих ячейках,
+        элементы с областями расставляются первыми (паросочетанием, см. _match_regions),
+        остальные – в случайные свободные ячейки. ValueError, если ячейки не нашлось.
+        """
+        restricted = [element for element in elements if element in self.allowed]
+        restricted.sort(key=lambda element: len(self._cells_of[element]))
+        placed = _match_regions(restricted, self._cells_of, self.blocked, rng)
+        used = self.blocked.copy()
+        for cell in placed.values():
+            used.add(cell)
+
+        others = [element for element in elements
+                  if element not in placed and element not in self.fixed_cells]
+        free = self.cells - len(used)
+        if len(others) > free:
+            raise ValueError("свободных позиций меньше, чем элементов")
+        if 2 * len(others) <= free:
+            # Свободных ячеек заметно больше, чем элементов: случайный выбор с отбрасыванием
+            for element in others:
+                cell = rng.randrange(self.cells)
+                while cell in used:
+                    cell = rng.randrange(self.cells)
+                used.add(cell)
+                placed[element] = cell
+        else:
+            cells = [cell for cell in range(self.cells) if cell not in used]
+            placed.update(zip(others, rng.sample(cells, len(others))))
+        return [self.fixed_cells[element] if element in self.fixed_cells else placed[element]
+                for element in elements]
+
+
+def _pick(candidates: List[int], used: CellMask, rng: random.Random) -> Optional[int]:
+    for _ in range(SAMPLE_ATTEMPTS):
+        cell = rng.choice(candidates)
+        if cell not in used:
+            return cell
+    free = [cell for cell in candidates if cell not in used]
+    return rng.choice(free) if free else None
+
+
+def _match_regions(elements: Sequence[int], cells_of: Dict[int, List[int]], blocked: CellMask,
+                   rng: random.Random) -> Dict[int, int]:
+    """
+    Расставляет элементы с областями по разным ячейкам своих областей: элемент -> ячейка.
+
+    Элемент получает случайную свободную ячейку своей области; если все они заняты,
+    ищется увеличивающий путь (поиск в ширину): соседи элемента по области
+    сдвигаются в другие свободные ячейки своих областей. Так размещение находится
+    всегда, когда оно существует, в том числе для пересекающихся областей.
+    ValueError, если его нет: тогда элементам, достижимым при поиске, доступно
+    меньше ячеек, чем их самих (условие Холла нарушено).
+    """
+    owner: Dict[int, int] = {}
+    placed: Dict[int, int] = {}
+    used = blocked.copy()
+    for element in elements:
+        cell = _pick(cells_of[element], used, rng)
+        if cell is None:
+            # Поиск увеличивающего пути: came_from[ячейка] – элемент, из которого она достигнута
+            came_from: Dict[int, int] = {}
+            queue = [element]
+            for current in queue:
+                for candidate in cells_of[current]:
+                    if candidate in came_from:
+                        continue
+                    came_from[candidate] = current
+                    if candidate not in owner:
+                        cell = candidate
+                        break
+                    queue.append(owner[candidate])
+                if cell is not None:
+                    break
+            if cell is None:
+                raise ValueError(f"элементам {sorted(queue)[:MAX_REPORTED_ERRORS]} доступно только "
+                                 f"{len(came_from)} позиций")
+            # Сдвиг вдоль пути: каждый элемент переходит в ячейку, через которую его достигли
+            free_cell = cell
+            while True:
+                current = came_from[cell]
+                previous = placed.get(current)
+                placed[current] = cell
+                owner[cell] = current
+                if current == element:
+                    break
+                cell = previous
+            cell = free_cell
+        else:
+            placed[element] = cell
+            owner[cell] = element
+        used.add(cell)
+    return placed
+
+
+def ask_directives(max_position: int) -> Optional[PlacementConstraints]:
+    """
+    Запрашивает у пользователя директивно размещённые элементы и их позиции.
+    Формат (одна строка): "элемент,позиция; элемент,позиция; ...", например "1,5; 3,7".
+    Пустой ввод – закреплённых элементов нет. Возвращает None, если пользователь
+    нажал «Отмена» или ввёл строку неверного формата (ошибка показывается в диалоге).
+    """
+    prompt = (
+        f"Введите пары 'элемент,позиция' через точку с запятой.\n"
+        f"Ограничение: позиция не больше {max_position}.\n"
+        f"Пример: 1,2; 3,7\n"
+        f"(Если оставить пустым, закреплённых элементов не будет.)"
+    )
+    user_input = get_dialogs().ask_string("Директивное размещение", prompt)
+    if user_input is None:
+        # Пользователь нажал «Отмена» или закрыл диалог
+        return None
+    try:
+        return PlacementConstraints.parse_directives(user_input)
+    except ValueError as e:
+        get_dialogs().show_error("Ошибка", f"Неверный формат директив: {e}.")
+        return None
+
+
+def resolve_constraints(constraints: Optional[PlacementConstraints], schema_data: SchemaData,
+                        ask: bool = False) -> Optional[PlacementConstraints]:
+    """
+    Ограничения для запуска алгоритма: переданные constraints, а если их нет –
+    директивы, введённые пользователем (при ask), или пустые ограничения.
+    Ограничения проверяются по схеме; при ошибке она показывается в диалоге
+    и, как и при отмене ввода, возвращается None.
+    """
+    if constraints is None:
+        constraints = ask_directives(schema_data.rows * schema_data.cols) if ask else PlacementConstraints()
+        if constraints is None:
+            return None
+    try:
+        constraints.validate(schema_data)
+    except ValueError as e:
+        get_dialogs().show_error("Ошибка", f"Ограничения размещения недопустимы:\n{e}")
+        return None
+    return constraints
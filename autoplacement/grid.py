@@ -0,0 +1,74 @@
+from array import array
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# Полная таблица расстояний строится только для небольших сеток:
+# для 1024 ячеек она занимает 1024 * 1024 * 4 байт = 4 МБ.
+DISTANCE_TABLE_LIMIT = 1024
+
+
+class GridGeometry:
+    """
+    GridGeometry хранит предвычисленную геометрию сетки rows x cols.
+
+    Ячейки нумеруются с 0 (cell = grid_position - 1), по строкам.
+
+    Attributes:
+        rows, cols (int): Размеры сетки.
+        cells (int): Количество ячеек.
+        row_of (array): Номер строки каждой ячейки.
+        col_of (array): Номер колонки каждой ячейки.
+        distances (Optional[array]): Развёрнутая таблица манхэттенских расстояний cells x cells
+            (только если cells <= DISTANCE_TABLE_LIMIT).
+    """
+
+    def __init__(self, rows: int, cols: int) -> None:
+        self.rows = rows
+        self.cols = cols
+        self.cells = rows * cols
+        self.row_of = array('i', (cell // cols for cell in range(self.cells)))
+        self.col_of = array('i', (cell % cols for cell in range(self.cells)))
+        self.distances: Optional[array] = None
+        if self.cells <= DISTANCE_TABLE_LIMIT:
+            self.distances = array('i')
+            for a in range(self.cells):
+                ra, ca = self.row_of[a], self.col_of[a]
+                self.distances.extend(abs(ra - rb) + abs(ca - cb)
+                                      for rb, cb in zip(self.row_of, self.col_of))
+
+    def dist(self, a: int, b: int) -> int:
+        """
+        Манхэттенское расстояние между ячейками a и b.
+        """
+        if self.distances is not None:
+            return self.distances[a * self.cells + b]
+        return abs(self.row_of[a] - self.row_of[b]) + abs(self.col_of[a] - self.col_of[b])
+
+    def distance_row(self, a: int) -> array:
+        """
+        Расстояния от ячейки a до всех ячеек сетки.
+        """
+        if self.distances is not None:
+            return self.distances[a * self.cells:(a + 1) * self.cells]
+        ra, ca = self.row_of[a], self.col_of[a]
+        return array('i', (abs(ra - rb) + abs(ca - cb) for rb, cb in zip(self.row_of, self.col_of)))
+
+    def pos_to_rc(self, pos: int) -> Tuple[int, int]:
+        """
+        Преобразует позицию (от 1 до rows*cols) в (row, col) с 0-индексацией.
+        """
+        return self.row_of[pos - 1], self.col_of[pos - 1]
+
+    def rc_to_pos(self, row: int, col: int) -> int:
+        """
+        Преобразует (row, col) (с 0-индексацией) в позицию (от 1 до rows*cols).
+        """
+        return row * self.cols + col + 1
+
+
+@lru_cache(maxsize=32)
+def get_grid_geometry(rows: int, cols: int) -> GridGeometry:
+    """
+    Возвращает общую для всего процесса геометрию сетки rows x cols (создаётся один раз).
+    """
+    return GridGeometry(rows, cols)
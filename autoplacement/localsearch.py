@@ -0,0 +1,464 @@
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from autoplacement.budget import Budget
+from autoplacement.constraints import CellMask, PlacementConstraints
+from autoplacement.grid import GridGeometry, get_grid_geometry
+from autoplacement.utils import get_weighted_edges
+from models import Node, SchemaData, iter_neighbours
+
+# Ход локального поиска: список перемещений (узел, новая ячейка)
+Move = List[Tuple[int, int]]
+
+
+class PlacementState:
+    """
+    PlacementState – размещение с индексом занятости ячеек для локального поиска.
+
+    Узлы нумеруются с 0, ячейки – с 0 (как в GridGeometry). Приращение стоимости
+    любого хода считается только по рёбрам перемещаемых узлов, т.е. за O(сумма степеней).
+
+    Attributes:
+        adjacency (List[Dict[int, int]]): Разреженная матрица смежности (узел -> {сосед: вес}).
+        positions (List[int]): Ячейка каждого узла.
+        geometry (GridGeometry): Геометрия сетки.
+        occupant (array): Узел в каждой ячейке (-1 – ячейка свободна, -2 – запрещена).
+        movable (List[bool]): Можно ли перемещать узел.
+        allowed (List[Optional[CellMask]]): Допустимые ячейки узла (None – любые незапрещённые).
+        free_cells (int): Число свободных ячеек.
+    """
+
+    def __init__(self, adjacency: List[Dict[int, int]], positions: List[int], geometry: GridGeometry,
+                 movable: Optional[Sequence[bool]] = None) -> None:
+        self.adjacency = adjacency
+        self.positions = list(positions)
+        self.geometry = geometry
+        self.occupant = array('i', [-1]) * geometry.cells
+        for node, cell in enumerate(self.positions):
+            self.occupant[cell] = node
+        self.movable = list(movable) if movable is not None else [True] * len(positions)
+        self.allowed: List[Optional[CellMask]] = [None] * len(positions)
+        self.free_cells = geometry.cells - len(positions)
+
+    def can_place(self, node: int, cell: int) -> bool:
+        """
+        Допустима ли ячейка для узла по его области; O(1).
+        """
+        mask = self.allowed[node]
+        return mask is None or cell in mask
+
+    def restrict(self, fixed: Dict[int, int], forbidden: Sequence[int],
+                 allowed: List[Optional[CellMask]], relocate: bool = True,
+                 labels: Optional[Sequence[int]] = None) -> int:
+        """
+        Накладывает ограничения (узлы и ячейки с 0): закреплённые узлы fixed ставятся
+        в свои ячейки и становятся неподвижными, запрещённые ячейки forbidden блокируются,
+        allowed – допустимые ячейки узлов. Узлы, нарушающие ограничения, при relocate
+        переносятся в ближайшие допустимые свободные ячейки (если таких нет – цепочкой
+        вытеснения, см. _eviction), иначе выбрасывается ValueError
+        (labels – номера узлов для сообщений, по умолчанию индексы).
+        Возвращает число перенесённых узлов.
+        """
+        labels = labels if labels is not None else range(len(self.positions))
+        self.allowed = allowed
+        moved = 0
+        for node, cell in fixed.items():
+            self.movable[node] = False
+            current = self.positions[node]
+            if current != cell:
+                if not relocate:
+                    raise ValueError(f"закреплённый элемент {labels[node]} не в своей позиции {cell + 1}")
+                other = self.occupant[cell]
+                self.apply([(node, cell)] if other < 0 else [(node, cell), (other, current)])
+                moved += 1
+        forbidden = set(forbidden)
+        for cell in forbidden:
+            if self.occupant[cell] == -1:
+                self.free_cells -= 1
+            # Узел в запрещённой ячейке переносится ниже
+            self.occupant[cell] = -2
+        cols, rows = self.geometry.cols, self.geometry.rows
+        for node, cell in enumerate(self.positions):
+            if node in fixed or (cell not in forbidden and self.can_place(node, cell)):
+                continue
+            if not relocate:
+                raise ValueError(f"элемент {labels[node]} стоит в недопустимой позиции {cell + 1}")
+            found = self.nearest_free(cell // cols, cell % cols, 1, rows + cols, node)
+            move = [(node, found[0])] if found else self._eviction(node)
+            if move is None:
+                raise ValueError(f"для элемента {labels[node]} нет допустимой позиции")
+            self.apply(move)
+            if cell in forbidden:
+                self.occupant[cell] = -2
+                self.free_cells -= 1
+            moved += 1
+        return moved
+
+    def total_cost(self) -> int:
+        row_of, col_of = self.geometry.row_of, self.geometry.col_of
+        positions = self.positions
+        total = 0
+        for node, neighbours in enumerate(self.adjacency):
+            a = positions[node]
+            for neighbour, weight in neighbours.items():
+                if neighbour > node:
+                    b = positions[neighbour]
+                    total += weight * (abs(row_of[a] - row_of[b]) + abs(col_of[a] - col_of[b]))
+        return total
+
+    def cost_of(self, nodes: Iterable[int]) -> int:
+        """
+        Длина связей, касающихся узлов nodes (связь между двумя такими узлами – один раз).
+        """
+        row_of, col_of = self.geometry.row_of, self.geometry.col_of
+        positions = self.positions
+        nodes = set(nodes)
+        total = 0
+        for node in nodes:
+            a = positions[node]
+            for neighbour, weight in self.adjacency[node].items():
+                if neighbour not in nodes or neighbour > node:
+                    b = positions[neighbour]
+                    total += weight * (abs(row_of[a] - row_of[b]) + abs(col_of[a] - col_of[b]))
+        return total
+
+    def delta(self, move: Move) -> int:
+        """
+        Приращение суммарной длины связей при выполнении хода move.
+        Рёбра между перемещаемыми узлами учитываются один раз.
+        """
+        row_of, col_of = self.geometry.row_of, self.geometry.col_of
+        positions = self.positions
+        moved = dict(move)
+        delta = 0
+        for node, new_cell in move:
+            old_cell = positions[node]
+            nr, nc = row_of[new_cell], col_of[new_cell]
+            orr, oc = row_of[old_cell], col_of[old_cell]
+            for neighbour, weight in self.adjacency[node].items():
+                other_new = moved.get(neighbour)
+                other = positions[neighbour]
+                if other_new is None:
+                    r, c = row_of[other], col_of[other]
+                    delta += weight * (abs(nr - r) + abs(nc - c) - abs(orr - r) - abs(oc - c))
+                elif neighbour > node:
+                    delta += weight * (abs(nr - row_of[other_new]) + abs(nc - col_of[other_new]) -
+                                       abs(orr - row_of[other]) - abs(oc - col_of[other]))
+        return delta
+
+    def apply(self, move: Move) -> None:
+        """
+        Выполняет ход. Ячейки, освобождаемые ходом, могут быть заняты другими узлами того же хода.
+        """
+        for node, _ in move:
+            self.occupant[self.positions[node]] = -1
+        for node, new_cell in move:
+            self.positions[node] = new_cell
+            self.occupant[new_cell] = node
+
+    def median_cell(self, node: int) -> Optional[Tuple[int, int]]:
+        """
+        Медиана (строка, колонка) соседей узла – точка, к которой его выгодно придвинуть.
+        """
+        neighbours = self.adjacency[node]
+        if not neighbours:
+            return None
+        row_of, col_of = self.geometry.row_of, self.geometry.col_of
+        rows = sorted(row_of[self.positions[j]] for j in neighbours)
+        cols = sorted(col_of[self.positions[j]] for j in neighbours)
+        return rows[len(rows) // 2], cols[len(cols) // 2]
+
+    def window(self, r: int, c: int, radius: int) -> Iterable[int]:
+        """
+        Ячейки квадрата со стороной 2*radius+1 с центром (r, c).
+        """
+        cols, rows = self.geometry.cols, self.geometry.rows
+        for rr in range(max(0, r - radius), min(rows, r + radius + 1)):
+            base = rr * cols
+            for cc in range(max(0, c - radius), min(cols, c + radius + 1)):
+                yield base + cc
+
+    def rings(self, r: int, c: int, max_radius: int) -> Iterable[int]:
+        """
+        Ячейки сетки кольцами вокруг (r, c) по возрастанию радиуса (до max_radius).
+        """
+        cols, rows = self.geometry.cols, self.geometry.rows
+        for radius in range(max_radius + 1):
+            for rr in range(r - radius, r + radius + 1):
+                if not 0 <= rr < rows:
+                    continue
+                step = 1 if abs(rr - r) == radius else 2 * radius
+                for cc in range(c - radius, c + radius + 1, step):
+                    if 0 <= cc < cols:
+                        yield rr * cols + cc
+
+    def _eviction(self, node: int) -> Optional[Move]:
+        """
+        Цепочка вытеснения, освобождающая узлу допустимую ячейку (поиск в ширину):
+        узел занимает допустимую ячейку, её подвижный узел – допустимую для себя ячейку
+        и т.д., пока очередной узел не уйдёт в свободную ячейку или (на заполненной сетке)
+        в ячейку исходного узла – тогда узлы меняются местами по циклу.
+        Ближе к началу поиска – ячейки ближе к перемещаемому узлу.
+        """
+        rows, cols = self.geometry.rows, self.geometry.cols
+        current = self.positions[node]
+        # Замкнуть цикл нельзя, если ячейка узла запрещена (помечена -2)
+        closable = self.occupant[current] == node
+        # taken_by[ячейка] – узел цепочки, который займёт эту ячейку
+        taken_by: Dict[int, int] = {}
+        queue = [node]
+        for mover in queue:
+            start = self.positions[mover]
+            for cell in self.rings(start // cols, start % cols, rows + cols):
+                if cell in taken_by or not self.can_place(mover, cell):
+                    continue
+                other = self.occupant[cell]
+                if other == -1 or (other == node and closable and mover != node):
+                    # Конец цепочки: восстанавливаем ходы от последнего узла к исходному
+                    move = [(mover, cell)]
+                    while mover != node:
+                        cell = self.positions[mover]
+                        mover = taken_by[cell]
+                        move.append((mover, cell))
+                    return move[::-1]
+                if other < 0 or other == node or not self.movable[other]:
+                    continue
+                taken_by[cell] = mover
+                queue.append(other)
+        return None
+
+    def nearest_free(self, r: int, c: int, count: int, max_radius: int,
+                     node: Optional[int] = None) -> List[int]:
+        """
+        До count свободных ячеек, ближайших к (r, c) (поиск кольцами радиусом до max_radius);
+        если задан node – только допустимых для этого узла.
+        """
+        found: List[int] = []
+        if self.free_cells == 0:
+            return found
+        cols, rows = self.geometry.cols, self.geometry.rows
+        occupant = self.occupant
+        for radius in range(max_radius + 1):
+            for rr in range(r - radius, r + radius + 1):
+                if not 0 <= rr < rows:
+                    continue
+                edge_row = abs(rr - r) == radius
+                step = 1 if edge_row else 2 * radius
+                for cc in range(c - radius, c + radius + 1, step):
+                    if 0 <= cc < cols and occupant[rr * cols + cc] == -1:
+                        if node is None or self.can_place(node, rr * cols + cc):
+                            found.append(rr * cols + cc)
+            if len(found) >= count:
+                break
+        return found[:count]
+
+
+def _placement_positions(schema_data: SchemaData, geometry: GridGeometry) -> Tuple[List[int], List[int]]:
+    """
+    Номера элементов по порядку и их ячейки; ValueError, если размещение недопустимо.
+    """
+    elements = sorted(schema_data.nodes)
+    positions: List[int] = []
+    used = set()
+    for element in elements:
+        cell = schema_data.nodes[element].grid_position - 1
+        if not 0 <= cell < geometry.cells:
+            raise ValueError(f"позиция элемента {element} вне сетки")
+        if cell in used:
+            raise ValueError(f"позиция {cell + 1} занята несколькими элементами")
+        used.add(cell)
+        positions.append(cell)
+    return elements, positions
+
+
+def _apply_constraints(state: PlacementState, elements: List[int],
+                       constraints: Optional[PlacementConstraints], relocate: bool) -> int:
+    """
+    Переводит проверенные ограничения (по номерам элементов) на узлы состояния.
+    """
+    if constraints is None or constraints.is_empty():
+        return 0
+    index_of = {element: node for node, element in enumerate(elements)}
+    return state.restrict({index_of[element]: cell for element, cell in constraints.fixed_cells.items()},
+                          constraints.forbidden_cells,
+                          [constraints.allowed.get(element) for element in elements], relocate, elements)
+
+
+def state_from_schema(schema_data: SchemaData,
+                      constraints: Optional[PlacementConstraints] = None) -> Tuple[PlacementState, List[int]]:
+    """
+    Строит PlacementState по текущему размещению схемы.
+    Возвращает состояние и номера элементов по порядку узлов состояния.
+    Если размещение недопустимо (позиция вне сетки или занята дважды), выбрасывает ValueError.
+    Проверенные ограничения constraints накладываются на состояние; элементы, которые
+    их нарушают, переносятся в ближайшие допустимые ячейки.
+    """
+    geometry = get_grid_geometry(schema_data.rows, schema_data.cols)
+    elements, positions = _placement_positions(schema_data, geometry)
+    index_of = {element: index for index, element in enumerate(elements)}
+    adjacency: List[Dict[int, int]] = [{} for _ in elements]
+    for i, j, weight in get_weighted_edges(schema_data):
+        a, b = index_of.get(i), index_of.get(j)
+        if a is not None and b is not None:
+            adjacency[a][b] = adjacency[b][a] = weight
+    state = PlacementState(adjacency, positions, geometry)
+    _apply_constraints(state, elements, constraints, relocate=True)
+    return state, elements
+
+
+def local_state_from_schema(schema_data: SchemaData, changed: Iterable[int], hops: int,
+                            constraints: Optional[PlacementConstraints] = None
+                            ) -> Tuple[PlacementState, List[int], List[int]]:
+    """
+    Строит PlacementState для доразмещения вокруг изменённых элементов changed.
+
+    Подвижны только элементы на расстоянии не более hops связей от изменённых (окно);
+    в матрице смежности состояния есть только связи, касающиеся окна (их длина –
+    cost_of(окно)), а построение занимает время, пропорциональное окну
+    (плюс O(n) на позиции всех элементов). Возвращает состояние, номера элементов
+    по порядку узлов состояния и узлы окна. Текущее размещение должно удовлетворять
+    проверенным ограничениям constraints (иначе ValueError): переносы вне окна
+    изменили бы длину связей, которую окно не учитывает.
+    """
+    geometry = get_grid_geometry(schema_data.rows, schema_data.cols)
+    elements, positions = _placement_positions(schema_data, geometry)
+    index_of = {element: index for index, element in enumerate(elements)}
+    matrix = schema_data.adjacency_matrix
+
+    def neighbours(node: int) -> Dict[int, int]:
+        row = {}
+        for j, weight in iter_neighbours(matrix, elements[node] - 1):
+            other = index_of.get(j + 1)
+            if other is not None:
+                row[other] = weight
+        return row
+
+    # Окно – обход в ширину на hops шагов от изменённых элементов
+    rows: Dict[int, Dict[int, int]] = {}
+    frontier = [index_of[element] for element in set(changed) if element in index_of]
+    window = set(frontier)
+    for hop in range(hops + 1):
+        next_frontier = []
+        for node in frontier:
+            rows[node] = neighbours(node)
+            if hop < hops:
+                for other in rows[node]:
+                    if other not in window:
+                        window.add(other)
+                        next_frontier.append(other)
+        frontier = next_frontier
+
+    # Остальные узлы делят один пустой словарь: их связи между собой на ходы не влияют
+    empty: Dict[int, int] = {}
+    adjacency: List[Dict[int, int]] = [empty] * len(elements)
+    for node, row in rows.items():
+        adjacency[node] = row
+    for node, row in rows.items():
+        for other, weight in row.items():
+            if other not in rows:
+                if adjacency[other] is empty:
+                    adjacency[other] = {}
+                adjacency[other][node] = weight
+    movable = [False] * len(elements)
+    for node in window:
+        movable[node] = True
+    state = PlacementState(adjacency, positions, geometry, movable)
+    _apply_constraints(state, elements, constraints, relocate=False)
+    return state, elements, sorted(window)
+
+
+def schema_from_state(schema_data: SchemaData, state: PlacementState, elements: List[int]) -> SchemaData:
+    """
+    Новая схема с размещением из state (матрица смежности – общая с schema_data).
+    """
+    new_nodes = {element: Node(element, cell + 1) for element, cell in zip(elements, state.positions)}
+    return SchemaData(new_nodes, schema_data.adjacency_matrix, schema_data.cols, schema_data.rows)
+
+
+class RelocationSearch:
+    """
+    Локальный поиск с перемещением в свободные ячейки и цепочками вытеснения.
+
+    Для каждого узла рассматриваются ячейки окна вокруг медианы его соседей:
+      - свободная ячейка – перемещение узла A в неё;
+      - ячейка узла B – обмен A и B, а также цепочка вытеснения: A занимает ячейку B,
+        B уходит в одну из свободных ячеек рядом с медианой своих соседей.
+    Выполняется лучший улучшающий ход; проходы повторяются, пока есть улучшения.
+
+    Attributes:
+        window (int): Радиус окна кандидатов вокруг медианы соседей.
+        chain_candidates (int): Сколько ближайших свободных ячеек пробовать для вытесняемого узла.
+        chain_radius (int): Радиус поиска свободных ячеек для вытесняемого узла.
+    """
+
+    def __init__(self, window: int = 2, chain_candidates: int = 3, chain_radius: int = 3) -> None:
+        self.window = window
+        self.chain_candidates = chain_candidates
+        self.chain_radius = chain_radius
+
+    def best_move(self, state: PlacementState, node: int) -> Tuple[int, Optional[Move]]:
+        """
+        Лучший улучшающий ход для узла: (приращение, ход) или (0, None).
+        """
+        target = state.median_cell(node)
+        if target is None:
+            return 0, None
+        current = state.positions[node]
+        best_delta, best_move = 0, None
+        for cell in state.window(target[0], target[1], self.window):
+            if cell == current or not state.can_place(node, cell):
+                continue
+            other = state.occupant[cell]
+            if other == -1:
+                candidates = [[(node, cell)]]
+            elif other >= 0 and state.movable[other]:
+                candidates = [[(node, cell), (other, current)]] if state.can_place(other, current) else []
+                other_target = state.median_cell(other)
+                if other_target is not None:
+                    for free in state.nearest_free(other_target[0], other_target[1],
+                                                   self.chain_candidates, self.chain_radius, other):
+                        candidates.append([(node, cell), (other, free)])
+            else:
+                continue
+            for move in candidates:
+                delta = state.delta(move)
+                if delta < best_delta:
+                    best_delta, best_move = delta, move
+        return best_delta, best_move
+
+    def improve_pass(self, state: PlacementState, budget: Budget, order: Sequence[int]) -> int:
+        """
+        Один проход по узлам order; возвращает приращение стоимости.
+        Проход прерывается, если истекло время бюджета.
+        """
+        pass_delta = 0
+        for count, node in enumerate(order):
+            if count & 255 == 255 and budget.remaining() == 0:
+                break
+            delta, move = self.best_move(state, node)
+            if move is not None:
+                state.apply(move)
+                pass_delta += delta
+        return pass_delta
+
+    def improve(self, state: PlacementState, budget: Budget,
+                nodes: Optional[Iterable[int]] = None) -> int:
+        """
+        Улучшает размещение, пока есть улучшающие ходы и не исчерпан бюджет.
+        nodes – узлы, которые пробуют перемещаться (по умолчанию все подвижные).
+        Итерацией бюджета считается один проход. Возвращает суммарное приращение стоимости.
+        """
+        order = self.movable_order(state, nodes)
+        total_delta = 0
+        while order and not budget.expired():
+            budget.tick()
+            pass_delta = self.improve_pass(state, budget, order)
+            total_delta += pass_delta
+            if pass_delta == 0:
+                break
+        return total_delta
+
+    @staticmethod
+    def movable_order(state: PlacementState, nodes: Optional[Iterable[int]] = None) -> List[int]:
+        return [node for node in (range(len(state.positions)) if nodes is None else nodes)
+                if state.movable[node]]
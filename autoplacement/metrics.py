@@ -0,0 +1,196 @@
+import math
+from typing import Dict, List, Optional, Set, Tuple
+
+from autoplacement.grid import get_grid_geometry
+from autoplacement.utils import compute_total_weighted_length, get_weighted_edges
+from models import SchemaData
+
+# Размер (в ячейках сетки) квадратной корзины для поиска пересечений рёбер
+CROSSING_BUCKET_SIZE = 4
+
+# Отрезок ребра: (строка1, колонка1, строка2, колонка2, элемент1, элемент2)
+_Segment = Tuple[int, int, int, int, int, int]
+
+
+class LayoutMetrics:
+    """
+    LayoutMetrics – показатели качества размещения.
+
+    Attributes:
+        total_length (float): Суммарная взвешенная длина связей.
+        crossings (int): Число пересечений рёбер (рёбра – отрезки между центрами ячеек).
+        max_length (int): Наибольшая манхэттенская длина ребра.
+        max_weighted_length (int): Наибольшая длина ребра с учётом веса.
+        congestion (List[List[float]]): Карта загруженности трассировки (rows x cols).
+    """
+
+    def __init__(self, total_length: float, crossings: int, max_length: int,
+                 max_weighted_length: int, congestion: List[List[float]]) -> None:
+        self.total_length = total_length
+        self.crossings = crossings
+        self.max_length = max_length
+        self.max_weighted_length = max_weighted_length
+        self.congestion = congestion
+
+    @property
+    def max_congestion(self) -> float:
+        return max((value for row in self.congestion for value in row), default=0.0)
+
+    def to_dict(self) -> dict:
+        return {
+            "total_length": self.total_length,
+            "crossings": self.crossings,
+            "max_length": self.max_length,
+            "max_weighted_length": self.max_weighted_length,
+            "max_congestion": round(self.max_congestion, 3),
+        }
+
+
+def compute_layout_metrics(schema_data: SchemaData) -> LayoutMetrics:
+    """
+    Вычисляет все показатели качества размещения за один проход по рёбрам.
+    """
+    segments = _edge_segments(schema_data)
+    max_length = 0
+    max_weighted = 0
+    for (r1, c1, r2, c2, _, _), weight in segments:
+        length = abs(r1 - r2) + abs(c1 - c2)
+        max_length = max(max_length, length)
+        max_weighted = max(max_weighted, weight * length)
+    return LayoutMetrics(
+        compute_total_weighted_length(schema_data),
+        count_crossings([segment for segment, _ in segments]),
+        max_length,
+        max_weighted,
+        compute_congestion(schema_data, segments),
+    )
+
+
+def _edge_segments(schema_data: SchemaData) -> List[Tuple[_Segment, int]]:
+    """
+    Возвращает рёбра схемы как отрезки между ячейками узлов (с весами).
+    """
+    geometry = get_grid_geometry(schema_data.rows, schema_data.cols)
+    coords: Dict[int, Tuple[int, int]] = {}
+    for number, node in schema_data.nodes.items():
+        cell = node.grid_position - 1
+        if 0 <= cell < geometry.cells:
+            coords[number] = (geometry.row_of[cell], geometry.col_of[cell])
+    segments: List[Tuple[_Segment, int]] = []
+    for i, j, weight in get_weighted_edges(schema_data):
+        if i in coords and j in coords:
+            segments.append(((*coords[i], *coords[j], i, j), weight))
+    return segments
+
+
+def _orientation(ar: int, ac: int, br: int, bc: int, pr: int, pc: int) -> int:
+    value = (br - ar) * (pc - ac) - (bc - ac) * (pr - ar)
+    return (value > 0) - (value < 0)
+
+
+def _on_segment(ar: int, ac: int, br: int, bc: int, pr: int, pc: int) -> bool:
+    return min(ar, br) <= pr <= max(ar, br) and min(ac, bc) <= pc <= max(ac, bc)
+
+
+def segments_cross(first: _Segment, second: _Segment) -> bool:
+    """
+    Проверяет, пересекаются ли два ребра. Рёбра с общим узлом не считаются пересекающимися;
+    касание и наложение (общий участок на одной прямой) считаются пересечением.
+    """
+    ar, ac, br, bc, a1, a2 = first
+    cr, cc, dr, dc, b1, b2 = second
+    if a1 in (b1, b2) or a2 in (b1, b2):
+        return False
+    o1 = _orientation(ar, ac, br, bc, cr, cc)
+    o2 = _orientation(ar, ac, br, bc, dr, dc)
+    o3 = _orientation(cr, cc, dr, dc, ar, ac)
+    o4 = _orientation(cr, cc, dr, dc, br, bc)
+    if o1 * o2 < 0 and o3 * o4 < 0:
+        return True
+    return (o1 == 0 and _on_segment(ar, ac, br, bc, cr, cc) or
+            o2 == 0 and _on_segment(ar, ac, br, bc, dr, dc) or
+            o3 == 0 and _on_segment(cr, cc, dr, dc, ar, ac) or
+            o4 == 0 and _on_segment(cr, cc, dr, dc, br, bc))
+
+
+def _segment_buckets(segment: _Segment, size: int) -> Set[Tuple[int, int]]:
+    """
+    Корзины (квадраты size x size ячеек), через которые проходит отрезок.
+    Для каждой полосы строк берётся диапазон колонок, занимаемый отрезком внутри полосы,
+    поэтому длинное диагональное ребро попадает лишь в корзины вдоль своей линии.
+    Любая общая точка двух отрезков лежит в корзине, в которую попадают оба.
+    """
+    r1, c1, r2, c2 = segment[:4]
+    if r1 > r2:
+        r1, c1, r2, c2 = r2, c2, r1, c1
+    buckets: Set[Tuple[int, int]] = set()
+    for band in range(r1 // size, r2 // size + 1):
+        if r1 == r2:
+            left, right = min(c1, c2), max(c1, c2)
+        else:
+            # Колонки отрезка на границах полосы (линейная интерполяция)
+            top = max(r1, band * size)
+            bottom = min(r2, band * size + size)
+            at_top = c1 + (c2 - c1) * (top - r1) / (r2 - r1)
+            at_bottom = c1 + (c2 - c1) * (bottom - r1) / (r2 - r1)
+            left, right = min(at_top, at_bottom), max(at_top, at_bottom)
+        first_col = max(0, math.floor(left - 1e-9)) // size
+        last_col = math.floor(right + 1e-9) // size
+        for bucket_col in range(first_col, last_col + 1):
+            buckets.add((band, bucket_col))
+    return buckets
+
+
+def count_crossings(segments: List[_Segment], bucket_size: int = CROSSING_BUCKET_SIZE) -> int:
+    """
+    Считает пересечения рёбер с помощью равномерной сетки корзин:
+    проверяются только пары рёбер, попавших в общую корзину, каждая пара – один раз.
+    """
+    buckets: Dict[Tuple[int, int], List[int]] = {}
+    for index, segment in enumerate(segments):
+        for key in _segment_buckets(segment, bucket_size):
+            buckets.setdefault(key, []).append(index)
+    checked: Set[Tuple[int, int]] = set()
+    crossings = 0
+    for members in buckets.values():
+        for a_pos in range(len(members)):
+            a = members[a_pos]
+            for b in members[a_pos + 1:]:
+                pair = (a, b) if a < b else (b, a)
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                if segments_cross(segments[a], segments[b]):
+                    crossings += 1
+    return crossings
+
+
+def compute_congestion(schema_data: SchemaData,
+                       segments: Optional[List[Tuple[_Segment, int]]] = None) -> List[List[float]]:
+    """
+    Карта загруженности трассировки (оценка RUDY): каждое ребро равномерно распределяет
+    weight * (ширина + высота) / площадь по ячейкам своего охватывающего прямоугольника.
+    Прямоугольники добавляются за O(1) через разностный массив, после чего карта
+    восстанавливается двумерными префиксными суммами.
+    """
+    rows, cols = schema_data.rows, schema_data.cols
+    if segments is None:
+        segments = _edge_segments(schema_data)
+    diff = [[0.0] * (cols + 1) for _ in range(rows + 1)]
+    for (r1, c1, r2, c2, _, _), weight in segments:
+        top, bottom = min(r1, r2), max(r1, r2)
+        left, right = min(c1, c2), max(c1, c2)
+        height = bottom - top + 1
+        width = right - left + 1
+        density = weight * (width + height) / (width * height)
+        diff[top][left] += density
+        diff[top][right + 1] -= density
+        diff[bottom + 1][left] -= density
+        diff[bottom + 1][right + 1] += density
+    congestion = [[0.0] * cols for _ in range(rows)]
+    for r in range(rows):
+        running = 0.0
+        for c in range(cols):
+            running += diff[r][c]
+            congestion[r][c] = running + (congestion[r - 1][c] if r > 0 else 0.0)
+    return congestion
@@ -0,0 +1,115 @@
+import importlib
+import inspect
+import logging
+from importlib.metadata import entry_points
+from typing import Any, List, Optional, Tuple
+
+from autoplacement.AbstractAutoPlacement import AbstractAutoPlacement
+from autoplacement.budget import Budget
+from autoplacement.checkpoint import Checkpoint
+from autoplacement.constraints import PlacementConstraints
+from models import SchemaData
+
+logger = logging.getLogger(__name__)
+
+# Группа entry points, через которую сторонние пакеты регистрируют свои алгоритмы:
+#   [project.entry-points."autoplacement.algorithms"]
+#   "Мой алгоритм" = "my_package.placement:MyPlacement"
+ENTRY_POINT_GROUP = "autoplacement.algorithms"
+
+
+class LazyAutoPlacement(AbstractAutoPlacement):
+    """
+    Отложенная запись реестра алгоритмов авторазмещения.
+
+    Хранит только название и путь импорта вида "модуль:Класс"; модуль алгоритма
+    импортируется, а экземпляр создаётся при первом вызове run (или load).
+    Название записи должно совпадать с get_name() экземпляра (при расхождении
+    load пишет предупреждение в журнал).
+
+    Attributes:
+        name (str): Название алгоритма для меню.
+        target (str): Путь импорта "модуль:объект". Объект – класс (фабрика) или готовый экземпляр.
+        args, kwargs: Аргументы конструктора.
+    """
+
+    def __init__(self, name: str, target: str, *args: Any, **kwargs: Any) -> None:
+        self.name = name
+        self.target = target
+        self.args = args
+        self.kwargs = kwargs
+        self._instance: Optional[AbstractAutoPlacement] = None
+
+    def get_name(self) -> str:
+        return self.name
+
+    def load(self) -> AbstractAutoPlacement:
+        """
+        Импортирует модуль алгоритма и создаёт его экземпляр (один раз).
+        """
+        if self._instance is None:
+            obj = self._import_target()
+            if not isinstance(obj, AbstractAutoPlacement):
+                obj = obj(*self.args, **self.kwargs)
+            if not isinstance(obj, AbstractAutoPlacement):
+                raise TypeError(f"{self.target} не является алгоритмом авторазмещения")
+            if obj.get_name() != self.name:
+                # Название записи показывается в меню до загрузки и должно совпадать с get_name()
+                logger.warning(f"Название алгоритма {obj.get_name()!r} не совпадает "
+                               f"с названием записи реестра {self.name!r}")
+            self._instance = obj
+        return self._instance
+
+    def _import_target(self) -> Any:
+        module_name, _, attr = self.target.partition(":")
+        obj = importlib.import_module(module_name)
+        for part in attr.split("."):
+            obj = getattr(obj, part)
+        return obj
+
+    def configure(self, **options: Any) -> "LazyAutoPlacement":
+        """
+        Запись того же алгоритма с дополнительными аргументами конструктора (например,
+        workers из пакетного запуска). Аргументы, которых конструктор не принимает,
+        отбрасываются с сообщением в журнал; готовый экземпляр не перенастраивается.
+        """
+        factory = self._import_target()
+        if isinstance(factory, AbstractAutoPlacement):
+            logger.info(f"{self.name}: параметры {sorted(options)} не применяются к готовому экземпляру")
+            return self
+        parameters = inspect.signature(factory).parameters
+        accepted = {key: value for key, value in options.items() if key in parameters}
+        ignored = sorted(set(options) - set(accepted))
+        if ignored:
+            logger.info(f"{self.name}: алгоритм не поддерживает параметры {ignored}")
+        if not accepted:
+            return self
+        return LazyAutoPlacement(self.name, self.target, *self.args, **{**self.kwargs, **accepted})
+
+    def run(self, schema_data: SchemaData, tab_name: str,
+            budget: Optional[Budget] = None,
+            checkpoint: Optional[Checkpoint] = None,
+            constraints: Optional[PlacementConstraints] = None) -> List[Tuple[SchemaData, str]]:
+        return self.load().run(schema_data, tab_name, budget, checkpoint, constraints)
+
+    def __getstate__(self) -> dict:
+        # Для передачи в другие процессы достаточно описания записи
+        state = self.__dict__.copy()
+        state["_instance"] = None
+        return state
+
+
+def discover_plugins() -> List[LazyAutoPlacement]:
+    """
+    Находит алгоритмы сторонних пакетов по entry points группы ENTRY_POINT_GROUP.
+    Название пункта меню – имя entry point; сам модуль при поиске не импортируется.
+    """
+    plugins: List[LazyAutoPlacement] = []
+    try:
+        found = entry_points(group=ENTRY_POINT_GROUP)
+    except Exception as e:
+        logger.warning(f"Не удалось получить список подключаемых алгоритмов: {e}")
+        return plugins
+    for entry_point in found:
+        plugins.append(LazyAutoPlacement(entry_point.name, entry_point.value))
+    return plugins
@@ -0,0 +1,165 @@
+from array import array
+from multiprocessing import shared_memory
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from autoplacement.grid import GridGeometry
+
+# Описание опубликованного списка связей для передачи в рабочие процессы:
+# (имя блока общей памяти, число узлов, число записей CSR, строк сетки, колонок сетки)
+NetlistDescriptor = Tuple[str, int, int, int, int]
+
+_ITEM_SIZE = array('i').itemsize
+
+# Список связей, к которому подключён текущий рабочий процесс (см. attach_worker)
+_attached: Optional["SharedNetlist"] = None
+
+
+class SharedNetlist:
+    """
+    SharedNetlist – список связей и геометрия сетки в общей памяти (multiprocessing.shared_memory).
+
+    Смежность хранится в формате CSR: соседи узла a – indices[indptr[a]:indptr[a+1]],
+    веса – weights в тех же позициях; каждое ребро записано в обе стороны. Рядом лежат
+    row_of/col_of ячеек сетки, поэтому объект подходит везде, где от геометрии нужны
+    только они (например, batch_total_weighted_length).
+
+    Владелец публикует данные один раз (publish), рабочие процессы подключаются по
+    descriptor (attach) и читают массивы через memoryview без копирования; в задачах
+    передаются только небольшие описания (зерно, начальное размещение).
+    Владелец должен освободить блок (unlink или with).
+
+    Attributes:
+        nodes (int): Число узлов.
+        rows, cols, cells (int): Размеры сетки и число ячеек.
+        indptr, indices, weights (memoryview): Массивы CSR.
+        row_of, col_of (memoryview): Строка и колонка каждой ячейки.
+        descriptor (NetlistDescriptor): Описание для attach в другом процессе.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, nodes: int, nnz: int, rows: int, cols: int,
+                 owner: bool) -> None:
+        self.shm = shm
+        self.nodes = nodes
+        self.rows = rows
+        self.cols = cols
+        self.cells = rows * cols
+        self.owner = owner
+        self.descriptor: NetlistDescriptor = (shm.name, nodes, nnz, rows, cols)
+        self._views: List[memoryview] = [shm.buf.cast('i')]
+        bounds = [nodes + 1, nnz, nnz, self.cells, self.cells]
+        parts = []
+        offset = 0
+        for length in bounds:
+            parts.append(self._views[0][offset:offset + length])
+            offset += length
+        self._views.extend(parts)
+        self.indptr, self.indices, self.weights, self.row_of, self.col_of = parts
+
+    @staticmethod
+    def _size(nodes: int, nnz: int, cells: int) -> int:
+        return max(1, nodes + 1 + 2 * nnz + 2 * cells) * _ITEM_SIZE
+
+    @classmethod
+    def publish(cls, edges: Sequence[Tuple[int, int, int]], nodes: int,
+                geometry: GridGeometry) -> "SharedNetlist":
+        """
+        Создаёт блок общей памяти по рёбрам (узел_a, узел_b, вес) с узлами от 0 до nodes-1.
+        """
+        degree = array('i', [0]) * (nodes + 1)
+        for a, b, _ in edges:
+            degree[a + 1] += 1
+            degree[b + 1] += 1
+        indptr = array('i', [0]) * (nodes + 1)
+        for node in range(nodes):
+            indptr[node + 1] = indptr[node] + degree[node + 1]
+        nnz = indptr[nodes]
+        indices = array('i', [0]) * nnz
+        weights = array('i', [0]) * nnz
+        fill = indptr[:nodes]
+        for a, b, weight in edges:
+            for u, v in ((a, b), (b, a)):
+                indices[fill[u]] = v
+                weights[fill[u]] = weight
+                fill[u] += 1
+
+        shm = shared_memory.SharedMemory(create=True, size=cls._size(nodes, nnz, geometry.cells))
+        try:
+            netlist = cls(shm, nodes, nnz, geometry.rows, geometry.cols, owner=True)
+            netlist.indptr[:] = indptr
+            netlist.indices[:] = indices
+            netlist.weights[:] = weights
+            netlist.row_of[:] = geometry.row_of
+            netlist.col_of[:] = geometry.col_of
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        return netlist
+
+    @classmethod
+    def attach(cls, descriptor: NetlistDescriptor) -> "SharedNetlist":
+        """
+        Подключается к блоку, опубликованному другим процессом.
+        """
+        name, nodes, nnz, rows, cols = descriptor
+        return cls(shared_memory.SharedMemory(name=name), nodes, nnz, rows, cols, owner=False)
+
+    def neighbours(self, node: int) -> Iterator[Tuple[int, int]]:
+        """
+        Пары (сосед, вес) узла node.
+        """
+        start, end = self.indptr[node], self.indptr[node + 1]
+        return zip(self.indices[start:end], self.weights[start:end])
+
+    def edges(self) -> Iterator[Tuple[int, int, int]]:
+        """
+        Рёбра (узел_a, узел_b, вес) с a < b.
+        """
+        indptr, indices, weights = self.indptr, self.indices, self.weights
+        for a in range(self.nodes):
+            for index in range(indptr[a], indptr[a + 1]):
+                b = indices[index]
+                if b > a:
+                    yield a, b, weights[index]
+
+    def close(self) -> None:
+        """
+        Отключается от блока (массивы после этого недоступны).
+        """
+        if self._views:
+            for view in reversed(self._views):
+                view.release()
+            self._views = []
+            self.shm.close()
+
+    def unlink(self) -> None:
+        """
+        Отключается и удаляет блок (вызывает только владелец).
+        """
+        self.close()
+        if self.owner:
+            self.shm.unlink()
+            self.owner = False
+
+    def __enter__(self) -> "SharedNetlist":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.unlink()
+
+
+def attach_worker(descriptor: NetlistDescriptor) -> None:
+    """
+    Инициализатор рабочего процесса пула: подключает опубликованный список связей.
+    """
+    global _attached
+    _attached = SharedNetlist.attach(descriptor)
+
+
+def attached_netlist() -> SharedNetlist:
+    """
+    Список связей, подключённый в текущем рабочем процессе через attach_worker.
+    """
+    if _attached is None:
+        raise RuntimeError("Рабочий процесс не подключён к общему списку связей")
+    return _attached
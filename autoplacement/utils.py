@@ -1,7 +1,8 @@
-from tkinter import messagebox, simpledialog
-from typing import Dict, List, Set, Optional
+from array import array
+from typing import Dict, List, Sequence, Tuple
 
-from models import Node, SchemaData
+from autoplacement.grid import GridGeometry, get_grid_geometry
+from models import Node, SchemaData, iter_edges
 
 
 def compute_total_weighted_length(schema_data: SchemaData) -> float:
@@ -21,110 +22,146 @@ def compute_total_weighted_length(schema_data: SchemaData) -> float:
     total: float = 0.0
     cols: int = schema_data.cols
     nodes: Dict[int, Node] = schema_data.nodes
-    # Проходим по матрице для i < j, чтобы не дублировать ребра
-    for i, row in enumerate(schema_data.adjacency_matrix):
-        for j, weight in enumerate(row):
-            if j > i and weight > 0:
-                node_i = nodes.get(i + 1)
-                node_j = nodes.get(j + 1)
-                if node_i is None or node_j is None:
-                    continue
-                row_i = (node_i.grid_position - 1) // cols
-                col_i = (node_i.grid_position - 1) % cols
-                row_j = (node_j.grid_position - 1) // cols
-                col_j = (node_j.grid_position - 1) % cols
-                manhattan_distance = abs(row_i - row_j) + abs(col_i - col_j)
-                total += weight * manhattan_distance
+    geometry = get_grid_geometry(schema_data.rows, cols)
+    # Координаты узлов вычисляем один раз (по предвычисленной геометрии сетки)
+    coords: Dict[int, Tuple[int, int]] = {}
+    for number, node in nodes.items():
+        cell = node.grid_position - 1
+        if 0 <= cell < geometry.cells:
+            coords[number] = (geometry.row_of[cell], geometry.col_of[cell])
+        else:
+            coords[number] = (cell // cols, cell % cols)
+    # Перебираем рёбра с i < j, чтобы не дублировать их
+    for i, j, weight in iter_edges(schema_data.adjacency_matrix):
+        rc_i = coords.get(i + 1)
+        rc_j = coords.get(j + 1)
+        if rc_i is None or rc_j is None:
+            continue
+        manhattan_distance = abs(rc_i[0] - rc_j[0]) + abs(rc_i[1] - rc_j[1])
+        total += weight * manhattan_distance
     return total
 
 
-def get_directive_nodes(max_id: int) -> Optional[List[Node]]:
+def get_weighted_edges(schema_data: SchemaData) -> List[Tuple[int, int, int]]:
     """
-    Запрашивает у пользователя директивно размещённые элементы и их позиции.
-    Формат (одна строка): "элемент,позиция; элемент,позиция; ..."
-
-    Ограничения:
-      - элемент ≤ max_id
-      - позиция ≤ max_id
-      - нельзя использовать одну позицию для нескольких элементов
-    Если пользователь ничего не ввел (или только пробелы),
-    возвращаем пустой список.
-
-    Пример использования:
-      user_input = "1,5; 3,7"
-      => Node(1,5), Node(3,7)
-
-    Возвращает список Node(element_number, grid_position)
-    или None, если пользователь нажал "Отмена"
-    (т. е. закрыл диалог).
+    Возвращает список рёбер схемы (element_i, element_j, weight) с i < j и weight > 0
+    в тех же соглашениях, что и compute_total_weighted_length.
     """
+    return [(i + 1, j + 1, weight) for i, j, weight in iter_edges(schema_data.adjacency_matrix)]
 
-    prompt = (
-        f"Введите пары 'элемент,позиция' через точку с запятой.\n"
-        f"Ограничение: элемент и позиция не больше {max_id}.\n"
-        f"Пример: 1,2; 3,7\n"
-        f"(Если оставить пустым, список вернется пустым.)"
-    )
-
-    user_input = simpledialog.askstring("Директивное размещение", prompt)
-    if user_input is None:
-        # Пользователь нажал «Отмена» или закрыл диалог
-        return None
-
-    # Удаляем лишние пробелы
-    user_input = user_input.strip()
-    if not user_input:
-        # Если строка пустая или из одних пробелов
-        return []
-
-    # Разделяем строку по ";" – получаем блоки "элемент,позиция"
-    pairs_str = [segment.strip() for segment in user_input.split(";") if segment.strip()]
-    # Если в итоге нечего парсить, возвращаем пустой список
-    if not pairs_str:
-        return []
-
-    result_nodes: List[Node] = []
-    used_positions: Set[int] = set()
-
-    try:
-        for pair in pairs_str:
-            el_s, pos_s = [x.strip() for x in pair.split(",")]
-            el_num = int(el_s)
-            pos_num = int(pos_s)
-
-            # Проверяем, что элемент и позиция в диапазоне 1..max_id
-            if el_num < 1 or el_num > max_id:
-                messagebox.showerror(
-                    "Ошибка",
-                    f"Элемент {el_num} вне диапазона (1..{max_id})."
-                )
-                return None
-
-            if pos_num < 1 or pos_num > max_id:
-                messagebox.showerror(
-                    "Ошибка",
-                    f"Позиция {pos_num} вне диапазона (1..{max_id})."
-                )
-                return None
-
-            if pos_num in used_positions:
-                messagebox.showerror(
-                    "Ошибка",
-                    f"Позиция {pos_num} уже занята другим элементом."
-                )
-                return None
-
-            used_positions.add(pos_num)
-            result_nodes.append(Node(el_num, pos_num))
-
-    except ValueError:
-        messagebox.showerror("Ошибка",
-                             "Неверный формат. Нужно 'элемент,позиция; элемент,позиция; ...'")
-        return None
-    except Exception as e:
-        messagebox.showerror("Ошибка", f"Произошла ошибка: {e}")
-        return None
-
-    # Если пользователь ввел пары, и все прошло – возвращаем список узлов
-    return result_nodes
+
+def batch_total_weighted_length(population: array, width: int,
+                                edges: Sequence[Tuple[int, int, int]],
+                                anchors: Sequence[Tuple[int, int, int]],
+                                geometry: GridGeometry) -> List[int]:
+    """
+    Вычисляет суммарную длину связей сразу для всей популяции размещений.
+
+    Популяция хранится как двумерный массив перестановок, развёрнутый по строкам:
+    особь k занимает элементы population[k*width:(k+1)*width], ген g – номер ячейки (с 0)
+    для g-го перемещаемого элемента.
+    Проход выполняется один раз по рёбрам; для каждого ребра стоимость пересчитывается
+    столбцом по всем особям сразу.
+
+    Args:
+        population (array): Развёрнутая матрица перестановок (count x width).
+        width (int): Длина одной перестановки.
+        edges (Sequence[Tuple[int, int, int]]): Рёбра между генами (ген_a, ген_b, вес).
+        anchors (Sequence[Tuple[int, int, int]]): Рёбра к неподвижным ячейкам (ген_a, ячейка, вес).
+        geometry (GridGeometry): Геометрия сетки (get_grid_geometry).
+
+    Returns:
+        List[int]: Суммарная длина связей для каждой особи.
+    """
+    count = len(population) // width
+    totals = [0] * count
+    columns: Dict[int, Tuple[List[int], List[int]]] = {}
+    row_of, col_of = geometry.row_of, geometry.col_of
+
+    def gene_coords(gene: int) -> Tuple[List[int], List[int]]:
+        # Строки и колонки ячеек гена по всем особям (кешируются на время вызова)
+        if gene not in columns:
+            cells = population[gene::width]
+            columns[gene] = ([row_of[cell] for cell in cells], [col_of[cell] for cell in cells])
+        return columns[gene]
+
+    for gene_a, gene_b, weight in edges:
+        rows_a, cols_a = gene_coords(gene_a)
+        rows_b, cols_b = gene_coords(gene_b)
+        totals = [total + weight * (abs(ra - rb) + abs(ca - cb))
+                  for total, ra, ca, rb, cb in zip(totals, rows_a, cols_a, rows_b, cols_b)]
+    for gene_a, cell, weight in anchors:
+        rows_a, cols_a = gene_coords(gene_a)
+        r0, c0 = row_of[cell], col_of[cell]
+        totals = [total + weight * (abs(ra - r0) + abs(ca - c0))
+                  for total, ra, ca in zip(totals, rows_a, cols_a)]
+    return totals
+
+
+def solve_assignment(cost: List[List[float]]) -> Tuple[float, List[int]]:
+    """
+    Решает задачу о назначениях венгерским алгоритмом (O(n^2 * m)).
+
+    Матрица может быть прямоугольной: число строк n не больше числа столбцов m.
+    Каждой строке назначается свой столбец так, чтобы суммарная стоимость была минимальной.
+
+    Args:
+        cost (List[List[float]]): Матрица стоимостей n x m (n <= m).
+
+    Returns:
+        Tuple[float, List[int]]: Минимальная суммарная стоимость и номер столбца (с 0)
+            для каждой строки.
+    """
+    n = len(cost)
+    if n == 0:
+        return 0.0, []
+    m = len(cost[0])
+    inf = float("inf")
+    # Потенциалы строк (u) и столбцов (v), p[j] – строка, назначенная столбцу j (индексация с 1)
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            row = cost[i0 - 1]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = row[j - 1] - u[i0] - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        # Восстанавливаем увеличивающую цепочку
+        while True:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+            if j0 == 0:
+                break
+    assignment = [-1] * n
+    for j in range(1, m + 1):
+        if p[j]:
+            assignment[p[j] - 1] = j - 1
+    total = sum(cost[i][assignment[i]] for i in range(n))
+    return total, assignment
 
@@ -0,0 +1,157 @@
+"""
+batch.py
+Пакетное (без графического интерфейса) авторазмещение схем.
+
+Пример:
+    python batch.py --list
+    python batch.py -a 4 --time-limit 30 -o out schema1.json schema2.json
+    python batch.py -a 3 --constraints fixed.json schema.json
+    python batch.py -a 2 --workers 4 -n 100000 schema.json
+
+Для каждой схемы выполняется выбранный алгоритм с заданным бюджетом, лучший вариант
+сохраняется в каталог вывода, а в стандартный вывод печатается строка JSON с результатом.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from typing import List, Optional, Tuple
+
+from autoplacement import AUTO_PLACEMENT_ALGORITHMS
+from autoplacement.AbstractAutoPlacement import AbstractAutoPlacement
+from autoplacement.budget import Budget
+from autoplacement.checkpoint import Checkpoint
+from autoplacement.constraints import PlacementConstraints
+from autoplacement.metrics import compute_layout_metrics
+from autoplacement.registry import LazyAutoPlacement
+from autoplacement.utils import compute_total_weighted_length
+from exporter import export_many
+from importers import NET_MODELS, NetlistImporter
+from models import SchemaData
+from serializer import SchemaSerializer
+
+
+def find_algorithm(key: str) -> Optional[AbstractAutoPlacement]:
+    """
+    Ищет алгоритм по номеру в списке (с 1) или по точному названию.
+    """
+    if key.isdigit() and 1 <= int(key) <= len(AUTO_PLACEMENT_ALGORITHMS):
+        return AUTO_PLACEMENT_ALGORITHMS[int(key) - 1]
+    for algorithm in AUTO_PLACEMENT_ALGORITHMS:
+        if algorithm.get_name() == key:
+            return algorithm
+    return None
+
+
+def place_file(algorithm: AbstractAutoPlacement, filename: str, output_dir: str,
+               time_limit: Optional[float], max_iterations: Optional[int],
+               checkpoint_interval: Optional[float] = None, net_model: str = "auto",
+               render: Optional[str] = None, render_jobs: Optional[List[Tuple[SchemaData, str]]] = None,
+               constraints: Optional[PlacementConstraints] = None) -> dict:
+    """
+    Размещает одну схему и возвращает сводку результата.
+    Файлы списков цепей (.hgr, .nets) импортируются, цепи раскрываются способом net_model.
+    Если задан render ("svg" или "png"), задания на отрисовку всех вариантов добавляются
+    в render_jobs (изображения строятся потом, параллельно для всех схем).
+    Если задан checkpoint_interval, состояние алгоритма периодически сохраняется рядом
+    со схемой, и повторный запуск после прерывания продолжает работу с него.
+    Ограничения размещения constraints проверяются по схеме до запуска алгоритма.
+    """
+    if NetlistImporter.is_netlist(filename):
+        schema_data = NetlistImporter.import_file(filename, net_model)
+    else:
+        schema_data = SchemaSerializer.deserialize(filename)
+    if schema_data is None:
+        return {"file": filename, "error": "не удалось открыть файл"}
+    if constraints is not None:
+        try:
+            constraints.validate(schema_data)
+        except ValueError as e:
+            return {"file": filename, "error": f"ограничения размещения недопустимы: {e}"}
+    tab_name = os.path.splitext(os.path.basename(filename))[0]
+    budget = Budget(time_limit=time_limit, max_iterations=max_iterations)
+    checkpoint = None
+    if checkpoint_interval is not None:
+        checkpoint = Checkpoint.for_schema(filename, algorithm.get_name(), checkpoint_interval)
+    variants = algorithm.run(schema_data, tab_name, budget, checkpoint, constraints)
+    result = {
+        "file": filename,
+        "algorithm": algorithm.get_name(),
+        "initial_length": compute_total_weighted_length(schema_data),
+        "elapsed": round(budget.elapsed(), 3),
+        "trace": [[round(seconds, 3), cost] for seconds, cost in budget.trace],
+    }
+    if not variants:
+        result["error"] = "алгоритм не вернул ни одного варианта"
+        return result
+    new_schema, _ = variants[0]
+    output = os.path.join(output_dir, f"{tab_name}.placed.json")
+    SchemaSerializer.serialize(new_schema, output)
+    result["output"] = output
+    result["total_length"] = compute_total_weighted_length(new_schema)
+    result["metrics"] = compute_layout_metrics(new_schema).to_dict()
+    if render and render_jobs is not None:
+        images = [os.path.join(output_dir, f"{tab_name}.placed.{k}.{render}") for k in range(1, len(variants) + 1)]
+        render_jobs.extend((variant, image) for (variant, _), image in zip(variants, images))
+        result["images"] = images
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Пакетное авторазмещение схем")
+    parser.add_argument("files", nargs="*", help="файлы схем (JSON) или списков цепей (.hgr, .nets)")
+    parser.add_argument("-a", "--algorithm", default="1", help="номер или название алгоритма")
+    parser.add_argument("-t", "--time-limit", type=float, help="ограничение времени на схему, с")
+    parser.add_argument("-n", "--iterations", type=int, help="ограничение числа итераций на схему")
+    parser.add_argument("-o", "--output-dir", default=".", help="каталог для результатов")
+    parser.add_argument("-c", "--checkpoint-interval", type=float,
+                        help="интервал сохранения контрольной точки рядом со схемой, с")
+    parser.add_argument("-m", "--net-model", choices=NET_MODELS, default="auto",
+                        help="раскрытие цепей при импорте: клика, звезда или auto")
+    parser.add_argument("-r", "--render", choices=("svg", "png"),
+                        help="сохранить изображения всех вариантов размещения")
+    parser.add_argument("-w", "--workers", type=int,
+                        help="число рабочих процессов (для алгоритмов с параллельным режимом)")
+    parser.add_argument("--constraints",
+                        help="файл JSON с ограничениями размещения (закреплённые элементы, запреты, области)")
+    parser.add_argument("--list", action="store_true", help="показать список алгоритмов")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.list:
+        for number, algorithm in enumerate(AUTO_PLACEMENT_ALGORITHMS, start=1):
+            print(f"{number}. {algorithm.get_name()}")
+        return 0
+    algorithm = find_algorithm(args.algorithm)
+    if algorithm is None:
+        print(f"Алгоритм не найден: {args.algorithm}", file=sys.stderr)
+        return 2
+    if args.workers and isinstance(algorithm, LazyAutoPlacement):
+        algorithm = algorithm.configure(workers=args.workers)
+    constraints = None
+    if args.constraints:
+        try:
+            constraints = PlacementConstraints.load(args.constraints)
+        except (OSError, ValueError) as e:
+            print(f"Не удалось загрузить ограничения: {e}", file=sys.stderr)
+            return 2
+    os.makedirs(args.output_dir, exist_ok=True)
+    status = 0
+    render_jobs: List[Tuple[SchemaData, str]] = []
+    for filename in args.files:
+        result = place_file(algorithm, filename, args.output_dir, args.time_limit, args.iterations,
+                            args.checkpoint_interval, args.net_model, args.render, render_jobs, constraints)
+        if "error" in result:
+            status = 1
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+    for (_, image), error in zip(render_jobs, export_many(render_jobs)):
+        if error is not None:
+            status = 1
+            print(f"Не удалось сохранить {image}: {error}", file=sys.stderr)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
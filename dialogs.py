@@ -0,0 +1,54 @@
+"""
+dialogs.py
+Модуль с интерфейсом пользовательских диалогов для ядра приложения.
+
+Ядро (модели, сериализация, алгоритмы авторазмещения) не импортирует tkinter:
+все вопросы и сообщения пользователю идут через get_dialogs().
+Графический интерфейс при запуске устанавливает свою реализацию через set_dialogs()
+(см. tkdialogs.TkDialogs), а без неё (пакетный запуск, рабочие процессы)
+используется Dialogs, который пишет сообщения в журнал и не задаёт вопросов.
+"""
+
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Dialogs:
+    """
+    Dialogs – реализация диалогов без графического интерфейса.
+
+    Вопросы получают пустой ответ (как если бы пользователь ничего не ввёл),
+    сообщения записываются в журнал.
+    """
+
+    def ask_string(self, title: str, prompt: str) -> Optional[str]:
+        return ""
+
+    def show_info(self, title: str, message: str) -> None:
+        logger.info(f"{title}: {message}")
+
+    def show_warning(self, title: str, message: str) -> None:
+        logger.warning(f"{title}: {message}")
+
+    def show_error(self, title: str, message: str) -> None:
+        logger.error(f"{title}: {message}")
+
+
+_dialogs: Dialogs = Dialogs()
+
+
+def set_dialogs(dialogs: Dialogs) -> None:
+    """
+    Устанавливает реализацию диалогов для всего процесса.
+    """
+    global _dialogs
+    _dialogs = dialogs
+
+
+def get_dialogs() -> Dialogs:
+    """
+    Возвращает текущую реализацию диалогов.
+    """
+    return _dialogs
@@ -0,0 +1,127 @@
+"""
+drawing.py
+Геометрия отрисовки схемы, общая для редактора (Tk) и экспорта (SVG/PNG).
+Модуль не зависит от tkinter.
+"""
+
+import math
+import random
+from typing import Iterator, Optional, Tuple
+
+
+class DrawingStyle:
+    """
+    DrawingStyle – размеры и отступы, с которыми схема рисуется на холсте.
+
+    Attributes:
+        square_size (int): Сторона квадрата узла.
+        font_size (int): Размер шрифта подписей узлов.
+        line_width (int): Толщина линий связей.
+        base_x, base_y (int): Координаты центра первой ячейки.
+        spacing_x, spacing_y (int): Шаг сетки.
+    """
+
+    def __init__(self, square_size: int = 50, font_size: int = 10, line_width: int = 2,
+                 base_x: int = 100, base_y: int = 100, spacing_x: int = 100, spacing_y: int = 100) -> None:
+        self.square_size = square_size
+        self.font_size = font_size
+        self.line_width = line_width
+        self.base_x = base_x
+        self.base_y = base_y
+        self.spacing_x = spacing_x
+        self.spacing_y = spacing_y
+
+    def node_position(self, grid_position: int, cols: int) -> Tuple[int, int]:
+        """
+        Центр ячейки с номером grid_position (с 1).
+        """
+        index = grid_position - 1
+        col = index % cols
+        row = index // cols
+        return (self.base_x + col * self.spacing_x, self.base_y + row * self.spacing_y)
+
+
+def cells_along(x1: float, y1: float, x2: float, y2: float, style: DrawingStyle,
+                cols: int, rows: int) -> Iterator[Tuple[int, int]]:
+    """
+    Ячейки сетки (строка, колонка), через которые проходит отрезок: для каждой полосы строк
+    берётся диапазон колонок, занимаемый отрезком внутри полосы. Квадрат узла не выходит
+    за пределы своей ячейки, поэтому связь может пересекать только узлы в этих ячейках.
+    """
+    sx, sy = style.spacing_x, style.spacing_y
+
+    def row_of(y: float) -> int:
+        return math.floor((y - style.base_y) / sy + 0.5)
+
+    def col_of(x: float) -> int:
+        return math.floor((x - style.base_x) / sx + 0.5)
+
+    low_y, high_y = min(y1, y2), max(y1, y2)
+    for r in range(max(0, row_of(low_y)), min(rows - 1, row_of(high_y)) + 1):
+        if y1 == y2:
+            xa, xb = x1, x2
+        else:
+            band_top = style.base_y + (r - 0.5) * sy
+            ya = max(low_y, band_top)
+            yb = min(high_y, band_top + sy)
+            xa = x1 + (x2 - x1) * (ya - y1) / (y2 - y1)
+            xb = x1 + (x2 - x1) * (yb - y1) / (y2 - y1)
+        for c in range(max(0, col_of(min(xa, xb))), min(cols - 1, col_of(max(xa, xb))) + 1):
+            yield r, c
+
+
+def closest_edge_position(xA: int, yA: int, xB: int, yB: int, half: int) -> Tuple[int, int]:
+    """
+    Точка на стороне квадрата узла A (центр (xA, yA)), обращённой к узлу B.
+    """
+    dx = xB - xA
+    dy = yB - yA
+    if abs(dx) > abs(dy):
+        return (xA + half, yA) if dx > 0 else (xA - half, yA)
+    else:
+        return (xA, yA + half) if dy > 0 else (xA, yA - half)
+
+
+def line_rect_intersection(x1: float, y1: float, x2: float, y2: float,
+                           rx1: float, ry1: float, rx2: float, ry2: float
+                           ) -> Optional[Tuple[float, float, float, float]]:
+    """
+    Участок отрезка внутри прямоугольника (алгоритм Лианга – Барски) или None.
+    """
+    dx = x2 - x1
+    dy = y2 - y1
+    u1 = 0.0
+    u2 = 1.0
+    p = [-dx, dx, -dy, dy]
+    q = [x1 - rx1, rx2 - x1, y1 - ry1, ry2 - y1]
+    for i in range(4):
+        if p[i] == 0:
+            if q[i] < 0:
+                return None
+        else:
+            t = q[i] / p[i]
+            if p[i] < 0:
+                u1 = max(u1, t)
+            else:
+                u2 = min(u2, t)
+    if u1 > u2:
+        return None
+    return (x1 + u1 * dx, y1 + u1 * dy, x1 + u2 * dx, y1 + u2 * dy)
+
+
+def lighten_color(hex_color: str, factor: float) -> str:
+    hex_color = hex_color.lstrip('#')
+    r = int(hex_color[0:2], 16)
+    g = int(hex_color[2:4], 16)
+    b = int(hex_color[4:6], 16)
+    r = int(r + (255 - r) * factor)
+    g = int(g + (255 - g) * factor)
+    b = int(b + (255 - b) * factor)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def random_edge_color(rng=random) -> str:
+    """
+    Тёмный цвет связи (компоненты от 0 до 150).
+    """
+    return f"#{rng.randint(0, 150):02x}{rng.randint(0, 150):02x}{rng.randint(0, 150):02x}"
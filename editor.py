@@ -4,12 +4,19 @@ editor.py
 """
 
 import math
-import random
 import tkinter as tk
+from itertools import islice
 from tkinter import simpledialog, messagebox
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
-from models import Node, SchemaData
+from autoplacement.constraints import PlacementConstraints
+from drawing import (DrawingStyle, cells_along, closest_edge_position, lighten_color, line_rect_intersection,
+                     random_edge_color)
+from history import Change, ChangeGroup, EdgeChange, History, PlacementChange
+from models import Node, SchemaData, iter_edges
+
+# Сколько объектов (узлов или связей) рисуется за один шаг поэтапной отрисовки
+RENDER_CHUNK = 500
 
 
 class SchemaEditor:
@@ -31,6 +38,12 @@ class SchemaEditor:
       edges (List[Tuple[int, int, int, int, int]]): Список рёбер, каждый кортеж содержит
             (edge_obj, label_id, node1, node2, weight).
       selected_nodes (List[int]): Список выбранных узлов (element_number).
+      history (History): История изменений для отмены и повтора действий.
+      node_at (Dict[Tuple[int, int], int]): Узел в ячейке (строка, колонка) – для поиска узлов под связью.
+      dirty_nodes (Set[int]): Элементы, у которых менялись связи после последнего размещения
+            (для доразмещения, см. IncrementalPlacement).
+      constraints (Optional[PlacementConstraints]): Ограничения размещения, загруженные для схемы
+            (передаются алгоритмам авторазмещения).
     """
 
     def __init__(self, parent: tk.Widget, schema_data: Optional[SchemaData] = None,
@@ -46,11 +59,21 @@ class SchemaEditor:
         self.selected_nodes: List[int] = []
         self.edge_positions: Dict[Tuple[int, int], Tuple[int, int]] = {}
         self.edge_original_colors: Dict[int, str] = {}
+        self.history: History = History()
+        self.node_at: Dict[Tuple[int, int], int] = {}
+        self.dirty_nodes: Set[int] = set()
+        self.constraints: Optional[PlacementConstraints] = None
+        # Поэтапная отрисовка: оставшиеся шаги и запланированный вызов after()
+        self._render_steps: Optional[Iterator[None]] = None
+        self._render_job: Optional[str] = None
 
         self.base_x = 100
         self.base_y = 100
         self.spacing_x = 100
         self.spacing_y = 100
+        # Те же размеры используются при экспорте схемы (exporter.py)
+        self.style = DrawingStyle(square_size, font_size, line_width,
+                                  self.base_x, self.base_y, self.spacing_x, self.spacing_y)
 
         self.create_canvas()
 
@@ -84,23 +107,152 @@ class SchemaEditor:
         self.cols = schema_data.cols
         self.rows = schema_data.rows
         self.edges.clear()
+        # Новая схема – прежняя история к ней не относится
+        self.history.clear()
+        self.dirty_nodes.clear()
+        # Ограничения относятся к прежней схеме
+        self.constraints = None
         self.create_graph()
 
     def set_adjacency_matrix(self, new_matrix: List[List[int]]) -> None:
         self.adjacency_matrix = new_matrix
         self.edges.clear()
+        self.history.clear()
+        self.dirty_nodes.clear()
+        self.create_graph()
+
+    def set_placement(self, schema_data: SchemaData) -> None:
+        """
+        Переносит размещение узлов из schema_data в текущую схему (с возможностью отмены).
+        """
+        change = PlacementChange.between(self.nodes, schema_data.nodes)
+        change.apply(self)
+        self.history.record(change)
+        # Новое размещение учитывает текущие связи
+        self.dirty_nodes.clear()
+        self.edges.clear()
+        self.create_graph()
+
+    def clear_edges(self) -> None:
+        """
+        Удаляет все связи одним действием (с возможностью отмены).
+        """
+        change = ChangeGroup(EdgeChange(i + 1, j + 1, weight, 0)
+                             for i, j, weight in list(iter_edges(self.adjacency_matrix)))
+        change.apply(self)
+        self.history.record(change)
+        self.mark_dirty(change)
+        self.edges.clear()
         self.create_graph()
 
+    def undo(self) -> None:
+        change = self.history.undo(self)
+        if change is not None:
+            self.mark_dirty(change)
+            self.refresh_changed(change)
+
+    def redo(self) -> None:
+        change = self.history.redo(self)
+        if change is not None:
+            self.mark_dirty(change)
+            self.refresh_changed(change)
+
+    def mark_dirty(self, change: Change) -> None:
+        """
+        Запоминает элементы, у которых изменение затронуло связи.
+        """
+        for n1, n2 in change.edges():
+            self.dirty_nodes.add(n1)
+            self.dirty_nodes.add(n2)
+
+    def refresh_changed(self, change: Change) -> None:
+        """
+        Перерисовывает то, что затронуто изменением: при перемещении узлов – всю схему,
+        иначе только изменённые связи.
+        """
+        if change.nodes():
+            self.edges.clear()
+            self.create_graph()
+            return
+        for n1, n2 in change.edges():
+            self.remove_edge_items(n1, n2)
+            weight = self.adjacency_matrix[n1 - 1][n2 - 1]
+            if weight > 0 and n1 in self.nodes and n2 in self.nodes:
+                self.create_edge_from_matrix(self.nodes[n1], self.nodes[n2], weight)
+
+    def remove_edge_items(self, n1: int, n2: int) -> None:
+        """
+        Удаляет с холста линию, метку веса и пунктирные участки связи n1–n2.
+        """
+        for edge in [e for e in self.edges if {e[2], e[3]} == {n1, n2}]:
+            edge_obj, label_id = edge[0], edge[1]
+            self.canvas.delete(edge_obj)
+            self.canvas.delete(label_id)
+            self.edge_original_colors.pop(edge_obj, None)
+            self.edges.remove(edge)
+        self.canvas.delete(self._edge_tag(n1, n2))
+        self.edge_positions.pop((n1, n2), None)
+        self.edge_positions.pop((n2, n1), None)
+
+    @staticmethod
+    def _edge_tag(n1: int, n2: int) -> str:
+        return f"edge_{min(n1, n2)}_{max(n1, n2)}"
+
     def create_graph(self) -> None:
+        """
+        Перерисовывает схему. Объекты рисуются шагами по RENDER_CHUNK через after(),
+        поэтому большая схема появляется постепенно и окно не блокируется;
+        небольшая схема рисуется сразу целиком.
+        """
+        self.cancel_render()
         self.canvas.delete("all")
-        for node in self.nodes.values():
+        self.edge_positions.clear()
+        cols = max(self.cols, 1)
+        self.node_at = {}
+        for element, node in self.nodes.items():
+            index = node.grid_position - 1
+            self.node_at[(index // cols, index % cols)] = element
+        # Пока схема рисуется, область прокрутки охватывает всю сетку
+        self.canvas.configure(scrollregion=(0, 0, 2 * self.base_x + (cols - 1) * self.spacing_x,
+                                            2 * self.base_y + (max(self.rows, 1) - 1) * self.spacing_y))
+        self._render_steps = self._render_items()
+        self._render_step()
+
+    def _render_items(self) -> Iterator[None]:
+        for node in list(self.nodes.values()):
             self.add_node(node)
-        for i, row in enumerate(self.adjacency_matrix):
-            for j, weight in enumerate(row):
-                if j > i and weight > 0:
-                    if (i + 1) in self.nodes and (j + 1) in self.nodes:
-                        self.create_edge_from_matrix(self.nodes[i + 1], self.nodes[j + 1], weight)
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+            yield
+        for i, j, _ in iter_edges(self.adjacency_matrix):
+            n1, n2 = i + 1, j + 1
+            if n1 not in self.nodes or n2 not in self.nodes:
+                continue
+            # Во время отрисовки схему могут изменить: уже нарисованные (добавленные пользователем)
+            # связи пропускаются, вес берётся из матрицы в момент рисования
+            if (n1, n2) in self.edge_positions or (n2, n1) in self.edge_positions:
+                continue
+            weight = self.adjacency_matrix[i][j]
+            if weight > 0:
+                self.create_edge_from_matrix(self.nodes[n1], self.nodes[n2], weight)
+                yield
+
+    def _render_step(self) -> None:
+        self._render_job = None
+        if self._render_steps is None:
+            return
+        if sum(1 for _ in islice(self._render_steps, RENDER_CHUNK)) == RENDER_CHUNK:
+            self._render_job = self.canvas.after(1, self._render_step)
+        else:
+            self._render_steps = None
+            self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+
+    def cancel_render(self) -> None:
+        """
+        Останавливает незавершённую поэтапную отрисовку.
+        """
+        if self._render_job is not None:
+            self.canvas.after_cancel(self._render_job)
+            self._render_job = None
+        self._render_steps = None
 
     def add_node(self, node: Node) -> None:
         x, y = self.compute_node_position(node)
@@ -115,12 +267,7 @@ class SchemaEditor:
         )
 
     def compute_node_position(self, node: Node) -> Tuple[int, int]:
-        index = node.grid_position - 1
-        col = index % self.cols
-        row = index // self.cols
-        x = self.base_x + col * self.spacing_x
-        y = self.base_y + row * self.spacing_y
-        return (x, y)
+        return self.style.node_position(node.grid_position, self.cols)
 
     def select_node(self, event: tk.Event) -> None:
         click_x = self.canvas.canvasx(event.x)
@@ -146,15 +293,17 @@ class SchemaEditor:
             return
         weight: Optional[int] = simpledialog.askinteger("Вес связи", "Введите вес связи:")
         if weight is not None:
-            self.adjacency_matrix[n1 - 1][n2 - 1] = weight
-            self.adjacency_matrix[n2 - 1][n1 - 1] = weight
+            change = EdgeChange(n1, n2, self.adjacency_matrix[n1 - 1][n2 - 1], weight)
+            change.apply(self)
+            self.history.record(change)
+            self.mark_dirty(change)
             self.create_edge_from_matrix(self.nodes[n1], self.nodes[n2], weight)
         self.selected_nodes.clear()
 
     def create_edge_from_matrix(self, node1: Node, node2: Node, weight: int) -> None:
         x1, y1 = self.get_closest_edge_position(node1, node2)
         x2, y2 = self.get_closest_edge_position(node2, node1)
-        base_color: str = f"#{random.randint(0, 150):02x}{random.randint(0, 150):02x}{random.randint(0, 150):02x}"
+        base_color: str = random_edge_color()
         edge_obj: int = self.canvas.create_line(x1, y1, x2, y2, width=self.line_width, fill=base_color)
         self.edge_original_colors[edge_obj] = base_color
         text_x: int = (x1 + x2) // 2
@@ -165,10 +314,12 @@ class SchemaEditor:
         label_id: int = self.canvas.create_window(text_x, text_y, window=label)
         self.edges.append((edge_obj, label_id, node1.element_number, node2.element_number, weight))
         self.edge_positions[(node1.element_number, node2.element_number)] = (text_x, text_y)
-        for element, node in self.nodes.items():
-            if element in (node1.element_number, node2.element_number):
+        # Пунктир там, где связь проходит над чужим узлом (проверяются только ячейки вдоль связи)
+        for cell in cells_along(x1, y1, x2, y2, self.style, max(self.cols, 1), max(self.rows, 1)):
+            element = self.node_at.get(cell)
+            if element is None or element in (node1.element_number, node2.element_number):
                 continue
-            nx, ny = self.compute_node_position(node)
+            nx, ny = self.compute_node_position(self.nodes[element])
             half = self.square_size // 2
             rx1: int = nx - half
             ry1: int = ny - half
@@ -182,54 +333,20 @@ class SchemaEditor:
                 dashed_color: str = self._lighten_color(base_color, 0.3)
                 self.canvas.create_line(ix1, iy1, ix2, iy2,
                                         width=self.line_width,
-                                        fill=dashed_color, dash=(5, 5))
+                                        fill=dashed_color, dash=(5, 5),
+                                        tags=self._edge_tag(node1.element_number, node2.element_number))
 
     def get_closest_edge_position(self, nodeA: Node, nodeB: Node) -> Tuple[int, int]:
         xA, yA = self.compute_node_position(nodeA)
         xB, yB = self.compute_node_position(nodeB)
-        half: int = self.square_size // 2
-        dx: int = xB - xA
-        dy: int = yB - yA
-        if abs(dx) > abs(dy):
-            return (xA + half, yA) if dx > 0 else (xA - half, yA)
-        else:
-            return (xA, yA + half) if dy > 0 else (xA, yA - half)
+        return closest_edge_position(xA, yA, xB, yB, self.square_size // 2)
 
     def get_line_rect_intersection(self, x1: float, y1: float, x2: float, y2: float,
                                    rx1: float, ry1: float, rx2: float, ry2: float) -> Optional[Tuple[float, float, float, float]]:
-        dx: float = x2 - x1
-        dy: float = y2 - y1
-        u1: float = 0.0
-        u2: float = 1.0
-        p: List[float] = [-dx, dx, -dy, dy]
-        q: List[float] = [x1 - rx1, rx2 - x1, y1 - ry1, ry2 - y1]
-        for i in range(4):
-            if p[i] == 0:
-                if q[i] < 0:
-                    return None
-            else:
-                t: float = q[i] / p[i]
-                if p[i] < 0:
-                    u1 = max(u1, t)
-                else:
-                    u2 = min(u2, t)
-        if u1 > u2:
-            return None
-        ix1: float = x1 + u1 * dx
-        iy1: float = y1 + u1 * dy
-        ix2: float = x1 + u2 * dx
-        iy2: float = y1 + u2 * dy
-        return (ix1, iy1, ix2, iy2)
+        return line_rect_intersection(x1, y1, x2, y2, rx1, ry1, rx2, ry2)
 
     def _lighten_color(self, hex_color: str, factor: float) -> str:
-        hex_color = hex_color.lstrip('#')
-        r: int = int(hex_color[0:2], 16)
-        g: int = int(hex_color[2:4], 16)
-        b: int = int(hex_color[4:6], 16)
-        r = int(r + (255 - r) * factor)
-        g = int(g + (255 - g) * factor)
-        b = int(b + (255 - b) * factor)
-        return f"#{r:02x}{g:02x}{b:02x}"
+        return lighten_color(hex_color, factor)
 
     def highlight_edges(self, node_label: Optional[int] = None) -> None:
         for edge_obj, label_id, n1, n2, _ in self.edges:
@@ -251,13 +368,11 @@ class SchemaEditor:
             dist: float = self.dist_point_segment(px, py, x1, y1, x2, y2)
             if dist <= TOL:
                 if tk.messagebox.askyesno("Подтверждение", f"Удалить связь между {n1} и {n2} (вес {weight})?"):
-                    self.canvas.delete(edge_obj)
-                    self.canvas.delete(label_id)
-                    self.edges.remove((edge_obj, label_id, n1, n2, weight))
-                    self.adjacency_matrix[n1 - 1][n2 - 1] = 0
-                    self.adjacency_matrix[n2 - 1][n1 - 1] = 0
-                    if (n1, n2) in self.edge_positions:
-                        del self.edge_positions[(n1, n2)]
+                    change = EdgeChange(n1, n2, self.adjacency_matrix[n1 - 1][n2 - 1], 0)
+                    change.apply(self)
+                    self.history.record(change)
+                    self.mark_dirty(change)
+                    self.remove_edge_items(n1, n2)
                 return
         found_node: Optional[int] = None
         for element, node in self.nodes.items():
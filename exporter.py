@@ -0,0 +1,157 @@
+"""
+exporter.py
+Экспорт размещения схемы в SVG (и PNG) без графического интерфейса.
+
+Изображение повторяет вид редактора: квадраты узлов с номером и позицией, связи
+с метками веса и пунктирные участки там, где связь проходит над чужим узлом.
+SVG записывается в файл по мере формирования, без построения документа в памяти.
+Для PNG нужен необязательный пакет cairosvg.
+"""
+
+import io
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from drawing import (DrawingStyle, cells_along, closest_edge_position, lighten_color, line_rect_intersection,
+                     random_edge_color)
+from models import SchemaData, iter_edges
+
+# Поддерживаемые форматы экспорта (расширения файлов)
+EXPORT_FORMATS = (".svg", ".png")
+
+
+def write_svg(schema_data: SchemaData, out: TextIO, style: Optional[DrawingStyle] = None,
+              seed: int = 0) -> None:
+    """
+    Записывает схему в поток out в формате SVG.
+    Цвета связей выбираются генератором с зерном seed, поэтому результат воспроизводим.
+    """
+    style = style or DrawingStyle()
+    cols, rows = max(schema_data.cols, 1), max(schema_data.rows, 1)
+    half = style.square_size // 2
+    width = 2 * style.base_x + (cols - 1) * style.spacing_x
+    height = 2 * style.base_y + (rows - 1) * style.spacing_y
+    out.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    out.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+              f'viewBox="0 0 {width} {height}">\n')
+    out.write(f'<rect width="{width}" height="{height}" fill="white"/>\n')
+
+    # Центры узлов и индекс «ячейка -> узел» для поиска узлов под связью
+    centers: Dict[int, Tuple[int, int]] = {}
+    node_at: Dict[Tuple[int, int], int] = {}
+    out.write(f'<g font-family="Arial" font-size="{style.font_size}" text-anchor="middle">\n')
+    for number, node in schema_data.nodes.items():
+        x, y = style.node_position(node.grid_position, cols)
+        centers[number] = (x, y)
+        index = node.grid_position - 1
+        node_at[(index // cols, index % cols)] = number
+        out.write(f'<rect x="{x - half}" y="{y - half}" width="{style.square_size}" '
+                  f'height="{style.square_size}" fill="white" stroke="black" stroke-width="3"/>')
+        out.write(f'<text x="{x}" y="{y}"><tspan x="{x}" dy="-0.2em">№{number}</tspan>'
+                  f'<tspan x="{x}" dy="1.2em">П-{node.grid_position}</tspan></text>\n')
+    out.write('</g>\n')
+
+    edges = [(i + 1, j + 1, weight) for i, j, weight in iter_edges(schema_data.adjacency_matrix)
+             if i + 1 in centers and j + 1 in centers]
+
+    def edge_ends(n1: int, n2: int) -> Tuple[int, int, int, int]:
+        (xa, ya), (xb, yb) = centers[n1], centers[n2]
+        x1, y1 = closest_edge_position(xa, ya, xb, yb, half)
+        x2, y2 = closest_edge_position(xb, yb, xa, ya, half)
+        return x1, y1, x2, y2
+
+    # Первый проход: линии связей и пунктир над чужими узлами
+    rng = random.Random(seed)
+    out.write(f'<g stroke-width="{style.line_width}" fill="none">\n')
+    for n1, n2, _ in edges:
+        color = random_edge_color(rng)
+        x1, y1, x2, y2 = edge_ends(n1, n2)
+        out.write(f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" stroke="{color}"/>\n')
+        dashed = lighten_color(color, 0.3)
+        for cell in cells_along(x1, y1, x2, y2, style, cols, rows):
+            other = node_at.get(cell)
+            if other is None or other == n1 or other == n2:
+                continue
+            ox, oy = centers[other]
+            inter = line_rect_intersection(x1, y1, x2, y2, ox - half, oy - half, ox + half, oy + half)
+            if inter is not None:
+                ix1, iy1, ix2, iy2 = inter
+                out.write(f'<line x1="{ix1:.1f}" y1="{iy1:.1f}" x2="{ix2:.1f}" y2="{iy2:.1f}" '
+                          f'stroke="{dashed}" stroke-dasharray="5,5"/>\n')
+    out.write('</g>\n')
+
+    # Второй проход: метки веса поверх линий (цвета повторяются тем же зерном)
+    rng = random.Random(seed)
+    label_size = style.font_size + 2
+    out.write(f'<g font-family="Arial" font-size="{label_size}" font-weight="bold" text-anchor="middle">\n')
+    for n1, n2, weight in edges:
+        color = random_edge_color(rng)
+        x1, y1, x2, y2 = edge_ends(n1, n2)
+        tx, ty = (x1 + x2) // 2, (y1 + y2) // 2
+        text = str(weight)
+        box_w = len(text) * label_size * 0.7 + 4
+        box_h = label_size * 1.4
+        out.write(f'<rect x="{tx - box_w / 2:.1f}" y="{ty - box_h / 2:.1f}" width="{box_w:.1f}" '
+                  f'height="{box_h:.1f}" fill="lightgray"/>'
+                  f'<text x="{tx}" y="{ty}" dy="0.35em" fill="{color}">{text}</text>\n')
+    out.write('</g>\n</svg>\n')
+
+
+def export_svg(schema_data: SchemaData, filename: str, style: Optional[DrawingStyle] = None,
+               seed: int = 0) -> None:
+    with open(filename, "w", encoding="utf-8", buffering=1 << 16) as f:
+        write_svg(schema_data, f, style, seed)
+
+
+def export_png(schema_data: SchemaData, filename: str, style: Optional[DrawingStyle] = None,
+               seed: int = 0) -> None:
+    """
+    Экспорт в PNG через SVG; требуется пакет cairosvg.
+    """
+    try:
+        import cairosvg
+    except ImportError:
+        raise RuntimeError("Для экспорта в PNG установите пакет cairosvg.") from None
+    buffer = io.StringIO()
+    write_svg(schema_data, buffer, style, seed)
+    cairosvg.svg2png(bytestring=buffer.getvalue().encode("utf-8"), write_to=filename)
+
+
+def export_file(schema_data: SchemaData, filename: str, style: Optional[DrawingStyle] = None,
+                seed: int = 0) -> None:
+    """
+    Экспорт в формат, определяемый расширением файла (.svg или .png).
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".png":
+        export_png(schema_data, filename, style, seed)
+    elif extension == ".svg":
+        export_svg(schema_data, filename, style, seed)
+    else:
+        raise ValueError(f"Неизвестный формат экспорта: {extension}")
+
+
+def _export_job(job: Tuple[SchemaData, str, Optional[DrawingStyle], int]) -> Optional[str]:
+    schema_data, filename, style, seed = job
+    try:
+        export_file(schema_data, filename, style, seed)
+        return None
+    except Exception as e:
+        return str(e)
+
+
+def export_many(jobs: List[Tuple[SchemaData, str]], style: Optional[DrawingStyle] = None,
+                seed: int = 0, workers: Optional[int] = None) -> List[Optional[str]]:
+    """
+    Экспортирует много схем (например, варианты размещения) параллельно в отдельных процессах.
+    Возвращает для каждого задания None или текст ошибки.
+    """
+    tasks = [(schema_data, filename, style, seed) for schema_data, filename in jobs]
+    workers = min(len(tasks), workers or os.cpu_count() or 1)
+    if workers <= 1:
+        return [_export_job(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return list(executor.map(_export_job, tasks))
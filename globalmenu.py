@@ -3,30 +3,62 @@ globalmenu.py
 Модуль с классом GlobalMenu для управления глобальным меню приложения.
 """
 
+import logging
 import os
 import tkinter as tk
 from tkinter import simpledialog, messagebox, filedialog
-from typing import Optional, List, Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from autoplacement import AUTO_PLACEMENT_ALGORITHMS
 from autoplacement.AbstractAutoPlacement import AbstractAutoPlacement
+from autoplacement.IncrementalPlacement import IncrementalPlacement
+from autoplacement.PortfolioPlacement import DEFAULT_TIME_LIMIT, PortfolioPlacement
+from autoplacement.budget import Budget
+from autoplacement.checkpoint import Checkpoint
+from autoplacement.constraints import PlacementConstraints, resolve_constraints
+from autoplacement.metrics import compute_layout_metrics
+from autoplacement.registry import LazyAutoPlacement
 from autoplacement.utils import compute_total_weighted_length
 
 from editor import SchemaEditor
-from models import SchemaData, Node
+from exporter import export_file
+from importers import NetlistImporter
+from models import SchemaData, Node, TriangularAdjacencyMatrix
+from progresswindow import ProgressWindow
 from serializer import SchemaSerializer
 from tabmanager import TabManager
 
+logger = logging.getLogger(__name__)
+
+
+class _BackgroundBudget(Budget):
+    """
+    Бюджет алгоритма, выполняемого в фоновом потоке: проверка expired() сообщает
+    окну хода долю истёкшего времени, а кнопка «Отмена» исчерпывает бюджет.
+    """
+
+    def __init__(self, time_limit: float, progress: Callable[[float], None], cancelled: Any) -> None:
+        super().__init__(time_limit=time_limit)
+        self.progress = progress
+        self.cancelled = cancelled
+
+    def expired(self) -> bool:
+        self.progress(min(1.0, self.elapsed() / self.time_limit))
+        return self.cancelled.is_set() or super().expired()
+
 
 class GlobalMenu:
     """
     GlobalMenu реализует глобальное меню приложения.
     """
     def __init__(self, master: tk.Tk, tab_manager: TabManager) -> None:
+        self.master: tk.Tk = master
         self.tab_manager: TabManager = tab_manager
         # Флаг: если True, после авторазмещения создаётся новая вкладка с новым размещением,
         # иначе текущая схема обновляется.
         self.new_tab_after_autoplacement: bool = True
+        # Ограничение времени работы алгоритмов авторазмещения в секундах (None – без ограничения)
+        self.time_limit: Optional[float] = None
 
         menu_bar: tk.Menu = tk.Menu(master)
         master.config(menu=menu_bar)
@@ -35,21 +67,35 @@ class GlobalMenu:
         file_menu.add_command(label="Открыть", command=self.open_file)
         file_menu.add_command(label="Сохранить", command=self.save_file)
         file_menu.add_command(label="Сохранить как", command=self.save_as_file)
+        file_menu.add_separator()
+        file_menu.add_command(label="Импорт списка цепей...", command=self.import_netlist)
+        file_menu.add_command(label="Экспорт изображения...", command=self.export_image)
         menu_bar.add_cascade(label="Файл", menu=file_menu)
 
         edit_menu: tk.Menu = tk.Menu(menu_bar, tearoff=0)
+        edit_menu.add_command(label="Отменить", accelerator="Ctrl+Z", command=self.undo)
+        edit_menu.add_command(label="Повторить", accelerator="Ctrl+Y", command=self.redo)
+        edit_menu.add_separator()
         edit_menu.add_command(label="Удалить все связи", command=self.clear_edges)
         edit_menu.add_command(label="Новая схема", command=self.new_schema)
         menu_bar.add_cascade(label="Изменить", menu=edit_menu)
+        master.bind_all("<Control-z>", lambda event: self.undo())
+        master.bind_all("<Control-y>", lambda event: self.redo())
 
         # Динамическое добавление пунктов для авторазмещения
         auto_menu: tk.Menu = tk.Menu(menu_bar, tearoff=0)
         for algo in AUTO_PLACEMENT_ALGORITHMS:
             auto_menu.add_command(label=algo.get_name(), command=lambda a=algo: self.run_auto_placement(a))
+        auto_menu.add_separator()
+        auto_menu.add_command(label="Доразмещение изменённых элементов", command=self.run_incremental_placement)
+        auto_menu.add_command(label="Ограничения размещения...", command=self.load_constraints)
+        auto_menu.add_command(label="Сбросить ограничения размещения", command=self.reset_constraints)
+        auto_menu.add_command(label="Ограничение времени...", command=self.set_time_limit)
         menu_bar.add_cascade(label="Авторазмещение", menu=auto_menu)
 
         stats_menu: tk.Menu = tk.Menu(menu_bar, tearoff=0)
         stats_menu.add_command(label="Суммарная длина связей", command=self.show_total_length)
+        stats_menu.add_command(label="Показатели качества размещения", command=self.show_layout_metrics)
         menu_bar.add_cascade(label="Статистика", menu=stats_menu)
 
         help_menu: tk.Menu = tk.Menu(menu_bar, tearoff=0)
@@ -66,24 +112,76 @@ class GlobalMenu:
         filename: str = filedialog.askopenfilename(title="Открыть файл",
                                                     filetypes=[("JSON файлы", "*.json"), ("Все файлы", "*.*")])
         if filename:
-            schema_data: Optional[SchemaData] = SchemaSerializer.deserialize(filename)
-            if schema_data:
+            base_name: str = os.path.basename(filename)
+            current_tab: str = self.tab_manager.notebook.select()
+
+            def loaded(schema_data: SchemaData) -> None:
+                # Схема появляется на холсте постепенно (см. SchemaEditor.create_graph)
                 editor.set_graph(schema_data)
                 editor.current_file = filename
                 # Обновляем имя вкладки на базовое имя файла
-                base_name: str = os.path.basename(filename)
-                current_tab: str = self.tab_manager.notebook.select()
                 self.tab_manager.notebook.tab(current_tab, text=base_name)
 
+            self.run_in_background("Открытие файла", f"Загрузка {base_name}...",
+                                   lambda progress, cancelled: SchemaSerializer.load(filename, progress, cancelled),
+                                   loaded, "Не удалось открыть файл")
+
+    def run_in_background(self, title: str, message: str,
+                          work: Callable[[Callable[[float], None], Any], Any],
+                          on_done: Callable[[Any], None], error_text: str) -> None:
+        """
+        Выполняет work(progress, cancelled) в фоновом потоке с окном хода и кнопкой отмены.
+        """
+        ProgressWindow(self.master, title, message, work, on_done,
+                       lambda e: messagebox.showerror("Ошибка", f"{error_text}:\n{e}"))
+
+    def import_netlist(self) -> None:
+        """
+        Импортирует схему из списка цепей (hMETIS .hgr, Bookshelf .nets).
+        """
+        editor: Optional[SchemaEditor] = self.get_current_editor()
+        if not editor:
+            return
+        filename: str = filedialog.askopenfilename(title="Импорт списка цепей",
+                                                    filetypes=[("Списки цепей", "*.hgr *.nets"),
+                                                               ("hMETIS", "*.hgr"),
+                                                               ("Bookshelf", "*.nets"),
+                                                               ("Все файлы", "*.*")])
+        if filename:
+            schema_data: Optional[SchemaData] = NetlistImporter.import_file(filename)
+            if schema_data:
+                editor.set_graph(schema_data)
+                # Импортированная схема сохраняется в JSON только через "Сохранить как"
+                editor.current_file = None
+                current_tab: str = self.tab_manager.notebook.select()
+                self.tab_manager.notebook.tab(current_tab, text=os.path.splitext(os.path.basename(filename))[0])
+
+    def export_image(self) -> None:
+        """
+        Сохраняет изображение текущей схемы в SVG или PNG (PNG – при установленном cairosvg).
+        """
+        editor: Optional[SchemaEditor] = self.get_current_editor()
+        if not editor:
+            return
+        current_tab: str = self.tab_manager.notebook.select()
+        default_name: str = self.tab_manager.notebook.tab(current_tab, "text")
+        filename: str = filedialog.asksaveasfilename(title="Экспорт изображения",
+                                                      initialfile=default_name,
+                                                      defaultextension=".svg",
+                                                      filetypes=[("SVG", "*.svg"), ("PNG", "*.png")])
+        if filename:
+            try:
+                export_file(SchemaData(editor.nodes, editor.adjacency_matrix, editor.cols, editor.rows),
+                            filename, editor.style)
+            except Exception as e:
+                messagebox.showerror("Ошибка", f"Не удалось сохранить изображение:\n{e}")
+
     def save_file(self) -> None:
         editor: Optional[SchemaEditor] = self.get_current_editor()
         if not editor:
             return
         if editor.current_file:
-            SchemaSerializer.serialize(
-                SchemaData(editor.nodes, editor.adjacency_matrix, editor.cols, editor.rows),
-                editor.current_file
-            )
+            self.write_schema(editor, editor.current_file)
         else:
             self.save_as_file()
 
@@ -99,17 +197,37 @@ class GlobalMenu:
                                                       defaultextension=".json",
                                                       filetypes=[("JSON файлы", "*.json"), ("Все файлы", "*.*")])
         if filename:
+            self.write_schema(editor, filename)
+
+    def write_schema(self, editor: SchemaEditor, filename: str) -> None:
+        """
+        Сохраняет схему редактора в фоновом потоке; окно хода модальное,
+        поэтому схема не меняется, пока идёт запись.
+        """
+        schema_data = SchemaData(editor.nodes, editor.adjacency_matrix, editor.cols, editor.rows)
+
+        def saved(_: None) -> None:
             editor.current_file = filename
-            SchemaSerializer.serialize(
-                SchemaData(editor.nodes, editor.adjacency_matrix, editor.cols, editor.rows),
-                filename
-            )
+
+        self.run_in_background("Сохранение файла", f"Сохранение {os.path.basename(filename)}...",
+                               lambda progress, cancelled: SchemaSerializer.dump(schema_data, filename,
+                                                                                 progress, cancelled),
+                               saved, "Не удалось сохранить файл")
 
     def clear_edges(self) -> None:
         editor: Optional[SchemaEditor] = self.get_current_editor()
         if editor:
-            new_matrix: List[List[int]] = [[0] * len(editor.nodes) for _ in range(len(editor.nodes))]
-            editor.set_adjacency_matrix(new_matrix)
+            editor.clear_edges()
+
+    def undo(self) -> None:
+        editor: Optional[SchemaEditor] = self.get_current_editor()
+        if editor:
+            editor.undo()
+
+    def redo(self) -> None:
+        editor: Optional[SchemaEditor] = self.get_current_editor()
+        if editor:
+            editor.redo()
 
     def new_schema(self) -> None:
         editor: Optional[SchemaEditor] = self.get_current_editor()
@@ -121,7 +239,7 @@ class GlobalMenu:
                 cols, rows = map(int, input_value.lower().replace('x', ' ').split())
                 num_nodes: int = cols * rows
                 nodes: Dict[int, Node] = {i + 1: Node(i + 1, i + 1) for i in range(num_nodes)}
-                new_matrix: List[List[int]] = [[0] * num_nodes for _ in range(num_nodes)]
+                new_matrix = TriangularAdjacencyMatrix(num_nodes)
                 schema_data: SchemaData = SchemaData(nodes, new_matrix, cols, rows)
                 editor.set_graph(schema_data)
                 editor.current_file = None
@@ -132,7 +250,8 @@ class GlobalMenu:
         """
         Выполняет выбранный алгоритм авторазмещения.
         Если флаг new_tab_after_autoplacement установлен, создаётся новая вкладка с новым размещением,
-        иначе обновляется текущая вкладка.
+        иначе обновляется текущая вкладка. Состязание алгоритмов выполняется в фоновом потоке
+        с окном хода (см. ProgressWindow).
         """
         editor = self.get_current_editor()
         if not editor:
@@ -140,7 +259,38 @@ class GlobalMenu:
         # Формируем текущую модель данных
         from models import SchemaData  # Локальный импорт для избежания циклических зависимостей
         current_schema = SchemaData(editor.nodes, editor.adjacency_matrix, editor.cols, editor.rows).clone()
-        variants = algorithm.run(current_schema,self.tab_manager.get_current_tab_name())
+        tab_name = self.tab_manager.get_current_tab_name()
+        target = algorithm.load() if isinstance(algorithm, LazyAutoPlacement) else algorithm
+        if isinstance(target, PortfolioPlacement):
+            # Состязание длится весь бюджет: выполняем его в фоне, а директивы запрашиваем заранее,
+            # в потоке Tk (фоновый поток не показывает диалогов)
+            constraints = resolve_constraints(editor.constraints, current_schema, ask=True)
+            if constraints is None:
+                return
+            time_limit = self.time_limit or DEFAULT_TIME_LIMIT
+
+            def race(progress: Callable[[float], None], cancelled: Any) -> Any:
+                budget = _BackgroundBudget(time_limit, progress, cancelled)
+                return budget, algorithm.run(current_schema, tab_name, budget, constraints=constraints)
+
+            self.run_in_background("Авторазмещение", f"{algorithm.get_name()}...", race,
+                                   lambda result: self.apply_auto_placement(algorithm, editor, *result),
+                                   "Ошибка авторазмещения")
+            return
+        budget = Budget(time_limit=self.time_limit)
+        # Контрольная точка хранится рядом с файлом схемы (если схема уже сохранена)
+        checkpoint = Checkpoint.for_schema(editor.current_file, algorithm.get_name()) if editor.current_file else None
+        variants = algorithm.run(current_schema, tab_name, budget, checkpoint, editor.constraints)
+        self.apply_auto_placement(algorithm, editor, budget, variants)
+
+    def apply_auto_placement(self, algorithm: AbstractAutoPlacement, editor: SchemaEditor,
+                             budget: Budget, variants: List[Tuple[SchemaData, str]]) -> None:
+        """
+        Показывает результат авторазмещения: новая вкладка или новое размещение текущей схемы.
+        """
+        if budget.trace:
+            trace = ", ".join(f"{seconds:.2f} с: {cost}" for seconds, cost in budget.trace)
+            logger.info(f"{algorithm.get_name()} – трасса стоимости: {trace}")
         if not variants:
             messagebox.showinfo("Авторазмещение", "Алгоритм не вернул ни одного варианта.")
             return
@@ -154,7 +304,75 @@ class GlobalMenu:
                 new_editor.set_graph(new_schema)
                 self.tab_manager.notebook.select(new_tab)
         else:
-            editor.set_graph(new_schema)
+            # Текущая схема получает новое размещение; действие можно отменить
+            editor.set_placement(new_schema)
+
+    def run_incremental_placement(self) -> None:
+        """
+        Улучшает размещение только вокруг элементов, у которых менялись связи
+        после последнего размещения; результат применяется к текущей схеме (с возможностью отмены).
+        """
+        editor = self.get_current_editor()
+        if not editor:
+            return
+        if not editor.dirty_nodes:
+            messagebox.showinfo("Доразмещение", "Связи не изменялись после последнего размещения.")
+            return
+        algorithm = IncrementalPlacement(editor.dirty_nodes)
+        budget = Budget(time_limit=self.time_limit)
+        current_schema = SchemaData(editor.nodes, editor.adjacency_matrix, editor.cols, editor.rows)
+        variants = algorithm.run(current_schema, self.tab_manager.get_current_tab_name(), budget,
+                                 constraints=editor.constraints)
+        if not variants:
+            return
+        before, after = budget.trace[0][1], budget.trace[-1][1]
+        editor.set_placement(variants[0][0])
+        messagebox.showinfo("Доразмещение",
+                            f"Длина связей вокруг изменённых элементов: {before} -> {after}\n"
+                            f"Изменение суммарной длины связей: {after - before:+}\n"
+                            f"Время: {budget.elapsed() * 1000:.0f} мс")
+
+    def load_constraints(self) -> None:
+        """
+        Загружает ограничения размещения текущей схемы из файла JSON (см. PlacementConstraints.load)
+        и проверяет их по схеме; алгоритмы авторазмещения получают их вместо запроса директив.
+        """
+        editor = self.get_current_editor()
+        if not editor:
+            return
+        filename: str = filedialog.askopenfilename(title="Ограничения размещения",
+                                                    filetypes=[("JSON файлы", "*.json"), ("Все файлы", "*.*")])
+        if not filename:
+            return
+        try:
+            constraints = PlacementConstraints.load(filename)
+            constraints.validate(SchemaData(editor.nodes, editor.adjacency_matrix, editor.cols, editor.rows))
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Ошибка", f"Ограничения размещения не загружены:\n{e}")
+            return
+        editor.constraints = constraints
+        messagebox.showinfo("Ограничения размещения",
+                            f"Закреплено элементов: {len(constraints.fixed_cells)}\n"
+                            f"Запрещено позиций: {len(constraints.forbidden_cells)}\n"
+                            f"Элементов с областями: {len(constraints.allowed)}")
+
+    def reset_constraints(self) -> None:
+        editor = self.get_current_editor()
+        if editor:
+            editor.constraints = None
+
+    def set_time_limit(self) -> None:
+        """
+        Запрашивает ограничение времени работы алгоритмов авторазмещения (0 – без ограничения).
+        """
+        current = self.time_limit or 0
+        seconds: Optional[float] = simpledialog.askfloat(
+            "Ограничение времени",
+            "Время работы алгоритма авторазмещения, с (0 – без ограничения):",
+            initialvalue=current, minvalue=0
+        )
+        if seconds is not None:
+            self.time_limit = seconds or None
 
     def arrange_by_connectivity(self) -> None:
         messagebox.showinfo("Размещение по связности", "Эта функция будет реализована через авторазмещение.")
@@ -170,5 +388,25 @@ class GlobalMenu:
         total_length: float = compute_total_weighted_length(schema_data)
         tk.messagebox.showinfo("Статистика", f"Суммарная длина связей: {total_length}")
 
+    def show_layout_metrics(self) -> None:
+        editor: Optional[SchemaEditor] = self.get_current_editor()
+        if not editor:
+            return
+        schema_data = SchemaData(editor.nodes, editor.adjacency_matrix, editor.cols, editor.rows)
+        metrics = compute_layout_metrics(schema_data)
+        # Самые загруженные ячейки карты (номер ячейки – с 1, как grid_position)
+        cells = sorted(((value, r * editor.cols + c + 1) for r, row in enumerate(metrics.congestion)
+                        for c, value in enumerate(row) if value > 0), reverse=True)[:5]
+        hot_cells = ", ".join(f"{pos} ({value:.1f})" for value, pos in cells) or "нет"
+        tk.messagebox.showinfo(
+            "Статистика",
+            f"Суммарная длина связей: {metrics.total_length}\n"
+            f"Пересечений связей: {metrics.crossings}\n"
+            f"Наибольшая длина связи: {metrics.max_length}\n"
+            f"Наибольшая длина связи с учётом веса: {metrics.max_weighted_length}\n"
+            f"Наибольшая загруженность: {metrics.max_congestion:.1f}\n"
+            f"Самые загруженные ячейки: {hot_cells}"
+        )
+
     def about(self) -> None:
         messagebox.showinfo("О программе", "Студенты РГРТУ гр 146\nДикун В.В.\nСвиридов Е.С.\nКостяева А.М\n2025г")
@@ -0,0 +1,214 @@
+"""
+history.py
+История изменений схемы для отмены и повтора действий.
+
+Вместо снимков всей схемы (SchemaData.clone() копирует матрицу целиком) хранятся
+только изменения: вес связи, замена размещения (перемещённые узлы). Применение и отмена
+изменения занимают время, пропорциональное его размеру.
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from models import Node
+
+# Сколько действий хранится в истории по умолчанию
+HISTORY_LIMIT = 100
+# Суммарный размер хранимых изменений (число элементарных изменений во всех действиях)
+HISTORY_MAX_CHANGES = 1_000_000
+
+
+class Change(ABC):
+    """
+    Change – обратимое изменение схемы.
+
+    Изменение применяется к объекту с атрибутами nodes (Dict[int, Node]) и
+    adjacency_matrix (например, SchemaEditor или SchemaData).
+    """
+
+    @abstractmethod
+    def apply(self, target) -> None:
+        """
+        Применяет изменение к target.
+        """
+        pass
+
+    @abstractmethod
+    def revert(self, target) -> None:
+        """
+        Отменяет изменение в target.
+        """
+        pass
+
+    def __len__(self) -> int:
+        """
+        Размер изменения – число элементарных изменений (для ограничения памяти истории).
+        """
+        return 1
+
+    def edges(self) -> Set[Tuple[int, int]]:
+        """
+        Связи (element_i, element_j), i < j, затронутые изменением.
+        """
+        return set()
+
+    def nodes(self) -> Set[int]:
+        """
+        Узлы, изменившие позицию.
+        """
+        return set()
+
+
+class EdgeChange(Change):
+    """
+    EdgeChange – изменение веса связи между элементами i и j (0 – связи нет).
+    """
+    __slots__ = ("i", "j", "old_weight", "new_weight")
+
+    def __init__(self, i: int, j: int, old_weight: int, new_weight: int) -> None:
+        self.i, self.j = min(i, j), max(i, j)
+        self.old_weight = old_weight
+        self.new_weight = new_weight
+
+    def _set(self, target, weight: int) -> None:
+        target.adjacency_matrix[self.i - 1][self.j - 1] = weight
+        target.adjacency_matrix[self.j - 1][self.i - 1] = weight
+
+    def apply(self, target) -> None:
+        self._set(target, self.new_weight)
+
+    def revert(self, target) -> None:
+        self._set(target, self.old_weight)
+
+    def edges(self) -> Set[Tuple[int, int]]:
+        return {(self.i, self.j)}
+
+
+class PlacementChange(Change):
+    """
+    PlacementChange – замена размещения (например, после авторазмещения).
+    Хранит только узлы, у которых изменилась позиция: (element, old_position, new_position).
+    """
+    __slots__ = ("moves",)
+
+    def __init__(self, moves: List[Tuple[int, int, int]]) -> None:
+        self.moves = moves
+
+    @staticmethod
+    def between(old_nodes: Dict[int, Node], new_nodes: Dict[int, Node]) -> "PlacementChange":
+        moves = [(element, node.grid_position, new_nodes[element].grid_position)
+                 for element, node in old_nodes.items()
+                 if element in new_nodes and new_nodes[element].grid_position != node.grid_position]
+        return PlacementChange(moves)
+
+    def apply(self, target) -> None:
+        for element, _, new_position in self.moves:
+            target.nodes[element].grid_position = new_position
+
+    def revert(self, target) -> None:
+        for element, old_position, _ in self.moves:
+            target.nodes[element].grid_position = old_position
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def nodes(self) -> Set[int]:
+        return {element for element, _, _ in self.moves}
+
+
+class ChangeGroup(Change):
+    """
+    ChangeGroup – несколько изменений, отменяемых и повторяемых как одно действие
+    (например, удаление всех связей).
+    """
+    __slots__ = ("changes",)
+
+    def __init__(self, changes: Iterable[Change]) -> None:
+        self.changes = list(changes)
+
+    def apply(self, target) -> None:
+        for change in self.changes:
+            change.apply(target)
+
+    def revert(self, target) -> None:
+        for change in reversed(self.changes):
+            change.revert(target)
+
+    def __len__(self) -> int:
+        return sum(len(change) for change in self.changes)
+
+    def edges(self) -> Set[Tuple[int, int]]:
+        return set().union(*(change.edges() for change in self.changes))
+
+    def nodes(self) -> Set[int]:
+        return set().union(*(change.nodes() for change in self.changes))
+
+
+class History:
+    """
+    History – стеки отмены и повтора действий.
+
+    Хранится не более limit действий и не более max_changes элементарных изменений в сумме;
+    при превышении забываются самые старые действия.
+
+    Attributes:
+        limit (int): Наибольшее число действий в стеке отмены.
+        max_changes (int): Наибольший суммарный размер хранимых изменений.
+    """
+
+    def __init__(self, limit: int = HISTORY_LIMIT, max_changes: int = HISTORY_MAX_CHANGES) -> None:
+        self.limit = limit
+        self.max_changes = max_changes
+        self._undo: Deque[Change] = deque()
+        self._redo: List[Change] = []
+        self._size = 0
+
+    def record(self, change: Change) -> None:
+        """
+        Запоминает уже выполненное изменение; стек повтора при этом очищается.
+        """
+        if len(change) == 0:
+            return
+        self._redo.clear()
+        self._push(change)
+
+    def _push(self, change: Change) -> None:
+        self._undo.append(change)
+        self._size += len(change)
+        while len(self._undo) > self.limit or (self._size > self.max_changes and len(self._undo) > 1):
+            self._size -= len(self._undo.popleft())
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo(self, target) -> Optional[Change]:
+        """
+        Отменяет последнее действие и возвращает его (None, если отменять нечего).
+        """
+        if not self._undo:
+            return None
+        change = self._undo.pop()
+        self._size -= len(change)
+        change.revert(target)
+        self._redo.append(change)
+        return change
+
+    def redo(self, target) -> Optional[Change]:
+        """
+        Повторяет последнее отменённое действие и возвращает его (None, если повторять нечего).
+        """
+        if not self._redo:
+            return None
+        change = self._redo.pop()
+        change.apply(target)
+        self._push(change)
+        return change
+
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
+        self._size = 0
@@ -0,0 +1,186 @@
+"""
+importers.py
+Импорт схем из стандартных форматов списков цепей (гиперграфов):
+  - hMETIS (.hgr);
+  - Bookshelf (.nets).
+
+Файл читается построчно, а каждая многоконтактная цепь сразу раскладывается на
+взвешенные рёбра (клика или звезда) в разреженную матрицу смежности, поэтому
+большие схемы загружаются без промежуточной плотной матрицы n x n.
+"""
+
+import math
+import os
+from typing import Callable, Dict, Iterator, List, Optional, TextIO
+
+from dialogs import get_dialogs
+from models import Node, SchemaData, SparseAdjacencyMatrix
+
+# Способы раскрытия цепи в рёбра графа
+NET_MODELS = ("auto", "clique", "star")
+# В режиме "auto" цепи с числом контактов больше этого раскрываются звездой, а не кликой
+CLIQUE_MAX_DEGREE = 8
+
+
+class NetlistBuilder:
+    """
+    NetlistBuilder накапливает цепи и строит по ним схему.
+
+    Цепь из k контактов раскрывается:
+      - кликой: каждая пара контактов соединяется ребром с весом цепи (k(k-1)/2 рёбер);
+      - звездой: первый контакт (источник цепи) соединяется с каждым из остальных (k-1 рёбер).
+    Рёбра, полученные из разных цепей, складываются.
+
+    Attributes:
+        net_model (str): "clique", "star" или "auto" (клика для небольших цепей, иначе звезда).
+        adjacency (List[Dict[int, int]]): Строки разреженной матрицы (индексы элементов с 0).
+        nets (int): Число добавленных цепей.
+    """
+
+    def __init__(self, net_model: str = "auto") -> None:
+        if net_model not in NET_MODELS:
+            raise ValueError(f"неизвестный способ раскрытия цепей: {net_model}")
+        self.net_model = net_model
+        self.adjacency: List[Dict[int, int]] = []
+        self.nets = 0
+
+    def add_net(self, pins: List[int], weight: int = 1) -> None:
+        """
+        Добавляет цепь; pins – индексы элементов (с 0), первый контакт считается источником.
+        """
+        # Повторные контакты одного элемента в цепи не дают новых рёбер
+        pins = list(dict.fromkeys(pins))
+        self.nets += 1
+        if len(pins) < 2 or weight <= 0:
+            return
+        top = max(pins)
+        if top >= len(self.adjacency):
+            self.adjacency.extend({} for _ in range(top + 1 - len(self.adjacency)))
+        if self.net_model == "clique" or self.net_model == "auto" and len(pins) <= CLIQUE_MAX_DEGREE:
+            for a_pos in range(len(pins)):
+                for b in pins[a_pos + 1:]:
+                    self._add_edge(pins[a_pos], b, weight)
+        else:
+            source = pins[0]
+            for b in pins[1:]:
+                self._add_edge(source, b, weight)
+
+    def _add_edge(self, a: int, b: int, weight: int) -> None:
+        row_a = self.adjacency[a]
+        total = row_a.get(b, 0) + weight
+        row_a[b] = total
+        self.adjacency[b][a] = total
+
+    def build(self, num_elements: int) -> SchemaData:
+        """
+        Строит схему из num_elements элементов на почти квадратной сетке;
+        элементы занимают ячейки по порядку номеров.
+        """
+        if len(self.adjacency) < num_elements:
+            self.adjacency.extend({} for _ in range(num_elements - len(self.adjacency)))
+        cols = max(1, math.ceil(math.sqrt(num_elements)))
+        rows = max(1, math.ceil(num_elements / cols))
+        nodes = {i + 1: Node(i + 1, i + 1) for i in range(num_elements)}
+        matrix = SparseAdjacencyMatrix(num_elements, self.adjacency)
+        return SchemaData(nodes, matrix, cols, rows)
+
+
+def _data_lines(f: TextIO, comment: str) -> Iterator[str]:
+    """
+    Непустые строки файла без комментариев.
+    """
+    for line in f:
+        line = line.split(comment, 1)[0].strip()
+        if line:
+            yield line
+
+
+def _next_line(lines: Iterator[str]) -> str:
+    line = next(lines, None)
+    if line is None:
+        raise ValueError("неожиданный конец файла")
+    return line
+
+
+def read_hmetis(f: TextIO, net_model: str = "auto") -> SchemaData:
+    """
+    Читает гиперграф в формате hMETIS:
+        <число цепей> <число вершин> [fmt]
+        [вес] v1 v2 ...      – по строке на цепь, вершины с 1
+    fmt 1 или 11 означает, что первое число строки цепи – её вес; веса вершин (fmt 10, 11) не используются.
+    """
+    lines = _data_lines(f, "%")
+    header = _next_line(lines).split()
+    if len(header) < 2:
+        raise ValueError("в заголовке hMETIS должны быть число цепей и число вершин")
+    num_nets, num_vertices = int(header[0]), int(header[1])
+    net_weights = len(header) > 2 and header[2] in ("1", "11")
+    builder = NetlistBuilder(net_model)
+    for net in range(num_nets):
+        values = [int(value) for value in _next_line(lines).split()]
+        weight = values.pop(0) if net_weights else 1
+        for vertex in values:
+            if not 1 <= vertex <= num_vertices:
+                raise ValueError(f"цепь {net + 1}: вершина {vertex} вне диапазона 1..{num_vertices}")
+        builder.add_net([vertex - 1 for vertex in values], weight)
+    return builder.build(num_vertices)
+
+
+def read_bookshelf(f: TextIO, net_model: str = "auto") -> SchemaData:
+    """
+    Читает список цепей в формате Bookshelf (.nets):
+        UCLA nets 1.0
+        NumNets : <n>
+        NumPins : <p>
+        NetDegree : <k> [имя цепи]
+        <имя элемента> [I|O|B] [: смещение_x смещение_y]   – k строк контактов
+    Элементы нумеруются с 1 в порядке первого появления; выходной контакт (O) считается источником цепи.
+    """
+    lines = _data_lines(f, "#")
+    builder = NetlistBuilder(net_model)
+    element_of: Dict[str, int] = {}
+    for line in lines:
+        key, _, value = line.partition(":")
+        key = key.strip()
+        if key != "NetDegree":
+            # Заголовок формата и счётчики NumNets/NumPins не нужны для построения
+            continue
+        degree = int(value.split()[0])
+        pins: List[int] = []
+        for _ in range(degree):
+            parts = _next_line(lines).split()
+            index = element_of.setdefault(parts[0], len(element_of))
+            if len(parts) > 1 and parts[1] == "O":
+                pins.insert(0, index)
+            else:
+                pins.append(index)
+        builder.add_net(pins)
+    return builder.build(len(element_of))
+
+
+# Поддерживаемые форматы: расширение файла -> функция чтения
+NETLIST_READERS: Dict[str, Callable[[TextIO, str], SchemaData]] = {
+    ".hgr": read_hmetis,
+    ".nets": read_bookshelf,
+}
+
+
+class NetlistImporter:
+    """
+    NetlistImporter загружает схему из файла списка цепей, выбирая формат по расширению.
+    """
+    @staticmethod
+    def is_netlist(filename: str) -> bool:
+        return os.path.splitext(filename)[1].lower() in NETLIST_READERS
+
+    @staticmethod
+    def import_file(filename: str, net_model: str = "auto") -> Optional[SchemaData]:
+        try:
+            reader = NETLIST_READERS.get(os.path.splitext(filename)[1].lower())
+            if reader is None:
+                raise ValueError(f"неизвестный формат списка цепей: {filename}")
+            with open(filename, "r", encoding="utf-8") as f:
+                return reader(f, net_model)
+        except Exception as e:
+            get_dialogs().show_error("Ошибка", f"Не удалось импортировать файл:\n{e}")
+            return None
@@ -1,15 +1,21 @@
 """
 main.py
 Точка входа в приложение.
+
+Графические модули импортируются внутри main(): рабочие процессы алгоритмов
+(метод запуска spawn) заново импортируют этот модуль и не должны загружать tkinter.
 """
 
-import tkinter as tk
 
-from globalmenu import GlobalMenu
-from tabmanager import TabManager
+def main():
+    import tkinter as tk
 
+    from dialogs import set_dialogs
+    from globalmenu import GlobalMenu
+    from tabmanager import TabManager
+    from tkdialogs import TkDialogs
 
-def main():
+    set_dialogs(TkDialogs())
     root = tk.Tk()
     root.title("Редактор схем РГРТУ")
     root.geometry("1024x768")
@@ -3,7 +3,8 @@ Models.py
 Модуль, содержащий классы данных для схемы.
 """
 
-from typing import Dict, List
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 
 class Node:
@@ -19,11 +20,316 @@ class Node:
         self.grid_position = grid_position
 
 
+class SparseRow:
+    """
+    SparseRow – строка разреженной матрицы смежности.
+    Ведёт себя как строка плотной матрицы: row[j] возвращает 0 для отсутствующей связи,
+    запись 0 удаляет связь, итерация перебирает все size значений.
+    """
+    __slots__ = ("values", "size")
+
+    def __init__(self, values: Dict[int, int], size: int) -> None:
+        self.values = values
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, j: int) -> int:
+        if j < 0:
+            j += self.size
+        if not 0 <= j < self.size:
+            raise IndexError("индекс строки вне диапазона")
+        return self.values.get(j, 0)
+
+    def __setitem__(self, j: int, weight: int) -> None:
+        if j < 0:
+            j += self.size
+        if not 0 <= j < self.size:
+            raise IndexError("индекс строки вне диапазона")
+        if weight:
+            self.values[j] = weight
+        else:
+            self.values.pop(j, None)
+
+    def __iter__(self) -> Iterator[int]:
+        values = self.values
+        return (values.get(j, 0) for j in range(self.size))
+
+    def items(self) -> Iterable[Tuple[int, int]]:
+        """
+        Только ненулевые элементы строки: (номер столбца, вес).
+        """
+        return self.values.items()
+
+
+class SparseAdjacencyMatrix:
+    """
+    SparseAdjacencyMatrix – разреженная симметричная матрица смежности.
+
+    Хранит для каждой строки только ненулевые элементы, поэтому подходит для больших схем,
+    где плотная матрица n x n не помещается в памяти. Поддерживает тот же интерфейс,
+    что и List[List[int]]: len(matrix), matrix[i][j], matrix[i][j] = w, перебор строк.
+
+    Attributes:
+        rows (List[SparseRow]): Строки матрицы.
+    """
+
+    def __init__(self, size: int, rows: Optional[List[Dict[int, int]]] = None) -> None:
+        """
+        rows – готовые строки {столбец: вес} (используются без копирования), иначе матрица пустая.
+        """
+        if rows is None:
+            rows = [{} for _ in range(size)]
+        self.rows: List[SparseRow] = [SparseRow(values, size) for values in rows]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, i: int) -> SparseRow:
+        return self.rows[i]
+
+    def __iter__(self) -> Iterator[SparseRow]:
+        return iter(self.rows)
+
+    def add_edge(self, i: int, j: int, weight: int) -> None:
+        """
+        Добавляет вес к связи i–j (индексы с 0) в обе симметричные ячейки.
+        """
+        if i == j or weight == 0:
+            return
+        total = self.rows[i].values.get(j, 0) + weight
+        self.rows[i][j] = total
+        self.rows[j][i] = total
+
+    def edge_count(self) -> int:
+        return sum(len(row.values) for row in self.rows) // 2
+
+    def copy(self) -> "SparseAdjacencyMatrix":
+        return SparseAdjacencyMatrix(len(self.rows), [dict(row.values) for row in self.rows])
+
+
+class TriangularRow:
+    """
+    TriangularRow – строка упакованной треугольной матрицы (TriangularAdjacencyMatrix).
+    Ведёт себя как строка плотной матрицы: row[j] и row[j] = w обращаются к общей
+    ячейке пары {i, j}, диагональ всегда 0, итерация перебирает все size значений.
+    """
+    __slots__ = ("matrix", "i")
+
+    def __init__(self, matrix: "TriangularAdjacencyMatrix", i: int) -> None:
+        self.matrix = matrix
+        self.i = i
+
+    def __len__(self) -> int:
+        return self.matrix.size
+
+    def _index(self, j: int) -> int:
+        size = self.matrix.size
+        if j < 0:
+            j += size
+        if not 0 <= j < size:
+            raise IndexError("индекс строки вне диапазона")
+        return j
+
+    def __getitem__(self, j: int) -> int:
+        j = self._index(j)
+        i = self.i
+        if i == j:
+            return 0
+        if i > j:
+            i, j = j, i
+        return self.matrix.data[self.matrix.offsets[i] + j]
+
+    def __setitem__(self, j: int, weight: int) -> None:
+        j = self._index(j)
+        i = self.i
+        if i == j:
+            if weight:
+                raise ValueError("связь элемента с самим собой не поддерживается")
+            return
+        if i > j:
+            i, j = j, i
+        self.matrix.data[self.matrix.offsets[i] + j] = weight
+
+    def __iter__(self) -> Iterator[int]:
+        matrix, i = self.matrix, self.i
+        data, offsets = matrix.data, matrix.offsets
+        for j in range(i):
+            yield data[offsets[j] + i]
+        yield 0
+        start = offsets[i] + i + 1
+        yield from data[start:offsets[i] + matrix.size]
+
+    def items(self) -> Iterable[Tuple[int, int]]:
+        """
+        Только ненулевые элементы строки: (номер столбца, вес).
+        """
+        return [(j, weight) for j, weight in enumerate(self) if weight]
+
+
+class TriangularAdjacencyMatrix:
+    """
+    TriangularAdjacencyMatrix – плотная симметричная матрица смежности, упакованная
+    в верхний треугольник без диагонали: n(n-1)/2 целых в array('i') вместо n*n
+    объектов int в списках. Подходит для небольших и средних схем с плотными связями.
+
+    Поддерживает тот же интерфейс, что и List[List[int]]: len(matrix), matrix[i][j],
+    matrix[i][j] = w (запись в [i][j] и [j][i] попадает в одну ячейку), перебор строк.
+    Связь i–j (i < j) хранится в data[offsets[i] + j].
+
+    Attributes:
+        size (int): Число элементов.
+        data (array): Упакованный верхний треугольник по строкам.
+        offsets (List[int]): Смещения строк в data.
+    """
+
+    def __init__(self, size: int, data: Optional[array] = None) -> None:
+        """
+        data – готовый упакованный треугольник (используется без копирования), иначе матрица пустая.
+        """
+        length = size * (size - 1) // 2
+        if data is None:
+            data = array('i', [0]) * length
+        elif len(data) != length:
+            raise ValueError(f"ожидалось {length} значений треугольника, получено {len(data)}")
+        self.size = size
+        self.data = data
+        self.offsets = [i * (2 * size - i - 1) // 2 - i - 1 for i in range(size)]
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[int]]) -> "TriangularAdjacencyMatrix":
+        """
+        Упаковывает квадратную матрицу. Матрица должна быть симметричной с нулевой диагональю,
+        иначе часть весов потерялась бы при упаковке – тогда выбрасывается ValueError.
+        """
+        size = len(rows)
+        for row in rows:
+            if len(row) != size:
+                raise ValueError("матрица смежности должна быть квадратной")
+        data = array('i')
+        for i, row in enumerate(rows):
+            if row[i]:
+                raise ValueError(f"связь элемента {i + 1} с самим собой (вес {row[i]}) не поддерживается")
+            for j in range(i + 1, size):
+                if rows[j][i] != row[j]:
+                    raise ValueError(f"матрица смежности несимметрична: связь {i + 1}–{j + 1} "
+                                     f"имеет веса {row[j]} и {rows[j][i]}")
+            data.extend(row[i + 1:])
+        return cls(size, data)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, i: int) -> TriangularRow:
+        if i < 0:
+            i += self.size
+        if not 0 <= i < self.size:
+            raise IndexError("индекс матрицы вне диапазона")
+        return TriangularRow(self, i)
+
+    def __iter__(self) -> Iterator[TriangularRow]:
+        return (TriangularRow(self, i) for i in range(self.size))
+
+    def upper_row(self, i: int) -> array:
+        """
+        Веса связей i–j для j = i+1..size-1 (копия участка data).
+        """
+        start = self.offsets[i] + i + 1
+        return self.data[start:start + self.size - i - 1]
+
+    def dense_row(self, i: int) -> List[int]:
+        """
+        Строка i целиком обычным списком (столбец над диагональю, 0 и upper_row(i)):
+        для циклов, читающих строку много раз, индексирование списка дешевле TriangularRow.
+        """
+        data, offsets = self.data, self.offsets
+        row = [data[offsets[j] + i] for j in range(i)]
+        row.append(0)
+        row.extend(self.upper_row(i))
+        return row
+
+    def add_edge(self, i: int, j: int, weight: int) -> None:
+        """
+        Добавляет вес к связи i–j (индексы с 0).
+        """
+        if i == j or weight == 0:
+            return
+        if i > j:
+            i, j = j, i
+        self.data[self.offsets[i] + j] += weight
+
+    def edge_count(self) -> int:
+        return len(self.data) - self.data.count(0)
+
+    def copy(self) -> "TriangularAdjacencyMatrix":
+        return TriangularAdjacencyMatrix(self.size, array('i', self.data))
+
+
+def iter_edges(adjacency_matrix) -> Iterator[Tuple[int, int, int]]:
+    """
+    Перебирает связи матрицы смежности (i, j, weight) с индексами с 0, i < j и weight > 0.
+    Для разреженной матрицы перебираются только ненулевые элементы.
+    """
+    if isinstance(adjacency_matrix, SparseAdjacencyMatrix):
+        for i, row in enumerate(adjacency_matrix.rows):
+            for j, weight in sorted(row.items()):
+                if j > i and weight > 0:
+                    yield i, j, weight
+        return
+    if isinstance(adjacency_matrix, TriangularAdjacencyMatrix):
+        for i in range(adjacency_matrix.size):
+            for j, weight in enumerate(adjacency_matrix.upper_row(i), i + 1):
+                if weight > 0:
+                    yield i, j, weight
+        return
+    for i, row in enumerate(adjacency_matrix):
+        for j, weight in enumerate(row):
+            if j > i and weight > 0:
+                yield i, j, weight
+
+
+def iter_neighbours(adjacency_matrix, i: int) -> Iterator[Tuple[int, int]]:
+    """
+    Перебирает соседей элемента i (индексы с 0) и веса связей (weight > 0).
+    Для разреженной матрицы перебираются только ненулевые элементы строки.
+    """
+    row = adjacency_matrix[i]
+    items = row.items() if isinstance(row, (SparseRow, TriangularRow)) else enumerate(row)
+    for j, weight in items:
+        if weight > 0 and j != i:
+            yield j, weight
+
+
+def dense_row(adjacency_matrix, i: int) -> Sequence[int]:
+    """
+    Строка i матрицы смежности (индексы с 0) последовательностью с быстрым доступом row[j]:
+    для плотной матрицы – сама строка, для упакованной и разреженной – список весов.
+    """
+    if isinstance(adjacency_matrix, TriangularAdjacencyMatrix):
+        return adjacency_matrix.dense_row(i)
+    if isinstance(adjacency_matrix, SparseAdjacencyMatrix):
+        row = [0] * len(adjacency_matrix)
+        for j, weight in adjacency_matrix.rows[i].items():
+            row[j] = weight
+        return row
+    return adjacency_matrix[i]
+
+
+def copy_matrix(adjacency_matrix):
+    """
+    Копия матрицы смежности того же типа (плотной, треугольной или разреженной).
+    """
+    if isinstance(adjacency_matrix, (SparseAdjacencyMatrix, TriangularAdjacencyMatrix)):
+        return adjacency_matrix.copy()
+    return [row[:] for row in adjacency_matrix]
+
+
 class SchemaData:
     """
     Класс SchemaData хранит данные схемы:
     - nodes (Dict[int, Node]): словарь узлов (element_number -> Node)
-    - adjacency_matrix (List[List[int]]): матрица смежности
+    - adjacency_matrix (List[List[int]], TriangularAdjacencyMatrix или SparseAdjacencyMatrix): матрица смежности
     - cols, rows: размеры сетки
     """
 
@@ -48,5 +354,5 @@ class SchemaData:
             for num, node in self.nodes.items()
         }
         # Копируем матрицу смежности (построчное копирование)
-        new_matrix = [row[:] for row in self.adjacency_matrix]
+        new_matrix = copy_matrix(self.adjacency_matrix)
         return SchemaData(new_nodes, new_matrix, self.cols, self.rows)
\ No newline at end of file
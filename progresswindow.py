@@ -0,0 +1,92 @@
+"""
+progresswindow.py
+Модуль с окном хода длительной операции, которая выполняется в фоновом потоке.
+"""
+
+import threading
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, Optional
+
+from serializer import OperationCancelled
+
+# Период опроса фонового потока, мс
+POLL_INTERVAL = 50
+
+
+class ProgressWindow:
+    """
+    ProgressWindow выполняет work(progress, cancelled) в фоновом потоке и показывает
+    модальное окно с индикатором хода и кнопкой «Отмена».
+
+    Фоновый поток не обращается к tkinter: progress(доля) только запоминает значение,
+    а окно опрашивает его через after(). По окончании в потоке Tk вызывается
+    on_done(результат) или on_error(исключение); отменённая операция
+    (OperationCancelled) завершается молча.
+
+    Attributes:
+        cancelled (threading.Event): Флаг отмены, передаётся в work.
+        fraction (float): Последняя сообщённая доля выполненной работы.
+    """
+
+    def __init__(self, master: tk.Misc, title: str, message: str,
+                 work: Callable[[Callable[[float], None], threading.Event], Any],
+                 on_done: Callable[[Any], None],
+                 on_error: Callable[[Exception], None]) -> None:
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancelled = threading.Event()
+        self.fraction: float = 0.0
+        self.result: Any = None
+        self.error: Optional[Exception] = None
+        self.finished = threading.Event()
+
+        self.window = tk.Toplevel(master)
+        self.window.title(title)
+        self.window.transient(master)
+        self.window.resizable(False, False)
+        self.label = tk.Label(self.window, text=message, anchor="w")
+        self.label.pack(fill=tk.X, padx=10, pady=(10, 5))
+        self.bar = ttk.Progressbar(self.window, length=320, maximum=100, mode="determinate")
+        self.bar.pack(padx=10, pady=5)
+        self.cancel_button = tk.Button(self.window, text="Отмена", command=self.cancel)
+        self.cancel_button.pack(pady=(5, 10))
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel)
+        self.window.grab_set()
+
+        self.thread = threading.Thread(target=self._run, args=(work,), daemon=True)
+        self.thread.start()
+        self.window.after(POLL_INTERVAL, self._poll)
+
+    def _set_progress(self, fraction: float) -> None:
+        self.fraction = fraction
+
+    def _run(self, work: Callable[[Callable[[float], None], threading.Event], Any]) -> None:
+        try:
+            self.result = work(self._set_progress, self.cancelled)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished.set()
+
+    def cancel(self) -> None:
+        """
+        Просит фоновую операцию остановиться; окно закроется, когда поток завершится.
+        """
+        self.cancelled.set()
+        self.cancel_button.configure(state=tk.DISABLED)
+        self.label.configure(text="Отмена...")
+
+    def _poll(self) -> None:
+        self.bar["value"] = self.fraction * 100
+        if not self.finished.is_set():
+            self.window.after(POLL_INTERVAL, self._poll)
+            return
+        self.window.grab_release()
+        self.window.destroy()
+        if isinstance(self.error, OperationCancelled):
+            return
+        if self.error is not None:
+            self.on_error(self.error)
+        else:
+            self.on_done(self.result)
@@ -1,73 +1,207 @@
 import json
-from tkinter import messagebox
-from typing import Dict, Optional
+import os
+import threading
+from array import array
+from typing import Callable, Dict, List, Optional
 
-from models import Node, SchemaData
+from dialogs import get_dialogs
+from models import Node, SchemaData, SparseAdjacencyMatrix, TriangularAdjacencyMatrix, iter_edges
+
+# Через сколько строк матрицы (рёбер, узлов) сообщать о ходе работы и проверять отмену
+PROGRESS_STEP = 256
+# Размер блока чтения файла при загрузке, байт
+READ_CHUNK = 1 << 20
+
+
+class OperationCancelled(Exception):
+    """
+    Сохранение или загрузка прерваны через флаг cancelled.
+    """
+
+
+class _Progress:
+    """
+    Передаёт долю выполненной работы (от 0 до 1) в progress и прерывает работу
+    исключением OperationCancelled, если установлен флаг cancelled.
+    """
+
+    def __init__(self, progress: Optional[Callable[[float], None]],
+                 cancelled: Optional[threading.Event]) -> None:
+        self.progress = progress
+        self.cancelled = cancelled
+
+    def update(self, fraction: float) -> None:
+        if self.cancelled is not None and self.cancelled.is_set():
+            raise OperationCancelled()
+        if self.progress is not None:
+            self.progress(fraction)
 
 
 class SchemaSerializer:
     """
     SchemaSerializer инкапсулирует логику сохранения и загрузки схемы в формате JSON.
+
+    dump/load выбрасывают исключения и поддерживают индикацию хода работы и отмену
+    (для выполнения в фоновом потоке); serialize/deserialize сообщают об ошибках через диалоги.
     """
     @staticmethod
     def serialize(schema_data: SchemaData, filename: str) -> None:
         try:
-            # Формируем словарь узлов
-            nodes_data: Dict[str, Dict[str, int]] = {}
-            for node in schema_data.nodes.values():
-                nodes_data[str(node.element_number)] = {
-                    "element_number": node.element_number,
-                    "grid_position": node.grid_position
-                }
-            # Получаем матрицу смежности
-            matrix = schema_data.adjacency_matrix
-            formatted_matrix: str = ""
-            if matrix:
-                # Определяем число столбцов (предполагаем, что все строки одинаковой длины)
-                num_cols = len(matrix[0])
-                # Вычисляем ширину для каждого столбца как максимальную длину числа в этом столбце
-                col_widths = [
-                    max(len(str(row[i])) for row in matrix)
-                    for i in range(num_cols)
-                ]
-                # Форматируем каждую строку матрицы с выравниванием по столбцам
-                formatted_rows = []
-                for row in matrix:
-                    formatted_row = "[ " + ", ".join(
-                        str(num).rjust(col_widths[i]) for i, num in enumerate(row)
-                    ) + " ]"
-                    formatted_rows.append(formatted_row)
-                # Собираем итоговую строку с отступами
-                formatted_matrix = "[\n    " + ",\n    ".join(formatted_rows) + "\n]"
-            # Форматируем узлы с помощью json.dumps для аккуратного вывода
-            nodes_json: str = json.dumps(nodes_data, indent=4, ensure_ascii=False)
-            # Собираем итоговый JSON-вывод вручную, вставляя отформатированную матрицу
-            final_json: str = "{\n"
-            final_json += f'    "cols": {schema_data.cols},\n'
-            final_json += f'    "rows": {schema_data.rows},\n'
-            final_json += f'    "nodes": {nodes_json},\n'
-            final_json += '    "adjacency_matrix": ' + formatted_matrix + "\n"
-            final_json += "}"
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(final_json)
+            SchemaSerializer.dump(schema_data, filename)
         except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось сохранить файл:\n{e}")
+            get_dialogs().show_error("Ошибка", f"Не удалось сохранить файл:\n{e}")
 
     @staticmethod
     def deserialize(filename: str) -> Optional[SchemaData]:
         try:
-            with open(filename, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            cols: int = data.get("cols", 0)
-            rows: int = data.get("rows", 0)
-            nodes_data: Dict[str, Dict[str, int]] = data.get("nodes", {})
-            nodes: Dict[int, Node] = {}
-            for key, node_info in nodes_data.items():
-                element_number: int = node_info["element_number"]
-                grid_position: int = node_info["grid_position"]
-                nodes[element_number] = Node(element_number, grid_position)
-            adjacency_matrix = data.get("adjacency_matrix", [])
-            return SchemaData(nodes, adjacency_matrix, cols, rows)
+            return SchemaSerializer.load(filename)
         except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось открыть файл:\n{e}")
+            get_dialogs().show_error("Ошибка", f"Не удалось открыть файл:\n{e}")
             return None
+
+    @staticmethod
+    def dump(schema_data: SchemaData, filename: str,
+             progress: Optional[Callable[[float], None]] = None,
+             cancelled: Optional[threading.Event] = None) -> None:
+        """
+        Сохраняет схему в файл. Файл записывается через временный, поэтому при ошибке
+        или отмене (OperationCancelled) прежнее содержимое не портится.
+        """
+        reporter = _Progress(progress, cancelled)
+        reporter.update(0.0)
+        # Формируем словарь узлов
+        nodes_data: Dict[str, Dict[str, int]] = {}
+        for node in schema_data.nodes.values():
+            nodes_data[str(node.element_number)] = {
+                "element_number": node.element_number,
+                "grid_position": node.grid_position
+            }
+        # Получаем матрицу смежности
+        matrix = schema_data.adjacency_matrix
+        formatted_matrix: str = ""
+        if isinstance(matrix, SparseAdjacencyMatrix):
+            # Разреженная матрица сохраняется списком рёбер [element_i, element_j, weight]
+            total = max(1, matrix.edge_count())
+            formatted_edges: List[str] = []
+            for i, j, weight in iter_edges(matrix):
+                if len(formatted_edges) % PROGRESS_STEP == 0:
+                    reporter.update(0.9 * len(formatted_edges) / total)
+                formatted_edges.append(f"[{i + 1}, {j + 1}, {weight}]")
+            formatted_matrix = "[\n    " + ",\n    ".join(formatted_edges) + "\n]" if formatted_edges else "[]"
+        elif isinstance(matrix, TriangularAdjacencyMatrix):
+            # Упакованная матрица сохраняется верхним треугольником: строка i – веса связей i–j, j > i
+            width = max(len(str(max(matrix.data, default=0))), len(str(min(matrix.data, default=0))))
+            formatted_rows = []
+            for i in range(matrix.size - 1):
+                if i % PROGRESS_STEP == 0:
+                    reporter.update(0.9 * i / matrix.size)
+                formatted_rows.append("[ " + ", ".join(str(num).rjust(width) for num in matrix.upper_row(i)) + " ]")
+            formatted_matrix = "[\n    " + ",\n    ".join(formatted_rows) + "\n]" if formatted_rows else "[]"
+        elif matrix:
+            # Определяем число столбцов (предполагаем, что все строки одинаковой длины)
+            num_cols = len(matrix[0])
+            # Вычисляем ширину для каждого столбца как максимальную длину числа в этом столбце
+            col_widths = [0] * num_cols
+            for index, row in enumerate(matrix):
+                if index % PROGRESS_STEP == 0:
+                    reporter.update(0.3 * index / len(matrix))
+                col_widths = [max(width, len(str(num))) for width, num in zip(col_widths, row)]
+            # Форматируем каждую строку матрицы с выравниванием по столбцам
+            formatted_rows = []
+            for index, row in enumerate(matrix):
+                if index % PROGRESS_STEP == 0:
+                    reporter.update(0.3 + 0.6 * index / len(matrix))
+                formatted_row = "[ " + ", ".join(
+                    str(num).rjust(col_widths[i]) for i, num in enumerate(row)
+                ) + " ]"
+                formatted_rows.append(formatted_row)
+            # Собираем итоговую строку с отступами
+            formatted_matrix = "[\n    " + ",\n    ".join(formatted_rows) + "\n]"
+        reporter.update(0.9)
+        # Форматируем узлы с помощью json.dumps для аккуратного вывода
+        nodes_json: str = json.dumps(nodes_data, indent=4, ensure_ascii=False)
+        # Собираем итоговый JSON-вывод вручную, вставляя отформатированную матрицу
+        final_json: str = "{\n"
+        final_json += f'    "cols": {schema_data.cols},\n'
+        final_json += f'    "rows": {schema_data.rows},\n'
+        final_json += f'    "nodes": {nodes_json},\n'
+        if isinstance(matrix, SparseAdjacencyMatrix):
+            final_json += f'    "size": {len(matrix)},\n'
+            final_json += '    "edges": ' + formatted_matrix + "\n"
+        elif isinstance(matrix, TriangularAdjacencyMatrix):
+            final_json += f'    "size": {matrix.size},\n'
+            final_json += '    "upper_triangle": ' + formatted_matrix + "\n"
+        else:
+            final_json += '    "adjacency_matrix": ' + formatted_matrix + "\n"
+        final_json += "}"
+        reporter.update(0.95)
+        temporary = filename + ".tmp"
+        try:
+            with open(temporary, "w", encoding="utf-8") as f:
+                f.write(final_json)
+            os.replace(temporary, filename)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+        reporter.update(1.0)
+
+    @staticmethod
+    def load(filename: str,
+             progress: Optional[Callable[[float], None]] = None,
+             cancelled: Optional[threading.Event] = None) -> SchemaData:
+        """
+        Загружает схему из файла. Файл читается блоками по READ_CHUNK байт
+        (ход работы – по прочитанной доле), затем разбирается целиком.
+        """
+        reporter = _Progress(progress, cancelled)
+        reporter.update(0.0)
+        file_size = max(1, os.path.getsize(filename))
+        chunks: List[bytes] = []
+        read = 0
+        with open(filename, "rb") as f:
+            while True:
+                chunk = f.read(READ_CHUNK)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                read += len(chunk)
+                reporter.update(0.6 * read / file_size)
+        data = json.loads(b"".join(chunks).decode("utf-8"))
+        del chunks
+        reporter.update(0.7)
+        cols: int = data.get("cols", 0)
+        rows: int = data.get("rows", 0)
+        nodes_data: Dict[str, Dict[str, int]] = data.get("nodes", {})
+        nodes: Dict[int, Node] = {}
+        for key, node_info in nodes_data.items():
+            element_number: int = node_info["element_number"]
+            grid_position: int = node_info["grid_position"]
+            nodes[element_number] = Node(element_number, grid_position)
+        reporter.update(0.8)
+        if "edges" in data:
+            # Разреженный формат: список рёбер [element_i, element_j, weight]
+            adjacency_matrix = SparseAdjacencyMatrix(data.get("size", max(nodes, default=0)))
+            edges = data["edges"]
+            for index, (i, j, weight) in enumerate(edges):
+                if index % PROGRESS_STEP == 0:
+                    reporter.update(0.8 + 0.2 * index / len(edges))
+                adjacency_matrix.add_edge(i - 1, j - 1, weight)
+        elif "upper_triangle" in data:
+            # Упакованный формат: строка i – веса связей i–j для j > i
+            size: int = data["size"]
+            packed = array('i')
+            for index, row in enumerate(data["upper_triangle"]):
+                if index % PROGRESS_STEP == 0:
+                    reporter.update(0.8 + 0.2 * index / max(1, size))
+                if len(row) != size - index - 1:
+                    raise ValueError(f"строка {index + 1} треугольной матрицы имеет неверную длину")
+                packed.extend(row)
+            adjacency_matrix = TriangularAdjacencyMatrix(size, packed)
+        else:
+            adjacency_matrix = data.get("adjacency_matrix", [])
+            # Квадратная плотная матрица хранится упакованной: вдвое меньше памяти
+            # (несимметричная матрица отвергается, см. from_rows)
+            if adjacency_matrix and all(len(row) == len(adjacency_matrix) for row in adjacency_matrix):
+                adjacency_matrix = TriangularAdjacencyMatrix.from_rows(adjacency_matrix)
+        reporter.update(1.0)
+        return SchemaData(nodes, adjacency_matrix, cols, rows)
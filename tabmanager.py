@@ -9,7 +9,7 @@ from tkinter import ttk
 from typing import Dict, Optional, List
 
 from editor import SchemaEditor
-from models import Node, SchemaData
+from models import Node, SchemaData, TriangularAdjacencyMatrix
 
 
 class TabManager:
@@ -49,7 +49,7 @@ class TabManager:
         rows: int = 3
         num_nodes: int = cols * rows
         nodes: Dict[int, Node] = {i + 1: Node(i + 1, i + 1) for i in range(num_nodes)}
-        adjacency_matrix = [[0] * num_nodes for _ in range(num_nodes)]
+        adjacency_matrix = TriangularAdjacencyMatrix(num_nodes)
         schema_data: SchemaData = SchemaData(nodes, adjacency_matrix, cols, rows)
         editor: SchemaEditor = SchemaEditor(frame, schema_data=schema_data)
         # Если вкладка "+" уже существует, вставляем новую вкладку перед ней
@@ -67,7 +67,7 @@ class TabManager:
         rows: int = 3
         num_nodes: int = cols * rows
         nodes: Dict[int, Node] = {i + 1: Node(i + 1, i + 1) for i in range(num_nodes)}
-        adjacency_matrix = [[0] * num_nodes for _ in range(num_nodes)]
+        adjacency_matrix = TriangularAdjacencyMatrix(num_nodes)
         schema_data: SchemaData = SchemaData(nodes, adjacency_matrix, cols, rows)
         editor: SchemaEditor = SchemaEditor(frame, schema_data=schema_data)
         # Вставляем новую вкладку перед вкладкой "+"
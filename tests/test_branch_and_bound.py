@@ -0,0 +1,55 @@
+import itertools
+import multiprocessing
+import random
+
+import pytest
+
+from autoplacement import BranchAndBoundPlacement as bnb
+from autoplacement.BranchAndBoundPlacement import BranchAndBoundPlacement
+from autoplacement.constraints import PlacementConstraints
+from autoplacement.utils import compute_total_weighted_length
+from models import Node, SchemaData
+
+
+def random_schema(count: int, rows: int, cols: int, seed: int) -> SchemaData:
+    rng = random.Random(seed)
+    matrix = [[0] * count for _ in range(count)]
+    for i in range(count):
+        for j in range(i + 1, count):
+            if rng.random() < 0.5:
+                matrix[i][j] = matrix[j][i] = rng.randint(1, 4)
+    nodes = {element: Node(element, element) for element in range(1, count + 1)}
+    return SchemaData(nodes, matrix, cols, rows)
+
+
+def brute_force(schema: SchemaData) -> float:
+    elements = sorted(schema.nodes)
+    best = float("inf")
+    for positions in itertools.permutations(range(1, schema.rows * schema.cols + 1), len(elements)):
+        nodes = {element: Node(element, position) for element, position in zip(elements, positions)}
+        best = min(best, compute_total_weighted_length(
+            SchemaData(nodes, schema.adjacency_matrix, schema.cols, schema.rows)))
+    return best
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_brute_force(workers, seed):
+    # Рекорд других процессов не должен подменять стоимость размещения, найденного процессом
+    schema = random_schema(6, 2, 4, seed)
+    result = BranchAndBoundPlacement(workers=workers).run(schema, "t", constraints=PlacementConstraints())
+    assert compute_total_weighted_length(result[0][0]) == brute_force(schema)
+
+
+def test_shared_record_only_tightens_bound():
+    state = bnb._SearchState(float("inf"))
+    bnb._init_worker(multiprocessing.get_context("spawn").Value("d", float("inf")))
+    try:
+        state.update(33.0, [0, 1])
+        bnb._shared_best.value = 0.5
+        assert state.bound() == 0.5
+        # Стоимость остаётся стоимостью собственного размещения процесса
+        assert state.best_cost == 33.0
+        assert state.best_assignment == [0, 1]
+    finally:
+        bnb._init_worker(None)
@@ -0,0 +1,19 @@
+from autoplacement.budget import Budget
+
+
+def test_resolve_keeps_callers_budget():
+    budget = Budget()
+    first = Budget.resolve(budget, 10)
+    second = Budget.resolve(budget, 500)
+    assert budget.max_iterations is None
+    assert (first.max_iterations, second.max_iterations) == (10, 500)
+    # Трасса общая: вызывающий видит улучшения всех этапов
+    first.report(5)
+    second.report(3)
+    assert [cost for _, cost in budget.trace] == [5, 3]
+
+
+def test_resolve_returns_limited_budget_itself():
+    budget = Budget(time_limit=1.0)
+    assert Budget.resolve(budget, 10) is budget
+    assert Budget.resolve(None, 10).max_iterations == 10
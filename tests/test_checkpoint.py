@@ -0,0 +1,68 @@
+import random
+
+from autoplacement.GeneticPlacement import GeneticPlacement
+from autoplacement.RelocationPlacement import RelocationPlacement
+from autoplacement.budget import Budget
+from autoplacement.checkpoint import Checkpoint
+from autoplacement.constraints import PlacementConstraints
+from models import Node, SchemaData
+
+
+def random_schema(count: int, rows: int, cols: int, seed: int) -> SchemaData:
+    rng = random.Random(seed)
+    matrix = [[0] * count for _ in range(count)]
+    for _ in range(2 * count):
+        i, j = rng.sample(range(count), 2)
+        matrix[i][j] = matrix[j][i] = rng.randint(1, 5)
+    nodes = {element: Node(element, element) for element in range(1, count + 1)}
+    return SchemaData(nodes, matrix, cols, rows)
+
+
+class _StoppedBudget(Budget):
+    """
+    Бюджет, который «истекает по времени» после заданного числа итераций.
+    """
+
+    def __init__(self, stop_after: int) -> None:
+        super().__init__(time_limit=3600.0)
+        self.stop_after = stop_after
+
+    def expired(self) -> bool:
+        return self.iterations >= self.stop_after
+
+
+def test_genetic_keeps_checkpoint_when_interrupted(tmp_path):
+    schema = random_schema(12, 4, 4, 1)
+    checkpoint = Checkpoint(str(tmp_path / "ga.ckpt"), interval=3600.0)
+    placement = GeneticPlacement(population_size=10, generations=50, seed=1)
+    placement.run(schema, "t", _StoppedBudget(5), checkpoint, PlacementConstraints())
+    saved = checkpoint.load(schema)
+    assert saved is not None and saved["generation"] == 5
+
+    # Возобновлённый запуск проходит оставшиеся поколения и удаляет точку
+    placement.run(schema, "t", Budget(max_iterations=50), checkpoint, PlacementConstraints())
+    assert checkpoint.load(schema) is None
+
+
+def positions(variants):
+    schema = variants[0][0]
+    return {number: node.grid_position for number, node in schema.nodes.items()}
+
+
+def test_relocation_resumes_only_same_placement(tmp_path):
+    schema = random_schema(12, 4, 4, 2)
+    checkpoint = Checkpoint(str(tmp_path / "relocation.ckpt"), interval=3600.0)
+    placement = RelocationPlacement(passes=20)
+    improved = positions(placement.run(schema, "t", _StoppedBudget(1), checkpoint, PlacementConstraints()))
+    assert improved != positions([(schema, "")])
+    assert checkpoint.load(schema) is not None
+
+    # Бюджет уже исчерпан: результат – ровно то, что восстановлено из точки
+    resumed = positions(placement.run(schema, "t", _StoppedBudget(0), checkpoint, PlacementConstraints()))
+    assert resumed == improved
+
+    # Та же схема с другой начальной расстановкой: сохранённые позиции не применяются
+    moved = {element: Node(element, 17 - element) for element in schema.nodes}
+    other = SchemaData(moved, schema.adjacency_matrix, schema.cols, schema.rows)
+    kept = positions(placement.run(other, "t", _StoppedBudget(0), checkpoint, PlacementConstraints()))
+    assert kept == positions([(other, "")])
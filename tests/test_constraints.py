@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from autoplacement.constraints import PlacementConstraints, Region
+from models import Node, SchemaData
+
+
+def make_schema(count: int, rows: int, cols: int) -> SchemaData:
+    nodes = {element: Node(element, element) for element in range(1, count + 1)}
+    return SchemaData(nodes, [[0] * count for _ in range(count)], cols, rows)
+
+
+def test_sample_overlapping_regions():
+    # Жадная расстановка областей здесь иногда заходит в тупик; размещение существует всегда
+    constraints = PlacementConstraints(regions=[Region([1], [1, 2]), Region([2], [2, 3]),
+                                                Region([3], [1, 3])])
+    constraints.validate(make_schema(3, 2, 2))
+    elements = [1, 2, 3]
+    for seed in range(500):
+        cells = constraints.sample(elements, random.Random(seed))
+        assert len(set(cells)) == len(cells)
+        assert all(constraints.allows(element, cell) for element, cell in zip(elements, cells))
+
+
+def test_sample_respects_fixed_and_forbidden():
+    constraints = PlacementConstraints(fixed={1: 4}, forbidden=[1, 2],
+                                       regions=[Region([2, 3], rect=(1, 1, 2, 3))])
+    constraints.validate(make_schema(5, 3, 3))
+    elements = [1, 2, 3, 4, 5]
+    for seed in range(100):
+        cells = constraints.sample(elements, random.Random(seed))
+        assert cells[0] == 3
+        assert len(set(cells)) == len(cells)
+        assert not {0, 1} & set(cells)
+        assert all(constraints.allows(element, cell) for element, cell in zip(elements, cells))
+
+
+def test_validate_rejects_overlapping_regions_over_capacity():
+    # Каждая область по отдельности помещается, но вместе трём элементам доступны две позиции
+    constraints = PlacementConstraints(regions=[Region([1, 2], [1, 2]), Region([3], [1, 2])])
+    with pytest.raises(ValueError, match="доступно только 2 позиций"):
+        constraints.validate(make_schema(3, 2, 2))
+
+
+def test_validate_rejects_too_many_movable_elements():
+    constraints = PlacementConstraints(forbidden=[1, 2])
+    with pytest.raises(ValueError):
+        constraints.validate(make_schema(3, 2, 2))
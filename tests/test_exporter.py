@@ -0,0 +1,76 @@
+import random
+import xml.etree.ElementTree as ElementTree
+
+import pytest
+
+from drawing import DrawingStyle, cells_along, closest_edge_position, line_rect_intersection
+from exporter import export_file, export_many
+from models import Node, SchemaData
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+def line_schema() -> SchemaData:
+    # Три элемента в ряд: связь 1–3 проходит над узлом 2
+    matrix = [[0, 1, 2],
+              [1, 0, 0],
+              [2, 0, 0]]
+    nodes = {element: Node(element, element) for element in range(1, 4)}
+    return SchemaData(nodes, matrix, 3, 1)
+
+
+def test_svg_structure(tmp_path):
+    path = tmp_path / "schema.svg"
+    export_file(line_schema(), str(path))
+    root = ElementTree.parse(path).getroot()
+    lines = root.findall(f".//{SVG}line")
+    dashed = [line for line in lines if line.get("stroke-dasharray")]
+    texts = [text.text for text in root.iter(f"{SVG}text") if text.text]
+    # Две связи и пунктир над узлом 2; метки весов 1 и 2
+    assert len(lines) - len(dashed) == 2
+    assert len(dashed) == 1
+    assert sorted(texts) == ["1", "2"]
+    assert len(root.findall(f".//{SVG}tspan")) == 6
+
+
+def test_same_seed_same_file(tmp_path):
+    first, second = tmp_path / "a.svg", tmp_path / "b.svg"
+    export_file(line_schema(), str(first), seed=3)
+    export_file(line_schema(), str(second), seed=3)
+    assert first.read_bytes() == second.read_bytes()
+
+
+def test_cells_along_covers_crossed_nodes():
+    # Каждый квадрат узла, который пересекает связь, лежит в одной из перебираемых ячеек
+    style = DrawingStyle()
+    cols, rows = 7, 5
+    half = style.square_size // 2
+    rng = random.Random(1)
+    for _ in range(300):
+        a, b = rng.sample(range(1, cols * rows + 1), 2)
+        (xa, ya), (xb, yb) = style.node_position(a, cols), style.node_position(b, cols)
+        x1, y1 = closest_edge_position(xa, ya, xb, yb, half)
+        x2, y2 = closest_edge_position(xb, yb, xa, ya, half)
+        along = set(cells_along(x1, y1, x2, y2, style, cols, rows))
+        for position in range(1, cols * rows + 1):
+            x, y = style.node_position(position, cols)
+            if line_rect_intersection(x1, y1, x2, y2, x - half, y - half, x + half, y + half):
+                assert divmod(position - 1, cols) in along
+
+
+def test_export_many_reports_errors(tmp_path):
+    jobs = [(line_schema(), str(tmp_path / f"{index}.svg")) for index in range(3)]
+    jobs.append((line_schema(), str(tmp_path / "bad.bmp")))
+    errors = export_many(jobs, workers=2)
+    assert errors[:3] == [None, None, None]
+    assert errors[3] is not None
+    serial = tmp_path / "serial.svg"
+    export_file(line_schema(), str(serial))
+    assert (tmp_path / "0.svg").read_bytes() == serial.read_bytes()
+
+
+def test_png_export(tmp_path):
+    pytest.importorskip("cairosvg")
+    path = tmp_path / "schema.png"
+    export_file(line_schema(), str(path))
+    assert path.read_bytes().startswith(b"\x89PNG")
@@ -0,0 +1,64 @@
+import random
+from array import array
+
+from autoplacement.GeneticPlacement import GeneticPlacement
+from autoplacement.budget import Budget
+from autoplacement.constraints import PlacementConstraints, Region
+from autoplacement.grid import get_grid_geometry
+from autoplacement.utils import batch_total_weighted_length, compute_total_weighted_length, get_weighted_edges
+from models import Node, SchemaData
+
+
+def random_schema(count: int, rows: int, cols: int, seed: int) -> SchemaData:
+    rng = random.Random(seed)
+    matrix = [[0] * count for _ in range(count)]
+    for _ in range(2 * count):
+        i, j = rng.sample(range(count), 2)
+        matrix[i][j] = matrix[j][i] = rng.randint(1, 5)
+    nodes = {element: Node(element, element) for element in range(1, count + 1)}
+    return SchemaData(nodes, matrix, cols, rows)
+
+
+def placements(variants):
+    return [{number: node.grid_position for number, node in schema.nodes.items()} for schema, _ in variants]
+
+
+def test_batch_scoring_matches_single_placement():
+    # Оценка всей популяции за проход по рёбрам совпадает с длиной связей каждой особи
+    schema = random_schema(10, 3, 4, 1)
+    geometry = get_grid_geometry(3, 4)
+    # Ген g – ячейка элемента g + 1
+    edges = [(i - 1, j - 1, weight) for i, j, weight in get_weighted_edges(schema)]
+    rng = random.Random(2)
+    population = array('i')
+    individuals = []
+    for _ in range(8):
+        cells = rng.sample(range(12), 12)
+        population.extend(cells)
+        individuals.append(cells)
+    scores = batch_total_weighted_length(population, 12, edges, [], geometry)
+    for cells, score in zip(individuals, scores):
+        nodes = {element: Node(element, cells[element - 1] + 1) for element in range(1, 11)}
+        assert score == compute_total_weighted_length(SchemaData(nodes, schema.adjacency_matrix, 4, 3))
+
+
+def test_fixed_cells_and_regions_are_respected():
+    schema = random_schema(10, 3, 4, 3)
+    constraints = PlacementConstraints(fixed={1: 12, 2: 1}, forbidden=[6],
+                                       regions=[Region([3, 4], [2, 3, 4])])
+    variants = GeneticPlacement(population_size=20, seed=5).run(schema, "t", Budget(max_iterations=30),
+                                                                constraints=constraints)
+    assert variants
+    for positions in placements(variants):
+        assert (positions[1], positions[2]) == (12, 1)
+        assert 6 not in positions.values()
+        assert {positions[3], positions[4]} <= {2, 3, 4}
+        assert len(set(positions.values())) == len(positions)
+
+
+def test_same_seed_gives_same_placements():
+    schema = random_schema(12, 4, 4, 4)
+    runs = [GeneticPlacement(population_size=16, seed=9).run(schema, "t", Budget(max_iterations=40),
+                                                             constraints=PlacementConstraints())
+            for _ in range(2)]
+    assert placements(runs[0]) == placements(runs[1])
@@ -0,0 +1,88 @@
+from history import ChangeGroup, EdgeChange, History, PlacementChange
+from models import Node, SchemaData
+
+
+def make_schema() -> SchemaData:
+    nodes = {element: Node(element, element) for element in range(1, 5)}
+    return SchemaData(nodes, [[0] * 4 for _ in range(4)], 2, 2)
+
+
+def snapshot(schema: SchemaData):
+    return ({element: node.grid_position for element, node in schema.nodes.items()},
+            [list(row) for row in schema.adjacency_matrix])
+
+
+def perform(history: History, schema: SchemaData, change) -> None:
+    # Как в редакторе: изменение выполняется, затем записывается в историю
+    change.apply(schema)
+    history.record(change)
+
+
+def test_undo_redo_restores_state():
+    schema = make_schema()
+    history = History()
+    states = [snapshot(schema)]
+    perform(history, schema, EdgeChange(3, 1, 0, 5))
+    states.append(snapshot(schema))
+    moved = {element: Node(element, 5 - element) for element in schema.nodes}
+    perform(history, schema, PlacementChange.between(schema.nodes, moved))
+    states.append(snapshot(schema))
+    perform(history, schema, ChangeGroup([EdgeChange(1, 3, 5, 0), EdgeChange(2, 4, 0, 1),
+                                          EdgeChange(2, 4, 1, 7)]))
+    states.append(snapshot(schema))
+    assert schema.adjacency_matrix[0][2] == 0 and schema.adjacency_matrix[3][1] == 7
+
+    for expected in reversed(states[:-1]):
+        assert history.undo(schema) is not None
+        assert snapshot(schema) == expected
+    assert not history.can_undo() and history.undo(schema) is None
+
+    for expected in states[1:]:
+        assert history.redo(schema) is not None
+        assert snapshot(schema) == expected
+    assert not history.can_redo() and history.redo(schema) is None
+
+
+def test_record_clears_redo():
+    schema = make_schema()
+    history = History()
+    perform(history, schema, EdgeChange(1, 2, 0, 1))
+    history.undo(schema)
+    assert history.can_redo()
+    perform(history, schema, EdgeChange(1, 3, 0, 1))
+    assert not history.can_redo()
+
+
+def test_placement_change_stores_only_moved_nodes():
+    old = {element: Node(element, element) for element in range(1, 5)}
+    new = {1: Node(1, 2), 2: Node(2, 1), 3: Node(3, 3), 4: Node(4, 4)}
+    change = PlacementChange.between(old, new)
+    assert len(change) == 2 and change.nodes() == {1, 2}
+    history = History()
+    history.record(change)
+    history.record(PlacementChange.between(old, old))
+    # Пустое изменение в историю не попадает
+    assert history.undo(SchemaData(new, [], 2, 2)) is change
+
+
+def test_limit_evicts_oldest_action():
+    schema = make_schema()
+    history = History(limit=2)
+    for weight in (1, 2, 3):
+        perform(history, schema, EdgeChange(1, 2, weight - 1, weight))
+    assert history.undo(schema).new_weight == 3
+    assert history.undo(schema).new_weight == 2
+    assert history.undo(schema) is None
+    assert schema.adjacency_matrix[0][1] == 1
+
+
+def test_size_limit_evicts_oldest_action():
+    schema = make_schema()
+    history = History(max_changes=3)
+    perform(history, schema, EdgeChange(1, 2, 0, 1))
+    perform(history, schema, ChangeGroup([EdgeChange(1, 3, 0, 1), EdgeChange(1, 4, 0, 1)]))
+    perform(history, schema, EdgeChange(2, 3, 0, 1))
+    # Три действия – четыре элементарных изменения: первое действие забыто
+    assert isinstance(history.undo(schema), EdgeChange)
+    assert isinstance(history.undo(schema), ChangeGroup)
+    assert not history.can_undo()
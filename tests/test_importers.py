@@ -0,0 +1,97 @@
+import io
+
+import pytest
+
+from importers import CLIQUE_MAX_DEGREE, NetlistBuilder, read_bookshelf, read_hmetis
+from models import iter_edges
+
+
+def edges(builder_or_schema):
+    if isinstance(builder_or_schema, NetlistBuilder):
+        builder_or_schema = builder_or_schema.build(len(builder_or_schema.adjacency))
+    return {(i, j): weight for i, j, weight in iter_edges(builder_or_schema.adjacency_matrix)}
+
+
+def test_clique_and_star_expansion():
+    clique = NetlistBuilder("clique")
+    clique.add_net([0, 1, 2, 3], 2)
+    assert edges(clique) == {(a, b): 2 for a in range(4) for b in range(a + 1, 4)}
+
+    star = NetlistBuilder("star")
+    star.add_net([2, 0, 1, 3], 2)
+    assert edges(star) == {(0, 2): 2, (1, 2): 2, (2, 3): 2}
+
+
+def test_weights_of_different_nets_add_up():
+    builder = NetlistBuilder("clique")
+    builder.add_net([0, 1])
+    builder.add_net([1, 0, 2], 3)
+    assert edges(builder) == {(0, 1): 4, (0, 2): 3, (1, 2): 3}
+    assert builder.nets == 2
+
+
+def test_duplicate_pins_and_degenerate_nets():
+    builder = NetlistBuilder("clique")
+    builder.add_net([0, 1, 0, 1])
+    builder.add_net([2, 2])
+    builder.add_net([3, 4], 0)
+    assert edges(builder) == {(0, 1): 1}
+    assert builder.nets == 3
+
+
+def test_auto_threshold():
+    small = NetlistBuilder("auto")
+    small.add_net(list(range(CLIQUE_MAX_DEGREE)))
+    assert len(edges(small)) == CLIQUE_MAX_DEGREE * (CLIQUE_MAX_DEGREE - 1) // 2
+
+    large = NetlistBuilder("auto")
+    large.add_net(list(range(CLIQUE_MAX_DEGREE + 1)))
+    assert edges(large) == {(0, b): 1 for b in range(1, CLIQUE_MAX_DEGREE + 1)}
+
+
+def test_unknown_net_model():
+    with pytest.raises(ValueError):
+        NetlistBuilder("tree")
+
+
+def test_read_hmetis_with_net_weights():
+    text = ("% комментарий\n"
+            "3 5 1\n"
+            "2 1 2\n"
+            "1 2 3 4\n"
+            "\n"
+            "5 5 1 % вес 5\n")
+    schema = read_hmetis(io.StringIO(text), "clique")
+    assert len(schema.nodes) == 5
+    assert schema.cols * schema.rows >= 5
+    assert edges(schema) == {(0, 1): 2, (1, 2): 1, (1, 3): 1, (2, 3): 1, (0, 4): 5}
+
+
+@pytest.mark.parametrize("text", ["2 3\n1 2\n2 4\n", "1 3\n0 1\n", "2 3\n1 2\n"])
+def test_read_hmetis_errors(text):
+    # Вершина вне диапазона 1..n (в том числе 0) и недостающая строка цепи
+    with pytest.raises(ValueError):
+        read_hmetis(io.StringIO(text))
+
+
+def test_read_bookshelf_output_pin_is_source():
+    text = ("UCLA nets 1.0\n"
+            "# комментарий\n"
+            "NumNets : 2\n"
+            "NumPins : 5\n"
+            "NetDegree : 3 n1\n"
+            "  a I : 0.5 0.5\n"
+            "  b O\n"
+            "  c I\n"
+            "NetDegree : 2\n"
+            "  c B\n"
+            "  d I\n")
+    schema = read_bookshelf(io.StringIO(text), "star")
+    # Элементы нумеруются в порядке появления: a, b, c, d; источник первой цепи – b
+    assert len(schema.nodes) == 4
+    assert edges(schema) == {(0, 1): 1, (1, 2): 1, (2, 3): 1}
+
+
+def test_read_bookshelf_truncated_net():
+    with pytest.raises(ValueError):
+        read_bookshelf(io.StringIO("NetDegree : 3\n a I\n b O\n"))
@@ -0,0 +1,72 @@
+import random
+
+from autoplacement.IncrementalPlacement import IncrementalPlacement
+from autoplacement.budget import Budget
+from autoplacement.constraints import PlacementConstraints
+from autoplacement.utils import compute_total_weighted_length
+from models import Node, SchemaData
+
+
+def random_schema(count: int, rows: int, cols: int, seed: int) -> SchemaData:
+    rng = random.Random(seed)
+    matrix = [[0] * count for _ in range(count)]
+    for _ in range(count + count // 2):
+        i, j = rng.sample(range(count), 2)
+        matrix[i][j] = matrix[j][i] = rng.randint(1, 5)
+    cells = rng.sample(range(1, rows * cols + 1), count)
+    nodes = {element: Node(element, cell) for element, cell in zip(range(1, count + 1), cells)}
+    return SchemaData(nodes, matrix, cols, rows)
+
+
+def within_hops(schema: SchemaData, changed, hops: int):
+    window = set(changed)
+    frontier = set(changed)
+    for _ in range(hops):
+        frontier = {j + 1 for i in frontier for j, weight in enumerate(schema.adjacency_matrix[i - 1])
+                    if weight} - window
+        window |= frontier
+    return window
+
+
+def positions(schema: SchemaData):
+    return {element: node.grid_position for element, node in schema.nodes.items()}
+
+
+def test_only_window_moves_and_trace_matches_length():
+    for seed in range(5):
+        schema = random_schema(40, 8, 8, seed)
+        changed = {1, 2}
+        budget = Budget()
+        result = IncrementalPlacement(changed, hops=1).run(schema, "t", budget, constraints=PlacementConstraints())
+        after = result[0][0]
+        window = within_hops(schema, changed, 1)
+        moved = {element for element in schema.nodes if positions(after)[element] != positions(schema)[element]}
+        assert moved <= window
+        assert len(set(positions(after).values())) == len(schema.nodes)
+        # Разность первой и последней точки трассы – изменение суммарной длины связей
+        first, last = budget.trace[0][1], budget.trace[-1][1]
+        assert compute_total_weighted_length(schema) - compute_total_weighted_length(after) == first - last
+
+
+def test_new_edge_pulls_its_ends_together():
+    schema = random_schema(30, 6, 6, 7)
+    matrix = schema.adjacency_matrix
+    far = max(((i, j) for i in range(1, 31) for j in range(i + 1, 31)),
+              key=lambda pair: abs(schema.nodes[pair[0]].grid_position - schema.nodes[pair[1]].grid_position))
+    a, b = far
+    matrix[a - 1][b - 1] = matrix[b - 1][a - 1] = 50
+    result = IncrementalPlacement({a, b}, hops=0).run(schema, "t", constraints=PlacementConstraints())
+    after = result[0][0]
+    moved = {element for element in schema.nodes if positions(after)[element] != positions(schema)[element]}
+    # При hops=0 подвижны только концы новой связи
+    assert moved and moved <= {a, b}
+    assert compute_total_weighted_length(after) < compute_total_weighted_length(schema)
+
+
+def test_fixed_elements_in_window_stay():
+    schema = random_schema(30, 6, 6, 3)
+    fixed = {element: schema.nodes[element].grid_position for element in (1, 2, 3)}
+    result = IncrementalPlacement({1, 2, 3, 4}, hops=2).run(schema, "t",
+                                                            constraints=PlacementConstraints(fixed=fixed))
+    after = positions(result[0][0])
+    assert {element: after[element] for element in fixed} == fixed
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from autoplacement.constraints import PlacementConstraints, Region
+from autoplacement.grid import get_grid_geometry
+from autoplacement.localsearch import PlacementState, state_from_schema
+from models import Node, SchemaData
+
+
+def make_state(count: int, rows: int, cols: int, seed: int) -> PlacementState:
+    rng = random.Random(seed)
+    adjacency = [{} for _ in range(count)]
+    for _ in range(2 * count):
+        a, b = rng.sample(range(count), 2)
+        adjacency[a][b] = adjacency[b][a] = rng.randint(1, 5)
+    positions = rng.sample(range(rows * cols), count)
+    return PlacementState(adjacency, positions, get_grid_geometry(rows, cols))
+
+
+def chain_schema(count: int = 9) -> SchemaData:
+    # Сетка 3x3 (как схема по умолчанию; при 9 элементах заполнена), цепочка связей 1-2-...-count
+    matrix = [[0] * count for _ in range(count)]
+    for i in range(count - 1):
+        matrix[i][i + 1] = matrix[i + 1][i] = 1
+    nodes = {element: Node(element, element) for element in range(1, count + 1)}
+    return SchemaData(nodes, matrix, 3, 3)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_delta_matches_full_recompute(seed):
+    state = make_state(12, 4, 5, seed)
+    rng = random.Random(seed)
+    for _ in range(200):
+        node = rng.randrange(len(state.positions))
+        cell = rng.randrange(state.geometry.cells)
+        other = state.occupant[cell]
+        if other == node:
+            continue
+        # Перенос в свободную ячейку или обмен с её узлом
+        move = [(node, cell)] if other < 0 else [(node, cell), (other, state.positions[node])]
+        before = state.total_cost()
+        delta = state.delta(move)
+        state.apply(move)
+        assert state.total_cost() - before == delta
+
+
+@pytest.mark.parametrize("regions, expected", [
+    ([Region([2], [9])], {2: 9}),
+    # Обмена недостаточно: 2 -> 9, 9 -> 1, 1 -> 2 – цикл вытеснения
+    ([Region([2], [9]), Region([9], [1])], {2: 9, 9: 1}),
+    ([Region([2], [9]), Region([9], [1]), Region([1], [2])], {2: 9, 9: 1, 1: 2}),
+])
+def test_restrict_on_full_grid(regions, expected):
+    schema = chain_schema()
+    constraints = PlacementConstraints(regions=regions)
+    constraints.validate(schema)
+    state, elements = state_from_schema(schema, constraints)
+    position_of = {element: state.positions[index] + 1 for index, element in enumerate(elements)}
+    for element, position in expected.items():
+        assert position_of[element] == position
+    assert sorted(state.positions) == list(range(9))
+    assert all(state.occupant[cell] == node for node, cell in enumerate(state.positions))
+
+
+def test_restrict_full_grid_with_forbidden_cell():
+    schema = chain_schema(8)
+    # Узел 5 стоит в запрещённой ячейке; ячейка 9 свободна, но узлу 5 доступна только 1
+    constraints = PlacementConstraints(forbidden=[5], regions=[Region([5], [1])])
+    constraints.validate(schema)
+    state, elements = state_from_schema(schema, constraints)
+    position_of = {element: state.positions[index] + 1 for index, element in enumerate(elements)}
+    assert position_of[5] == 1
+    assert 5 not in position_of.values()
+    assert state.occupant[4] == -2
+    assert state.free_cells == 0
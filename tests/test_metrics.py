@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from autoplacement.metrics import (_edge_segments, compute_congestion, compute_layout_metrics,
+                                   count_crossings, segments_cross)
+from models import Node, SchemaData
+
+
+def random_schema(count: int, rows: int, cols: int, edges: int, seed: int) -> SchemaData:
+    rng = random.Random(seed)
+    matrix = [[0] * count for _ in range(count)]
+    for _ in range(edges):
+        i, j = rng.sample(range(count), 2)
+        matrix[i][j] = matrix[j][i] = rng.randint(1, 5)
+    cells = rng.sample(range(1, rows * cols + 1), count)
+    nodes = {element: Node(element, cell) for element, cell in zip(range(1, count + 1), cells)}
+    return SchemaData(nodes, matrix, cols, rows)
+
+
+def test_cross_of_diagonals():
+    # Сетка 2x2: диагонали 1–4 и 2–3 пересекаются, стороны квадрата – нет
+    matrix = [[0, 1, 0, 1],
+              [1, 0, 1, 0],
+              [0, 1, 0, 1],
+              [1, 0, 1, 0]]
+    nodes = {element: Node(element, element) for element in range(1, 5)}
+    metrics = compute_layout_metrics(SchemaData(nodes, matrix, 2, 2))
+    assert metrics.crossings == 1
+    assert metrics.max_length == 2
+    assert metrics.total_length == 6
+
+
+@pytest.mark.parametrize("bucket_size", [1, 2, 4, 16])
+def test_crossings_match_brute_force(bucket_size):
+    for seed in range(5):
+        segments = [segment for segment, _ in _edge_segments(random_schema(40, 8, 9, 80, seed))]
+        expected = sum(1 for a in range(len(segments)) for b in range(a + 1, len(segments))
+                       if segments_cross(segments[a], segments[b]))
+        assert count_crossings(segments, bucket_size) == expected
+
+
+def test_congestion_matches_brute_force():
+    schema = random_schema(30, 6, 7, 60, 1)
+    expected = [[0.0] * schema.cols for _ in range(schema.rows)]
+    for (r1, c1, r2, c2, _, _), weight in _edge_segments(schema):
+        height = abs(r1 - r2) + 1
+        width = abs(c1 - c2) + 1
+        for r in range(min(r1, r2), max(r1, r2) + 1):
+            for c in range(min(c1, c2), max(c1, c2) + 1):
+                expected[r][c] += weight * (width + height) / (width * height)
+    congestion = compute_congestion(schema)
+    for row, expected_row in zip(congestion, expected):
+        assert row == pytest.approx(expected_row)
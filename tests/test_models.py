@@ -0,0 +1,79 @@
+import json
+import random
+
+import pytest
+
+from models import (Node, SchemaData, SparseAdjacencyMatrix, TriangularAdjacencyMatrix, dense_row,
+                    iter_edges)
+from serializer import SchemaSerializer
+
+
+def random_dense(size: int, seed: int):
+    rng = random.Random(seed)
+    rows = [[0] * size for _ in range(size)]
+    for i in range(size):
+        for j in range(i + 1, size):
+            if rng.random() < 0.4:
+                rows[i][j] = rows[j][i] = rng.randint(1, 9)
+    return rows
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 13])
+def test_triangular_indexing_matches_dense(size):
+    dense = random_dense(size, size)
+    matrix = TriangularAdjacencyMatrix.from_rows(dense)
+    assert len(matrix) == size
+    for i in range(size):
+        assert list(matrix[i]) == dense[i]
+        assert dense_row(matrix, i) == dense[i]
+        for j in range(size):
+            assert matrix[i][j] == dense[i][j]
+    assert list(iter_edges(matrix)) == list(iter_edges(dense))
+    # Запись в [i][j] видна в [j][i]
+    if size > 2:
+        matrix[2][0] = 7
+        assert matrix[0][2] == 7
+
+
+def test_dense_row_of_sparse_matrix():
+    dense = random_dense(6, 1)
+    sparse = SparseAdjacencyMatrix(6)
+    for i, j, weight in iter_edges(dense):
+        sparse.add_edge(i, j, weight)
+    assert [dense_row(sparse, i) for i in range(6)] == dense
+
+
+def test_save_load_round_trip(tmp_path):
+    dense = random_dense(9, 2)
+    nodes = {element: Node(element, element) for element in range(1, 10)}
+    schema = SchemaData(nodes, TriangularAdjacencyMatrix.from_rows(dense), 3, 3)
+    filename = str(tmp_path / "schema.json")
+    SchemaSerializer.dump(schema, filename)
+    loaded = SchemaSerializer.load(filename)
+    assert isinstance(loaded.adjacency_matrix, TriangularAdjacencyMatrix)
+    assert [list(row) for row in loaded.adjacency_matrix] == dense
+    assert {number: node.grid_position for number, node in loaded.nodes.items()} == \
+        {number: node.grid_position for number, node in nodes.items()}
+
+
+def legacy_file(tmp_path, matrix) -> str:
+    filename = str(tmp_path / "legacy.json")
+    nodes = {str(i): {"element_number": i, "grid_position": i} for i in range(1, len(matrix) + 1)}
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump({"cols": 2, "rows": 2, "nodes": nodes, "adjacency_matrix": matrix}, f)
+    return filename
+
+
+def test_legacy_square_matrix_is_packed(tmp_path):
+    dense = random_dense(4, 3)
+    loaded = SchemaSerializer.load(legacy_file(tmp_path, dense))
+    assert [list(row) for row in loaded.adjacency_matrix] == dense
+
+
+@pytest.mark.parametrize("matrix, message", [
+    ([[0, 1, 0], [2, 0, 0], [0, 0, 0]], "несимметрична"),
+    ([[0, 0, 0], [0, 3, 0], [0, 0, 0]], "самим собой"),
+])
+def test_legacy_matrix_losing_weights_is_rejected(tmp_path, matrix, message):
+    with pytest.raises(ValueError, match=message):
+        SchemaSerializer.load(legacy_file(tmp_path, matrix))
@@ -0,0 +1,56 @@
+import random
+
+from autoplacement.AbstractAutoPlacement import AbstractAutoPlacement
+from autoplacement.MultilevelPlacement import MultilevelPlacement
+from autoplacement.RandomPlacement import RandomPlacement
+from autoplacement.budget import Budget
+from autoplacement.constraints import PlacementConstraints
+from autoplacement.utils import compute_total_weighted_length
+from models import Node, SchemaData, SparseAdjacencyMatrix
+
+
+class Recording(AbstractAutoPlacement):
+    # Грубый решатель, запоминающий размер схемы, которую ему передали
+    def __init__(self) -> None:
+        self.sizes = []
+
+    def get_name(self) -> str:
+        return "Запись"
+
+    def run(self, schema_data, tab_name, budget=None, checkpoint=None, constraints=None):
+        self.sizes.append(len(schema_data.nodes))
+        return RandomPlacement().run(schema_data, tab_name, budget, constraints=constraints)
+
+
+def pairs_schema(count: int, rows: int, cols: int) -> SchemaData:
+    # Связаны только пары 1-2, 3-4, ...: после первого уровня рёбер для сопоставления нет
+    matrix = SparseAdjacencyMatrix(count)
+    for i in range(0, count - 1, 2):
+        matrix.add_edge(i, i + 1, 1)
+    nodes = {element: Node(element, element) for element in range(1, count + 1)}
+    return SchemaData(nodes, matrix, cols, rows)
+
+
+def test_coarsening_reaches_coarse_size_without_edges():
+    solver = Recording()
+    schema = pairs_schema(400, 40, 40)
+    variants = MultilevelPlacement(solver, coarse_size=48, seed=1).run(
+        schema, "t", Budget(max_iterations=50), constraints=PlacementConstraints())
+    assert solver.sizes and solver.sizes[0] <= 48
+    positions = [node.grid_position for node in variants[0][0].nodes.values()]
+    assert len(set(positions)) == len(positions)
+    assert all(1 <= position <= 40 * 40 for position in positions)
+
+
+def test_refinement_does_not_worsen_projection():
+    rng = random.Random(3)
+    count = 120
+    matrix = SparseAdjacencyMatrix(count)
+    for _ in range(300):
+        i, j = rng.sample(range(count), 2)
+        matrix.add_edge(i, j, rng.randint(1, 3))
+    nodes = {element: Node(element, element) for element in range(1, count + 1)}
+    schema = SchemaData(nodes, matrix, 12, 12)
+    variants = MultilevelPlacement(RandomPlacement(), coarse_size=16, seed=2).run(
+        schema, "t", Budget(max_iterations=100), constraints=PlacementConstraints())
+    assert compute_total_weighted_length(variants[0][0]) < compute_total_weighted_length(schema)
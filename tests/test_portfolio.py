@@ -0,0 +1,70 @@
+import os
+import time
+
+from autoplacement.AbstractAutoPlacement import AbstractAutoPlacement
+from autoplacement.PortfolioPlacement import PortfolioPlacement
+from autoplacement.budget import Budget
+from autoplacement.constraints import PlacementConstraints
+from models import Node, SchemaData
+
+
+class Identity(AbstractAutoPlacement):
+    def get_name(self) -> str:
+        return "Без изменений"
+
+    def run(self, schema_data, tab_name, budget=None, checkpoint=None, constraints=None):
+        return [(schema_data.clone(), f"{tab_name} тест")]
+
+
+class Stubborn(AbstractAutoPlacement):
+    # Не проверяет бюджет: после отмены процесс останавливается принудительно
+    def get_name(self) -> str:
+        return "Не отвечает на отмену"
+
+    def run(self, schema_data, tab_name, budget=None, checkpoint=None, constraints=None):
+        budget.report(0)
+        time.sleep(60)
+        return []
+
+
+class Crashing(AbstractAutoPlacement):
+    def get_name(self) -> str:
+        return "Аварийное завершение"
+
+    def run(self, schema_data, tab_name, budget=None, checkpoint=None, constraints=None):
+        os._exit(1)
+
+
+class Constrained(AbstractAutoPlacement):
+    # Возвращает размещение, только если получил ограничения от состязания
+    def get_name(self) -> str:
+        return "С ограничениями"
+
+    def run(self, schema_data, tab_name, budget=None, checkpoint=None, constraints=None):
+        if constraints is None or constraints.fixed_cells != {1: 8}:
+            return []
+        new_schema = schema_data.clone()
+        new_schema.nodes[1].grid_position = 9
+        return [(new_schema, f"{tab_name} ограничения")]
+
+
+def chain_schema() -> SchemaData:
+    matrix = [[0, 1, 0], [1, 0, 1], [0, 1, 0]]
+    return SchemaData({element: Node(element, element) for element in (1, 2, 3)}, matrix, 3, 3)
+
+
+def test_race_survives_stopped_and_crashed_candidates():
+    budget = Budget(time_limit=2.0)
+    started = time.monotonic()
+    portfolio = PortfolioPlacement([Stubborn(), Crashing(), Identity()], grace=1.0)
+    variants = portfolio.run(chain_schema(), "t", budget, constraints=PlacementConstraints())
+    assert time.monotonic() - started < 10
+    assert [text for _, text in variants] == ["t тест"]
+    assert budget.trace[-1][1] == 2
+
+
+def test_candidates_receive_constraints():
+    constraints = PlacementConstraints(fixed={1: 9})
+    variants = PortfolioPlacement([Constrained()]).run(chain_schema(), "t", Budget(time_limit=10.0),
+                                                       constraints=constraints)
+    assert variants[0][0].nodes[1].grid_position == 9
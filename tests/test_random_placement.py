@@ -0,0 +1,49 @@
+import random
+
+from autoplacement.RandomPlacement import RandomPlacement
+from autoplacement.constraints import PlacementConstraints
+from autoplacement.registry import LazyAutoPlacement
+from models import Node, SchemaData
+
+
+def random_schema(count: int, rows: int, cols: int, seed: int) -> SchemaData:
+    rng = random.Random(seed)
+    matrix = [[0] * count for _ in range(count)]
+    for _ in range(2 * count):
+        i, j = rng.sample(range(count), 2)
+        matrix[i][j] = matrix[j][i] = rng.randint(1, 5)
+    nodes = {element: Node(element, element) for element in range(1, count + 1)}
+    return SchemaData(nodes, matrix, cols, rows)
+
+
+def placements(variants):
+    return [{number: node.grid_position for number, node in schema.nodes.items()} for schema, _ in variants]
+
+
+def test_parallel_multistart_matches_serial():
+    # Пакеты в пуле процессов (общая память) дают те же размещения, что и в одном процессе
+    schema = random_schema(20, 5, 6, 1)
+    serial = RandomPlacement(starts=700, keep=3, seed=7).run(schema, "t", constraints=PlacementConstraints())
+    parallel = RandomPlacement(starts=700, keep=3, seed=7, workers=2).run(schema, "t",
+                                                                          constraints=PlacementConstraints())
+    assert len(serial) == 3
+    assert placements(parallel) == placements(serial)
+
+
+def test_configure_passes_supported_options():
+    entry = LazyAutoPlacement("Случайное размещение (лучшее из 256)",
+                              "autoplacement.RandomPlacement:RandomPlacement", starts=256, keep=3)
+    configured = entry.configure(workers=4)
+    assert (configured.load().workers, configured.load().starts) == (4, 256)
+    sequential = LazyAutoPlacement("Послед. алгоритм размещения по связности",
+                                   "autoplacement.SequentialConnectivityPlacement:SequentialConnectivityPlacement")
+    assert sequential.configure(workers=4) is sequential
+
+
+def test_multistart_reports_too_many_elements(caplog):
+    # Без ограничений (проверка constraints.validate не выполняется) сообщает сам алгоритм
+    schema = random_schema(7, 2, 3, 2)
+    placement = RandomPlacement(starts=10)
+    with caplog.at_level("WARNING"):
+        assert placement._run_multistart(schema, "t", None, None) == []
+    assert "превышает число позиций" in caplog.text
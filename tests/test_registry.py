@@ -0,0 +1,9 @@
+from autoplacement import AUTO_PLACEMENT_ALGORITHMS
+from autoplacement.registry import LazyAutoPlacement
+
+
+def test_builtin_names_match_algorithms():
+    # Название в меню задаётся до загрузки модуля и должно совпадать с get_name() алгоритма
+    for entry in AUTO_PLACEMENT_ALGORITHMS:
+        if isinstance(entry, LazyAutoPlacement) and entry.target.startswith("autoplacement."):
+            assert entry.load().get_name() == entry.get_name()
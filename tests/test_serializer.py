@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from models import Node, SchemaData, SparseAdjacencyMatrix, TriangularAdjacencyMatrix
+from serializer import PROGRESS_STEP, OperationCancelled, SchemaSerializer
+
+
+def sparse_schema(size: int) -> SchemaData:
+    matrix = SparseAdjacencyMatrix(size)
+    for i in range(size - 1):
+        matrix.add_edge(i, i + 1, 1 + i % 5)
+    nodes = {element: Node(element, element) for element in range(1, size + 1)}
+    return SchemaData(nodes, matrix, size, 1)
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_progress_is_monotonic_and_complete(tmp_path, packed):
+    schema = sparse_schema(4 * PROGRESS_STEP)
+    if packed:
+        dense = [[schema.adjacency_matrix[i][j] for j in range(len(schema.nodes))]
+                 for i in range(len(schema.nodes))]
+        schema = SchemaData(schema.nodes, TriangularAdjacencyMatrix.from_rows(dense), schema.cols, 1)
+    path = str(tmp_path / "schema.json")
+    for run in (lambda report: SchemaSerializer.dump(schema, path, report),
+                lambda report: SchemaSerializer.load(path, report)):
+        fractions = []
+        run(fractions.append)
+        assert fractions == sorted(fractions)
+        assert fractions[0] == 0.0 and fractions[-1] == 1.0
+        assert len(fractions) > 4
+
+
+def test_cancelled_dump_keeps_previous_file(tmp_path):
+    path = tmp_path / "schema.json"
+    SchemaSerializer.dump(sparse_schema(3), str(path))
+    previous = path.read_bytes()
+    cancelled = threading.Event()
+
+    def progress(fraction: float) -> None:
+        if fraction > 0:
+            cancelled.set()
+
+    with pytest.raises(OperationCancelled):
+        SchemaSerializer.dump(sparse_schema(4 * PROGRESS_STEP), str(path), progress, cancelled)
+    assert path.read_bytes() == previous
+    assert [item.name for item in tmp_path.iterdir()] == ["schema.json"]
+
+
+def test_cancelled_load(tmp_path):
+    path = str(tmp_path / "schema.json")
+    SchemaSerializer.dump(sparse_schema(10), path)
+    cancelled = threading.Event()
+    cancelled.set()
+    with pytest.raises(OperationCancelled):
+        SchemaSerializer.load(path, cancelled=cancelled)
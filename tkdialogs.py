@@ -0,0 +1,27 @@
+"""
+tkdialogs.py
+Модуль с реализацией пользовательских диалогов на tkinter.
+"""
+
+from tkinter import simpledialog, messagebox
+from typing import Optional
+
+from dialogs import Dialogs
+
+
+class TkDialogs(Dialogs):
+    """
+    TkDialogs показывает вопросы и сообщения ядра стандартными окнами tkinter.
+    """
+
+    def ask_string(self, title: str, prompt: str) -> Optional[str]:
+        return simpledialog.askstring(title, prompt)
+
+    def show_info(self, title: str, message: str) -> None:
+        messagebox.showinfo(title, message)
+
+    def show_warning(self, title: str, message: str) -> None:
+        messagebox.showwarning(title, message)
+
+    def show_error(self, title: str, message: str) -> None:
+        messagebox.showerror(title, message)